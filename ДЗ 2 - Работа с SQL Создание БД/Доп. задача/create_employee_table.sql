@@ -3,8 +3,9 @@
 
     employee_id - уникальный идентификатор сотрудника (primary key)
     name - имя сотрудника
-    department - отдел, в котором работает сотрудник (можно хранить строкой или идентификатором)
-    employee_id - ссылка на начальника (foreign key, которая ссылается на EmployeeID того же отношения)
+    department - отдел, в котором работает сотрудник (можно хранить строкой или идентификатором),
+    в одном отделе может работать несколько сотрудников
+    manager_id - ссылка на начальника (foreign key, которая ссылается на EmployeeID того же отношения)
 */
 
 CREATE TABLE employee (
@@ -13,5 +14,7 @@ CREATE TABLE employee (
   department VARCHAR(50) NOT NULL,
   manager_id INTEGER,
   FOREIGN KEY (manager_id) REFERENCES employee(employee_id)
-  UNIQUE (department)
-);
\ No newline at end of file
+);
+
+CREATE INDEX employee_manager_id_idx ON employee (manager_id);
+CREATE INDEX employee_department_idx ON employee (department);
\ No newline at end of file
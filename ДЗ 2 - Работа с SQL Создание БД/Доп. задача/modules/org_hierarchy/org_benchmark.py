@@ -0,0 +1,185 @@
+import os
+import time
+
+from .org_hierarchy import create_org_hierarchy
+
+CREATE_EMPLOYEE_SQL = os.path.join(os.path.dirname(__file__), '..', '..', 'create_employee_table.sql')
+
+# The same questions answered with recursive queries over manager_id and with the closure table
+HIERARCHY_QUERIES = {
+	'subordinates': (
+		'''
+		WITH RECURSIVE sub AS (
+			SELECT employee_id, 0 AS depth FROM employee WHERE employee_id = %(id)s
+			UNION ALL
+			SELECT e.employee_id, s.depth + 1 FROM employee e JOIN sub s ON e.manager_id = s.employee_id
+		)
+		SELECT employee_id, depth FROM sub WHERE depth > 0
+		''',
+		'SELECT descendant_id, depth FROM employee_closure WHERE ancestor_id = %(id)s AND depth > 0',
+	),
+	'chain_of_command': (
+		'''
+		WITH RECURSIVE up AS (
+			SELECT manager_id, 1 AS depth FROM employee WHERE employee_id = %(id)s
+			UNION ALL
+			SELECT e.manager_id, u.depth + 1 FROM employee e JOIN up u ON e.employee_id = u.manager_id
+		)
+		SELECT manager_id, depth FROM up WHERE manager_id IS NOT NULL
+		''',
+		'SELECT ancestor_id, depth FROM employee_closure WHERE descendant_id = %(id)s AND depth > 0 ORDER BY depth',
+	),
+	'depth': (
+		'''
+		WITH RECURSIVE up AS (
+			SELECT manager_id FROM employee WHERE employee_id = %(id)s
+			UNION ALL
+			SELECT e.manager_id FROM employee e JOIN up u ON e.employee_id = u.manager_id
+		)
+		SELECT COUNT(manager_id) FROM up
+		''',
+		'SELECT MAX(depth) FROM employee_closure WHERE descendant_id = %(id)s',
+	),
+	'headcount': (
+		'''
+		WITH RECURSIVE sub AS (
+			SELECT employee_id FROM employee WHERE employee_id = %(id)s
+			UNION ALL
+			SELECT e.employee_id FROM employee e JOIN sub s ON e.manager_id = s.employee_id
+		)
+		SELECT COUNT(*) - 1 FROM sub
+		''',
+		'SELECT COUNT(*) - 1 FROM employee_closure WHERE ancestor_id = %(id)s',
+	),
+}
+
+
+def recreate_tables(conn) -> None:
+	"""Drops the employee and closure tables and creates them again with their triggers"""
+	with open(CREATE_EMPLOYEE_SQL, encoding='utf-8') as file:
+		script = file.read()
+
+	with conn.cursor() as cur:
+		cur.execute('DROP TABLE IF EXISTS employee_closure, employee CASCADE')
+		cur.execute(script)
+	conn.commit()
+	create_org_hierarchy(conn)
+
+
+def generate_tree(conn, employees: int, span: int = 8) -> float:
+	"""
+		Adds a tree of employees in one statement, its closure being built by the insert trigger.
+
+		Every manager has span direct reports, the employees being numbered level by level.
+
+		Returns:
+			float: The time of the insert with the closure build in seconds.
+	"""
+	started = time.perf_counter()
+	with conn.cursor() as cur:
+		cur.execute(
+			'''
+			INSERT INTO employee (employee_id, name, department, manager_id)
+			SELECT g, 'Employee ' || g, 'Department ' || g %% 100, CASE WHEN g > 1 THEN (g - 2) / %(span)s + 1 END
+			FROM generate_series(1, %(employees)s) g
+			''',
+			{'employees': employees, 'span': span}
+		)
+	conn.commit()
+	seconds = time.perf_counter() - started
+
+	conn.autocommit = True
+	try:
+		with conn.cursor() as cur:
+			cur.execute('VACUUM ANALYZE employee, employee_closure')
+	finally:
+		conn.autocommit = False
+
+	return seconds
+
+
+def get_sample_employees(conn) -> dict[str, int]:
+	"""Returns a manager of every level of the tree and the last employee, a leaf at the deepest level"""
+	with conn.cursor() as cur:
+		cur.execute(
+			'''
+			SELECT depth, MIN(descendant_id) FROM employee_closure
+			WHERE ancestor_id = 1 GROUP BY depth ORDER BY depth
+			'''
+		)
+		samples = {f'level {depth}': employee_id for depth, employee_id in cur.fetchall()}
+		cur.execute('SELECT MAX(employee_id) FROM employee')
+		samples['leaf'] = cur.fetchone()[0]
+	return samples
+
+
+def time_query(cur, query: str, params: dict, repeat: int) -> tuple[float, list]:
+	"""Returns the best time in milliseconds of a query after a warm-up run, and its rows"""
+	timings = []
+	for _ in range(repeat + 1):
+		started = time.perf_counter()
+		cur.execute(query, params)
+		rows = cur.fetchall()
+		timings.append((time.perf_counter() - started) * 1000)
+	return min(timings[1:]), rows
+
+
+def time_statement(conn, query: str, params: dict) -> float:
+	"""Returns the time in milliseconds of a statement with its triggers, rolled back afterwards"""
+	with conn.cursor() as cur:
+		started = time.perf_counter()
+		cur.execute(query, params)
+		duration_ms = (time.perf_counter() - started) * 1000
+	conn.rollback()
+	return duration_ms
+
+
+def run_org_benchmark(conn, employees: int, span: int = 8, repeat: int = 3) -> dict:
+	"""
+		Times the hierarchy questions with recursive queries and with the closure table on a generated tree.
+
+		The tables are recreated, so the database must be a scratch one. Both variants
+		of every question are checked to return the same rows. The tree needs at least
+		three levels, that is more than span + 1 employees.
+
+		Returns:
+			dict: The build time of the tree in seconds, by question and sample employee the
+			milliseconds of both variants, and the milliseconds of the changes of the tree.
+	"""
+	recreate_tables(conn)
+	results = {'build_seconds': generate_tree(conn, employees, span), 'queries': {}, 'changes': {}}
+	samples = get_sample_employees(conn)
+
+	with conn.cursor() as cur:
+		for question, (recursive_query, closure_query) in HIERARCHY_QUERIES.items():
+			for sample, employee_id in samples.items():
+				params = {'id': employee_id}
+				recursive_ms, recursive_rows = time_query(cur, recursive_query, params, repeat)
+				closure_ms, closure_rows = time_query(cur, closure_query, params, repeat)
+				assert sorted(recursive_rows) == sorted(closure_rows), f'{question} of {sample} differs'
+				results['queries'][f'{question}, {sample}'] = {
+					'rows': len(closure_rows), 'recursive_ms': recursive_ms, 'closure_ms': closure_ms
+				}
+	conn.rollback()
+
+	# The first manager of level 3 moves to the second manager of level 2, the sibling of its own
+	level = min(3, len(samples) - 2)
+	moved_id, new_manager_id = samples[f'level {level}'], samples[f'level {level - 1}'] + 1
+	results['changes'] = {
+		'insert one': time_statement(
+			conn, "INSERT INTO employee VALUES (%(id)s, 'New', 'Department 0', %(manager_id)s)",
+			{'id': employees + 1, 'manager_id': samples['leaf']}
+		),
+		'insert 10000': time_statement(
+			conn,
+			"INSERT INTO employee SELECT g, 'New', 'Department 0', %(manager_id)s "
+			"FROM generate_series(%(id)s, %(id)s + 9999) g",
+			{'id': employees + 1, 'manager_id': samples['leaf']}
+		),
+		f'move a level {level} manager': time_statement(
+			conn, 'UPDATE employee SET manager_id = %(manager_id)s WHERE employee_id = %(id)s',
+			{'id': moved_id, 'manager_id': new_manager_id}
+		),
+	}
+
+	return results
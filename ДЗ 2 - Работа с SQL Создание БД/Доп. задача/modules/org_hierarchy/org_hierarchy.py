@@ -0,0 +1,123 @@
+import os
+
+from psycopg2 import errors
+
+ORG_HIERARCHY_SQL = os.path.join(os.path.dirname(__file__), '..', '..', 'org_hierarchy.sql')
+
+
+def create_org_hierarchy(conn) -> None:
+	"""Creates the closure table of org_hierarchy.sql with its triggers and fills it for the existing employees"""
+	with open(ORG_HIERARCHY_SQL, encoding='utf-8') as file:
+		script = file.read()
+
+	with conn.cursor() as cur:
+		cur.execute(script)
+	conn.commit()
+
+
+def add_employees(conn, employees: list[tuple]) -> None:
+	"""
+		Adds employees in one statement, their closure rows being added by the insert trigger.
+
+		Args:
+			employees (list[tuple]): The (employee_id, name, department, manager_id) of the
+				employees, in any order: a manager may come after the employees reporting to them.
+	"""
+	with conn.cursor() as cur:
+		cur.execute(
+			'''
+			INSERT INTO employee (employee_id, name, department, manager_id)
+			SELECT * FROM unnest(%s::integer[], %s::varchar[], %s::varchar[], %s::integer[])
+			''',
+			[list(column) for column in zip(*employees)]
+		)
+	conn.commit()
+
+
+def move_employee(conn, employee_id: int, manager_id: int | None) -> None:
+	"""
+		Makes an employee, with all their subordinates, report to another manager.
+
+		Args:
+			manager_id (int | None): The new manager, or None to make the employee a head.
+
+		Raises:
+			ValueError: If the employee does not exist, or the new manager is the employee or one of their subordinates.
+	"""
+	try:
+		with conn.cursor() as cur:
+			cur.execute(
+				'UPDATE employee SET manager_id = %s WHERE employee_id = %s RETURNING employee_id',
+				(manager_id, employee_id)
+			)
+			if cur.fetchone() is None:
+				raise ValueError('Employee ID does not exist in the database')
+	except errors.InvalidParameterValue as error:
+		conn.rollback()
+		raise ValueError(error.diag.message_primary) from error
+	except ValueError:
+		conn.rollback()
+		raise
+	conn.commit()
+
+
+def get_subordinates(conn, employee_id: int, max_depth: int = None) -> list[tuple]:
+	"""
+		Returns the employees reporting to an employee directly or through other managers.
+
+		Args:
+			max_depth (int, optional): The number of levels to return, 1 for the direct reports. Defaults to all.
+
+		Returns:
+			list[tuple]: The (employee_id, name, department, depth) of the subordinates, by level.
+	"""
+	with conn.cursor() as cur:
+		cur.execute(
+			'''
+			SELECT e.employee_id, e.name, e.department, ec.depth
+			FROM employee_closure ec
+			JOIN employee e ON e.employee_id = ec.descendant_id
+			WHERE ec.ancestor_id = %s AND ec.depth BETWEEN 1 AND %s
+			ORDER BY ec.depth, e.employee_id
+			''',
+			(employee_id, max_depth if max_depth is not None else 2 ** 31 - 1)
+		)
+		return cur.fetchall()
+
+
+def get_chain_of_command(conn, employee_id: int) -> list[tuple]:
+	"""Returns the (employee_id, name, department, depth) of the managers of an employee, from the direct one up"""
+	with conn.cursor() as cur:
+		cur.execute(
+			'''
+			SELECT e.employee_id, e.name, e.department, ec.depth
+			FROM employee_closure ec
+			JOIN employee e ON e.employee_id = ec.ancestor_id
+			WHERE ec.descendant_id = %s AND ec.depth > 0
+			ORDER BY ec.depth
+			''',
+			(employee_id,)
+		)
+		return cur.fetchall()
+
+
+def get_depth(conn, employee_id: int) -> int | None:
+	"""Returns the level of an employee, 0 for a head, or None if the employee does not exist"""
+	with conn.cursor() as cur:
+		cur.execute('SELECT MAX(depth) FROM employee_closure WHERE descendant_id = %s', (employee_id,))
+		return cur.fetchone()[0]
+
+
+def get_headcounts(conn, employee_ids: list[int]) -> dict[int, int]:
+	"""Returns by employee the number of their subordinates on all levels"""
+	with conn.cursor() as cur:
+		cur.execute(
+			'''
+			SELECT ancestor_id, COUNT(*) - 1
+			FROM employee_closure
+			WHERE ancestor_id = ANY(%s)
+			GROUP BY ancestor_id
+			''',
+			(list(employee_ids),)
+		)
+		return dict(cur.fetchall())
@@ -0,0 +1,27 @@
+import argparse
+
+import psycopg2
+
+from modules.org_hierarchy.org_benchmark import run_org_benchmark
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser(description='Times the org chart questions with recursive queries and the closure table.')
+	parser.add_argument('--dsn', default='dbname=employees_benchmark',
+						help='libpq connection string of a scratch database, its tables are recreated')
+	parser.add_argument('--employees', type=int, default=1_000_000, help='number of generated employees')
+	parser.add_argument('--span', type=int, default=8, help='number of direct reports of every manager')
+	parser.add_argument('--repeat', type=int, default=3, help='number of timed runs of every query')
+	args = parser.parse_args()
+
+	conn = psycopg2.connect(args.dsn)
+	results = run_org_benchmark(conn, args.employees, args.span, args.repeat)
+	conn.close()
+
+	print(f'Built a tree of {args.employees:,} employees with its closure in {results["build_seconds"]:.1f} s\n')
+	print(f'{"question":<32}{"rows":>9}{"recursive, ms":>15}{"closure, ms":>13}')
+	for name, result in results['queries'].items():
+		print(f'{name:<32}{result["rows"]:>9}{result["recursive_ms"]:>15.2f}{result["closure_ms"]:>13.2f}')
+
+	print()
+	for name, duration_ms in results['changes'].items():
+		print(f'{name:<32}{duration_ms:>13.2f} ms')
@@ -0,0 +1,171 @@
+/*
+    Таблица замыканий иерархии сотрудников (closure table).
+
+    Для каждой пары "начальник - подчинённый" на любом уровне хранится строка
+    с расстоянием между ними (depth), а также строка сотрудника с самим собой
+    (depth = 0). Поэтому все подчинённые, цепочка начальников и уровень
+    сотрудника выбираются по индексу, без рекурсивных запросов.
+
+    Таблица поддерживается триггерами на employee: при добавлении сотрудников
+    (в том числе пачкой, в любом порядке), при смене начальника, при удалении и очистке таблицы.
+    Внешних ключей у неё нет: строки пишут только триггеры, а построчная проверка
+    ключей занимала большую часть времени массового добавления сотрудников.
+    Смена employee_id запрещена: строки таблицы замыканий ссылаются на прежний номер.
+
+    Блокировки. Триггеры читают таблицу замыканий: проверка цикла при смене начальника
+    и начальники, к которым присоединяются новые сотрудники. Без блокировок две
+    параллельные смены начальника (A под B и B под A) обе проходят проверку, а
+    сотрудник, добавленный под переносимое поддерево, получает прежних начальников:
+    внешний ключ берёт FOR KEY SHARE, который не конфликтует со сменой manager_id.
+    Поэтому каждый триггер сначала берёт транзакционную advisory-блокировку с
+    ключом oid таблицы замыканий, и изменения иерархии выполняются по одному до
+    конца своих транзакций. Следующие команды триггера в READ COMMITTED получают
+    новый снимок и видят изменения предыдущей транзакции. В REPEATABLE READ снимок
+    берётся до блокировки, поэтому иерархию нужно менять в READ COMMITTED, уровне
+    по умолчанию.
+*/
+
+CREATE TABLE IF NOT EXISTS employee_closure (
+  ancestor_id INTEGER NOT NULL,
+  descendant_id INTEGER NOT NULL,
+  depth INTEGER NOT NULL CHECK (depth >= 0),
+  PRIMARY KEY (ancestor_id, descendant_id)
+);
+
+-- Цепочка начальников сотрудника, от непосредственного
+CREATE INDEX IF NOT EXISTS employee_closure_descendant_idx ON employee_closure (descendant_id, depth);
+
+-- Добавление сотрудников: триггер уровня команды видит все новые строки сразу,
+-- поэтому начальник может быть добавлен той же командой, в том числе после подчинённого
+CREATE OR REPLACE FUNCTION employee_closure_insert() RETURNS trigger AS $$
+BEGIN
+  PERFORM pg_advisory_xact_lock('employee_closure'::regclass::oid::bigint);
+  INSERT INTO employee_closure (ancestor_id, descendant_id, depth)
+  WITH RECURSIVE chain AS (
+    -- Начальники новых сотрудников вверх по новым строкам, до первого уже существовавшего
+    SELECT n.manager_id AS ancestor_id, n.employee_id AS descendant_id, 1 AS depth
+    FROM new_rows n
+    WHERE n.manager_id IS NOT NULL
+    UNION ALL
+    SELECT n.manager_id, c.descendant_id, c.depth + 1
+    FROM chain c
+    JOIN new_rows n ON n.employee_id = c.ancestor_id
+    -- Цепочка длиннее числа новых строк означает цикл между ними: он приводит
+    -- к повтору пары в первичном ключе и ошибке вместо бесконечной рекурсии
+    WHERE n.manager_id IS NOT NULL AND c.depth <= (SELECT COUNT(*) FROM new_rows)
+  ),
+  -- Уже существовавшие начальники, к которым присоединяются новые строки, и их начальники.
+  -- У новых строк нет статистики, поэтому поиск по индексу задан явно (OFFSET 0 не даёт
+  -- планировщику заменить его соединением хешированием со всей таблицей замыканий)
+  attached AS (
+    SELECT a.manager_id, ec.ancestor_id, ec.depth
+    FROM (
+      SELECT DISTINCT c.ancestor_id AS manager_id FROM chain c
+      WHERE NOT EXISTS (SELECT 1 FROM new_rows n WHERE n.employee_id = c.ancestor_id)
+    ) a
+    CROSS JOIN LATERAL (
+      SELECT ancestor_id, depth FROM employee_closure
+      WHERE descendant_id = a.manager_id AND depth > 0
+      OFFSET 0
+    ) ec
+  )
+  SELECT employee_id, employee_id, 0 FROM new_rows
+  UNION ALL
+  SELECT ancestor_id, descendant_id, depth FROM chain
+  UNION ALL
+  SELECT a.ancestor_id, c.descendant_id, c.depth + a.depth
+  FROM chain c
+  JOIN attached a ON a.manager_id = c.ancestor_id;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS employee_closure_insert ON employee;
+CREATE TRIGGER employee_closure_insert AFTER INSERT ON employee
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION employee_closure_insert();
+
+-- Смена начальника: поддерево сотрудника отрывается от его прежних начальников
+-- и присоединяется ко всем начальникам нового
+CREATE OR REPLACE FUNCTION employee_closure_move() RETURNS trigger AS $$
+BEGIN
+  PERFORM pg_advisory_xact_lock('employee_closure'::regclass::oid::bigint);
+  IF EXISTS (
+    SELECT 1 FROM employee_closure
+    WHERE ancestor_id = NEW.employee_id AND descendant_id = NEW.manager_id
+  ) THEN
+    RAISE EXCEPTION 'Employee % cannot report to their own subordinate %', NEW.employee_id, NEW.manager_id
+      USING ERRCODE = 'invalid_parameter_value';
+  END IF;
+
+  DELETE FROM employee_closure ec
+  USING employee_closure anc, employee_closure sub
+  WHERE anc.descendant_id = NEW.employee_id AND anc.depth > 0
+    AND sub.ancestor_id = NEW.employee_id
+    AND ec.ancestor_id = anc.ancestor_id AND ec.descendant_id = sub.descendant_id;
+
+  INSERT INTO employee_closure (ancestor_id, descendant_id, depth)
+  SELECT anc.ancestor_id, sub.descendant_id, anc.depth + sub.depth + 1
+  FROM employee_closure anc, employee_closure sub
+  WHERE anc.descendant_id = NEW.manager_id AND sub.ancestor_id = NEW.employee_id;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS employee_closure_move ON employee;
+CREATE TRIGGER employee_closure_move AFTER UPDATE OF manager_id ON employee
+FOR EACH ROW WHEN (OLD.manager_id IS DISTINCT FROM NEW.manager_id)
+EXECUTE FUNCTION employee_closure_move();
+
+-- Удаление сотрудников: вместе с начальником удаляются и все его подчинённые,
+-- иначе не пройдёт проверка manager_id, поэтому достаточно строк с удалёнными потомками
+CREATE OR REPLACE FUNCTION employee_closure_delete() RETURNS trigger AS $$
+BEGIN
+  PERFORM pg_advisory_xact_lock('employee_closure'::regclass::oid::bigint);
+  DELETE FROM employee_closure
+  WHERE descendant_id IN (SELECT employee_id FROM old_rows);
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS employee_closure_delete ON employee;
+CREATE TRIGGER employee_closure_delete AFTER DELETE ON employee
+REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT EXECUTE FUNCTION employee_closure_delete();
+
+CREATE OR REPLACE FUNCTION employee_closure_truncate() RETURNS trigger AS $$
+BEGIN
+  TRUNCATE employee_closure;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS employee_closure_truncate ON employee;
+CREATE TRIGGER employee_closure_truncate AFTER TRUNCATE ON employee
+FOR EACH STATEMENT EXECUTE FUNCTION employee_closure_truncate();
+
+-- Смена номера сотрудника оставила бы в таблице замыканий строки с прежним номером
+CREATE OR REPLACE FUNCTION employee_closure_renumber() RETURNS trigger AS $$
+BEGIN
+  RAISE EXCEPTION 'Employee % cannot be renumbered to %', OLD.employee_id, NEW.employee_id
+    USING ERRCODE = 'feature_not_supported';
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS employee_closure_renumber ON employee;
+CREATE TRIGGER employee_closure_renumber BEFORE UPDATE OF employee_id ON employee
+FOR EACH ROW WHEN (OLD.employee_id IS DISTINCT FROM NEW.employee_id)
+EXECUTE FUNCTION employee_closure_renumber();
+
+-- Сотрудники, добавленные до создания таблицы замыканий
+INSERT INTO employee_closure (ancestor_id, descendant_id, depth)
+WITH RECURSIVE chain AS (
+  SELECT employee_id AS ancestor_id, employee_id AS descendant_id, 0 AS depth FROM employee
+  UNION ALL
+  SELECT e.manager_id, c.descendant_id, c.depth + 1
+  FROM chain c
+  JOIN employee e ON e.employee_id = c.ancestor_id
+  WHERE e.manager_id IS NOT NULL
+)
+SELECT ancestor_id, descendant_id, depth FROM chain
+ON CONFLICT (ancestor_id, descendant_id) DO NOTHING;
@@ -0,0 +1,57 @@
+import argparse
+
+import psycopg2
+
+from modules.analytics.summary_views import (
+	create_analytics, get_artists_per_genre, get_artists_without_albums,
+	get_average_durations, get_freshness_report, get_tracks_count, get_tracks_per_album, refresh_views
+)
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser(description='Serves the reports of select_main.sql from materialized views.')
+	parser.add_argument('--dsn', default='dbname=music', help='libpq connection string of the database of create.sql')
+	parser.add_argument('--create', action='store_true', help='create the views and triggers of analytics.sql first')
+	parser.add_argument('--refresh', action='store_true', help='refresh the views whose source tables changed')
+	parser.add_argument('--force', action='store_true', help='refresh all the views, changed or not')
+	parser.add_argument('--blocking', action='store_true', help='refresh without CONCURRENTLY, locking the views')
+	parser.add_argument('--year', type=int, default=2020, help='year of the artists without albums report')
+	args = parser.parse_args()
+
+	conn = psycopg2.connect(args.dsn)
+
+	if args.create:
+		create_analytics(conn)
+
+	if args.refresh or args.force:
+		for view, duration_ms in refresh_views(conn, force=args.force, concurrently=not args.blocking).items():
+			print(f'{view}: ' + ('up to date' if duration_ms is None else f'refreshed in {duration_ms:.1f} ms'))
+		print()
+
+	# Freshness of the views the reports are read from
+	print(f'{"view":<24}{"refreshed at":<34}{"age, s":>10}{"refresh, ms":>13}{"rows":>10}  stale')
+	for entry in get_freshness_report(conn):
+		print(
+			f'{entry["view"]:<24}{str(entry["refreshed_at"]):<34}'
+			f'{entry["age_seconds"] or 0:>10.0f}{entry["duration_ms"] or 0:>13.1f}{entry["rows"] or 0:>10}'
+			f'  {"yes" if entry["stale"] else "no"}'
+		)
+
+	print('\nArtists per genre:')
+	for name, num_artists in get_artists_per_genre(conn):
+		print(f'  {name}: {num_artists}')
+
+	print('\nTracks per album:')
+	for title, release_year, num_tracks in get_tracks_per_album(conn):
+		print(f'  {title} ({release_year}): {num_tracks}')
+
+	print(f'\nTracks of the 2019-2020 albums: {get_tracks_count(conn, 2019, 2020)}')
+
+	print('\nAverage track duration per album, s:')
+	for title, avg_duration in get_average_durations(conn):
+		print(f'  {title}: {avg_duration:.1f}')
+
+	print(f'\nArtists without albums in {args.year}:')
+	for name in get_artists_without_albums(conn, args.year):
+		print(f'  {name}')
+
+	conn.close()
@@ -0,0 +1,82 @@
+-- == Предрассчитанные агрегаты для отчётов из select_main.sql ==
+-- Материализованные представления обновляются модулем modules/analytics,
+-- уникальные индексы нужны для REFRESH MATERIALIZED VIEW CONCURRENTLY.
+
+-- Количество исполнителей в каждом жанре (задание 3.1)
+CREATE MATERIALIZED VIEW IF NOT EXISTS genre_artist_counts AS
+SELECT g.genre_id, g.name, COUNT(DISTINCT ag.artist_id) AS num_artists
+FROM artist_genres ag
+JOIN genres g ON ag.genre_id = g.genre_id
+GROUP BY g.genre_id, g.name;
+
+CREATE UNIQUE INDEX IF NOT EXISTS genre_artist_counts_genre_id_idx ON genre_artist_counts (genre_id);
+
+-- Количество и средняя продолжительность треков по альбомам (задания 3.2 и 3.3)
+CREATE MATERIALIZED VIEW IF NOT EXISTS album_track_stats AS
+SELECT a.album_id, a.title, a.release_year, COUNT(t.track_id) AS num_tracks, AVG(t.duration) AS avg_duration
+FROM tracks t
+JOIN albums a ON t.album_id = a.album_id
+GROUP BY a.album_id, a.title, a.release_year;
+
+CREATE UNIQUE INDEX IF NOT EXISTS album_track_stats_album_id_idx ON album_track_stats (album_id);
+CREATE INDEX IF NOT EXISTS album_track_stats_release_year_idx ON album_track_stats (release_year);
+
+-- Годы, в которые у исполнителя выходили альбомы (задание 3.4)
+CREATE MATERIALIZED VIEW IF NOT EXISTS artist_release_years AS
+SELECT DISTINCT aa.artist_id, al.release_year
+FROM album_artists aa
+JOIN albums al ON aa.album_id = al.album_id;
+
+CREATE UNIQUE INDEX IF NOT EXISTS artist_release_years_idx ON artist_release_years (release_year, artist_id);
+
+-- Изменения исходных таблиц: каждая изменяющая их транзакция добавляет строку
+-- со своим идентификатором, так что представления обновляются, только если их
+-- исходные таблицы менялись. Строки не обновляются, а пересечься по ключу могут
+-- только команды одной транзакции, поэтому параллельные писатели не ждут друг друга.
+-- Изменение учтено в представлении, если его транзакция видна в снимке, взятом
+-- перед обновлением: транзакция, зафиксированная после снимка, в нём не видна,
+-- даже если её идентификатор меньше уже учтённых.
+CREATE TABLE IF NOT EXISTS analytics_source_changes (
+    table_name VARCHAR(100) NOT NULL,
+    xid XID8 NOT NULL,
+    PRIMARY KEY (table_name, xid)
+);
+
+CREATE OR REPLACE FUNCTION log_analytics_source_change() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO analytics_source_changes (table_name, xid)
+    VALUES (TG_TABLE_NAME, pg_current_xact_id())
+    ON CONFLICT DO NOTHING;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS genres_analytics_version ON genres;
+CREATE TRIGGER genres_analytics_version AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON genres
+FOR EACH STATEMENT EXECUTE FUNCTION log_analytics_source_change();
+
+DROP TRIGGER IF EXISTS artist_genres_analytics_version ON artist_genres;
+CREATE TRIGGER artist_genres_analytics_version AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON artist_genres
+FOR EACH STATEMENT EXECUTE FUNCTION log_analytics_source_change();
+
+DROP TRIGGER IF EXISTS albums_analytics_version ON albums;
+CREATE TRIGGER albums_analytics_version AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON albums
+FOR EACH STATEMENT EXECUTE FUNCTION log_analytics_source_change();
+
+DROP TRIGGER IF EXISTS tracks_analytics_version ON tracks;
+CREATE TRIGGER tracks_analytics_version AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON tracks
+FOR EACH STATEMENT EXECUTE FUNCTION log_analytics_source_change();
+
+DROP TRIGGER IF EXISTS album_artists_analytics_version ON album_artists;
+CREATE TRIGGER album_artists_analytics_version AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON album_artists
+FOR EACH STATEMENT EXECUTE FUNCTION log_analytics_source_change();
+
+-- Журнал обновлений представлений для отчёта о свежести
+CREATE TABLE IF NOT EXISTS analytics_refreshes (
+    view_name VARCHAR(100) PRIMARY KEY,
+    refreshed_at TIMESTAMPTZ NOT NULL,
+    duration_ms NUMERIC(12, 3) NOT NULL,
+    num_rows BIGINT NOT NULL,
+    -- Снимок, взятый перед обновлением: видимые в нём изменения учтены в представлении
+    source_snapshot PG_SNAPSHOT NOT NULL
+);
@@ -36,19 +36,31 @@ CREATE TABLE IF NOT EXISTS artist_genres (
     artist_id INTEGER NOT NULL,
     genre_id INTEGER NOT NULL,
     CONSTRAINT fk_artist FOREIGN KEY(artist_id) REFERENCES artists(artist_id) ON DELETE CASCADE ON UPDATE CASCADE,
-    CONSTRAINT fk_genre FOREIGN KEY(genre_id) REFERENCES genres(genre_id) ON DELETE CASCADE ON UPDATE CASCADE
+    CONSTRAINT fk_genre FOREIGN KEY(genre_id) REFERENCES genres(genre_id) ON DELETE CASCADE ON UPDATE CASCADE,
+    PRIMARY KEY (artist_id, genre_id)
 );
 
 CREATE TABLE IF NOT EXISTS album_artists (
     album_id INTEGER NOT NULL,
     artist_id INTEGER NOT NULL,
     CONSTRAINT fk_album FOREIGN KEY(album_id) REFERENCES albums(album_id) ON DELETE CASCADE ON UPDATE CASCADE,
-    CONSTRAINT fk_artist FOREIGN KEY(artist_id) REFERENCES artists(artist_id) ON DELETE CASCADE ON UPDATE CASCADE
+    CONSTRAINT fk_artist FOREIGN KEY(artist_id) REFERENCES artists(artist_id) ON DELETE CASCADE ON UPDATE CASCADE,
+    PRIMARY KEY (album_id, artist_id)
 );
 
 CREATE TABLE IF NOT EXISTS collection_tracks (
     collection_id INTEGER NOT NULL,
     track_id INTEGER NOT NULL,
     CONSTRAINT fk_collection FOREIGN KEY(collection_id) REFERENCES collections(collection_id),
-    CONSTRAINT fk_track FOREIGN KEY(track_id) REFERENCES tracks(track_id)
-);
\ No newline at end of file
+    CONSTRAINT fk_track FOREIGN KEY(track_id) REFERENCES tracks(track_id),
+    PRIMARY KEY (collection_id, track_id)
+);
+
+-- Индексы в обратном направлении: первичные ключи связующих таблиц покрывают
+-- поиск по первому столбцу, эти — по второму (жанр -> исполнители и т.д.)
+CREATE INDEX IF NOT EXISTS artist_genres_genre_id_idx ON artist_genres (genre_id, artist_id);
+CREATE INDEX IF NOT EXISTS album_artists_artist_id_idx ON album_artists (artist_id, album_id);
+CREATE INDEX IF NOT EXISTS collection_tracks_track_id_idx ON collection_tracks (track_id, collection_id);
+
+-- Треки альбома
+CREATE INDEX IF NOT EXISTS tracks_album_id_idx ON tracks (album_id);
@@ -0,0 +1,27 @@
+import argparse
+import time
+
+import psycopg2
+
+from modules.catalog.copy_loader import load_catalog
+from modules.catalog.generate_catalog import iter_catalog_tables
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser(description='Generates a music catalog and loads it with COPY.')
+	parser.add_argument('--dsn', default='dbname=music',
+						help='libpq connection string of a database of create.sql, its tables are replaced')
+	parser.add_argument('--tracks', type=int, default=1_000_000, help='number of tracks, the other tables follow it')
+	parser.add_argument('--skew', type=float, default=1.1, help='Zipf exponent of the artist popularity')
+	parser.add_argument('--seed', type=int, default=0, help='random seed')
+	parser.add_argument('--maintenance-work-mem', default='256MB', help='memory of every index build')
+	args = parser.parse_args()
+
+	conn = psycopg2.connect(args.dsn)
+	started = time.perf_counter()
+	stats = load_catalog(conn, iter_catalog_tables(args.tracks, args.skew, args.seed), args.maintenance_work_mem)
+	conn.close()
+
+	for table, table_stats in stats.items():
+		rows = table_stats.get('rows')
+		print(f'{table:<20}{"" if rows is None else f"{rows:,}":>14} rows {table_stats["seconds"]:>9.2f} s')
+	print(f'{"total":<20}{"":>19} {time.perf_counter() - started:>9.2f} s')
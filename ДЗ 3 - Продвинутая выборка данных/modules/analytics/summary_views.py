@@ -0,0 +1,209 @@
+import os
+import time
+
+# The materialized views of analytics.sql and the tables they are computed from
+ANALYTICS_VIEWS = {
+	'genre_artist_counts': ('genres', 'artist_genres'),
+	'album_track_stats': ('albums', 'tracks'),
+	'artist_release_years': ('albums', 'album_artists'),
+}
+ANALYTICS_SQL = os.path.join(os.path.dirname(__file__), '..', '..', 'analytics.sql')
+
+
+def create_analytics(conn) -> None:
+	"""Creates the materialized views, the source change triggers and the refresh log of analytics.sql"""
+	with open(ANALYTICS_SQL, encoding='utf-8') as file:
+		script = file.read()
+
+	with conn.cursor() as cur:
+		cur.execute(script)
+	conn.commit()
+
+
+def get_stale_views(cur, views: list[str]) -> set[str]:
+	"""
+		Returns the views whose source tables changed since their last refresh, or that were never refreshed.
+
+		A change is included in a view if its transaction is visible in the snapshot logged with the refresh.
+	"""
+	if not views:
+		return set()
+
+	cur.execute(
+		'''
+		SELECT DISTINCT v.view_name
+		FROM unnest(%s::varchar[], %s::varchar[]) AS v (view_name, table_name)
+		LEFT JOIN analytics_refreshes r ON r.view_name = v.view_name
+		WHERE r.view_name IS NULL OR EXISTS (
+			SELECT 1 FROM analytics_source_changes c
+			WHERE c.table_name = v.table_name AND NOT pg_visible_in_snapshot(c.xid, r.source_snapshot)
+		)
+		''',
+		(
+			[view for view in views for _ in ANALYTICS_VIEWS[view]],
+			[table for view in views for table in ANALYTICS_VIEWS[view]]
+		)
+	)
+	return {view for view, in cur.fetchall()}
+
+
+def delete_included_changes(cur) -> None:
+	"""Deletes the source changes included in all the views computed from their table"""
+	for table in {table for tables in ANALYTICS_VIEWS.values() for table in tables}:
+		views = [view for view, tables in ANALYTICS_VIEWS.items() if table in tables]
+		cur.execute(
+			'''
+			DELETE FROM analytics_source_changes c
+			WHERE c.table_name = %s AND (
+				SELECT COUNT(*) = %s AND bool_and(pg_visible_in_snapshot(c.xid, r.source_snapshot))
+				FROM analytics_refreshes r
+				WHERE r.view_name = ANY(%s)
+			)
+			''',
+			(table, len(views), views)
+		)
+
+
+def refresh_views(conn, views: list[str] = None, force: bool = False, concurrently: bool = True) -> dict:
+	"""
+		Refreshes the materialized views whose source tables changed since their last refresh.
+
+		A concurrent refresh does not block the reports reading the view, but computes
+		the difference with the previous content; a plain refresh rewrites the view
+		and locks it for the duration.
+
+		Args:
+			views (list[str], optional): The views to refresh. Defaults to all the ANALYTICS_VIEWS.
+			force (bool): Refreshes the views even if their sources did not change. Defaults to False.
+			concurrently (bool): Uses REFRESH MATERIALIZED VIEW CONCURRENTLY. Defaults to True.
+
+		Returns:
+			dict: By view, the duration of its refresh in milliseconds, or None if it was up to date.
+
+		Raises:
+			ValueError: If a view is not one of the ANALYTICS_VIEWS.
+	"""
+	views = list(ANALYTICS_VIEWS) if views is None else views
+	unknown = [view for view in views if view not in ANALYTICS_VIEWS]
+	if unknown:
+		raise ValueError(f'Unknown analytics views: {", ".join(unknown)}')
+
+	refreshed = {}
+	with conn.cursor() as cur:
+		stale = set(views) if force else get_stale_views(cur, views)
+
+		for view in views:
+			if view not in stale:
+				refreshed[view] = None
+				continue
+
+			# The snapshot is taken before the refresh: a change committed in between is
+			# included in the view but not in the snapshot, so it only causes one more refresh
+			cur.execute('SELECT pg_current_snapshot()')
+			snapshot = cur.fetchone()[0]
+
+			started = time.perf_counter()
+			cur.execute(f'REFRESH MATERIALIZED VIEW {"CONCURRENTLY " if concurrently else ""}{view}')
+			duration_ms = (time.perf_counter() - started) * 1000
+			cur.execute(f'SELECT COUNT(*) FROM {view}')
+			cur.execute(
+				'''
+				INSERT INTO analytics_refreshes (view_name, refreshed_at, duration_ms, num_rows, source_snapshot)
+				VALUES (%s, now(), %s, %s, %s)
+				ON CONFLICT (view_name) DO UPDATE SET
+					refreshed_at = EXCLUDED.refreshed_at,
+					duration_ms = EXCLUDED.duration_ms,
+					num_rows = EXCLUDED.num_rows,
+					source_snapshot = EXCLUDED.source_snapshot
+				''',
+				(view, round(duration_ms, 3), cur.fetchone()[0], snapshot)
+			)
+			conn.commit()
+			refreshed[view] = duration_ms
+
+		if any(duration_ms is not None for duration_ms in refreshed.values()):
+			delete_included_changes(cur)
+			conn.commit()
+
+	return refreshed
+
+
+def get_freshness_report(conn) -> list[dict]:
+	"""
+		Returns the freshness of the materialized views.
+
+		Returns:
+			list[dict]: By view, the time of its last refresh, its age in seconds, the duration
+			of the refresh in milliseconds, the number of rows and whether its source tables
+			changed since then. A view that was never refreshed has None in the refresh fields.
+	"""
+	with conn.cursor() as cur:
+		stale = get_stale_views(cur, list(ANALYTICS_VIEWS))
+		cur.execute(
+			'''
+			SELECT view_name, refreshed_at, EXTRACT(EPOCH FROM now() - refreshed_at), duration_ms, num_rows
+			FROM analytics_refreshes
+			'''
+		)
+		logged = {row[0]: row[1:] for row in cur.fetchall()}
+
+	report = []
+	for view in ANALYTICS_VIEWS:
+		refreshed_at, age, duration_ms, num_rows = logged.get(view, (None,) * 4)
+		report.append({
+			'view': view,
+			'refreshed_at': refreshed_at,
+			'age_seconds': None if age is None else float(age),
+			'duration_ms': None if duration_ms is None else float(duration_ms),
+			'rows': num_rows,
+			'stale': view in stale,
+		})
+	return report
+
+
+def get_artists_per_genre(conn) -> list[tuple[str, int]]:
+	"""Returns the genres with their number of artists, from the most popular"""
+	with conn.cursor() as cur:
+		cur.execute('SELECT name, num_artists FROM genre_artist_counts ORDER BY num_artists DESC, name')
+		return cur.fetchall()
+
+
+def get_tracks_per_album(conn) -> list[tuple[str, int, int]]:
+	"""Returns the albums with their release year and number of tracks"""
+	with conn.cursor() as cur:
+		cur.execute('SELECT title, release_year, num_tracks FROM album_track_stats ORDER BY title')
+		return cur.fetchall()
+
+
+def get_tracks_count(conn, year_from: int = 2019, year_to: int = 2020) -> int:
+	"""Returns the number of tracks of the albums released between year_from and year_to inclusive"""
+	with conn.cursor() as cur:
+		cur.execute(
+			'SELECT COALESCE(SUM(num_tracks), 0) FROM album_track_stats WHERE release_year BETWEEN %s AND %s',
+			(year_from, year_to)
+		)
+		return int(cur.fetchone()[0])
+
+
+def get_average_durations(conn) -> list[tuple[str, float]]:
+	"""Returns the albums with the average duration of their tracks in seconds"""
+	with conn.cursor() as cur:
+		cur.execute('SELECT title, avg_duration FROM album_track_stats ORDER BY title')
+		return [(title, float(avg_duration)) for title, avg_duration in cur.fetchall()]
+
+
+def get_artists_without_albums(conn, year: int = 2020) -> list[str]:
+	"""Returns the names of the artists who released no album in the given year"""
+	with conn.cursor() as cur:
+		cur.execute(
+			'''
+			SELECT name FROM artists a
+			WHERE NOT EXISTS (
+				SELECT 1 FROM artist_release_years ary
+				WHERE ary.release_year = %s AND ary.artist_id = a.artist_id
+			)
+			ORDER BY name
+			''',
+			(year,)
+		)
+		return [name for name, in cur.fetchall()]
@@ -0,0 +1,272 @@
+import json
+import os
+import time
+from datetime import datetime
+
+BASE_DIR = os.path.join(os.path.dirname(__file__), '..', '..')
+QUERY_FILES = ('select_main.sql', 'select_additional.sql')
+SCHEMA_TABLES = (
+	'collection_tracks', 'album_artists', 'artist_genres', 'collections', 'tracks', 'albums', 'artists', 'genres'
+)
+# A query independent of the data, timed with the others to correct for the speed of the machine
+REFERENCE_QUERY = 'SELECT count(*) FROM generate_series(1, 300000)'
+# A comment this short only names a variant of the task described by the previous comments
+VARIANT_COMMENT_LENGTH = 30
+
+SEED_STATEMENTS = (
+	"INSERT INTO genres (name) SELECT 'Genre ' || g FROM generate_series(1, %(genres)s) g",
+	"INSERT INTO artists (name) "
+	"SELECT CASE WHEN g = 1 THEN 'MoonByul' WHEN g %% 3 = 0 THEN 'Artist' || g ELSE 'Artist ' || g END "
+	"FROM generate_series(1, %(artists)s) g",
+	"INSERT INTO albums (title, release_year) SELECT 'Album ' || g, 1990 + g %% 35 FROM generate_series(1, %(albums)s) g",
+	"INSERT INTO tracks (title, duration, album_id) "
+	"SELECT CASE g %% 50 WHEN 0 THEN 'My song ' || g WHEN 1 THEN 'Мой трек ' || g ELSE 'Track ' || g END, "
+	"60 + g * 37 %% 421, 1 + g %% %(albums)s FROM generate_series(1, %(tracks)s) g",
+	"INSERT INTO collections (title, release_year) "
+	"SELECT 'Collection ' || g, 2000 + g %% 25 FROM generate_series(1, %(collections)s) g",
+	"INSERT INTO artist_genres (artist_id, genre_id) "
+	"SELECT a, 1 + (a + k) %% %(genres)s FROM generate_series(1, %(artists)s) a, generate_series(1, 2) k "
+	"WHERE k = 1 OR a %% 4 = 0",
+	"INSERT INTO album_artists (album_id, artist_id) "
+	"SELECT b, 1 + (b + k) %% %(artists)s FROM generate_series(1, %(albums)s) b, generate_series(0, 1) k "
+	"WHERE k = 0 OR b %% 10 = 0",
+	"INSERT INTO collection_tracks (collection_id, track_id) "
+	"SELECT c, 1 + (c * 10 + k) %% %(tracks)s FROM generate_series(1, %(collections)s) c, generate_series(0, 9) k",
+)
+
+
+def read_queries(path: str) -> list[tuple[str, str]]:
+	"""
+		Splits a file of queries into the queries and their descriptions.
+
+		A query ends with a semicolon, a blank line or a comment, since some queries
+		of the files are not terminated. The description is the comment block before
+		the query; a short one, like "Вариант №2", is appended to the previous description.
+
+		Returns:
+			list[tuple[str, str]]: The description and text of every query.
+	"""
+	queries, comments, lines = [], [], []
+	task = ''
+
+	def flush() -> None:
+		nonlocal task
+		if not lines:
+			return
+		description = ' '.join(comments)
+		if comments and len(description) > VARIANT_COMMENT_LENGTH:
+			task = comments[0]
+		elif task:
+			description = f'{task} — {description}' if description else task
+		queries.append((description, '\n'.join(lines).rstrip().rstrip(';')))
+		comments.clear()
+		lines.clear()
+
+	with open(path, encoding='utf-8') as file:
+		for line in file:
+			stripped = line.strip()
+			if stripped.startswith('--'):
+				flush()
+				comment = stripped.lstrip('-').strip()
+				if comment and not comment.startswith('=='):
+					comments.append(comment)
+			elif not stripped:
+				flush()
+			else:
+				lines.append(line.rstrip())
+				if stripped.endswith(';'):
+					flush()
+	flush()
+
+	return queries
+
+
+def load_queries(files: tuple[str, ...] = QUERY_FILES) -> dict[str, tuple[str, str]]:
+	"""Returns the description and text of the queries of the files by a name like select_main:3"""
+	queries = {}
+	for filename in files:
+		stem = os.path.splitext(filename)[0]
+		for number, query in enumerate(read_queries(os.path.join(BASE_DIR, filename)), 1):
+			queries[f'{stem}:{number}'] = query
+	return queries
+
+
+def recreate_schema(conn) -> None:
+	"""Drops the tables of the music service with everything depending on them and runs create.sql"""
+	with open(os.path.join(BASE_DIR, 'create.sql'), encoding='utf-8') as file:
+		script = file.read()
+
+	with conn.cursor() as cur:
+		cur.execute(f'DROP TABLE IF EXISTS {", ".join(SCHEMA_TABLES)} CASCADE')
+		cur.execute(script)
+	conn.commit()
+
+
+def seed_dataset(conn, tracks: int) -> None:
+	"""
+		Fills the empty tables with a generated dataset and updates the planner statistics and visibility map.
+
+		Args:
+			tracks (int): The number of tracks. The other tables are sized relative to it.
+	"""
+	sizes = {
+		'tracks': tracks,
+		'albums': max(tracks // 10, 2),
+		'artists': max(tracks // 20, 2),
+		'collections': max(tracks // 50, 1),
+		'genres': 50,
+	}
+
+	with conn.cursor() as cur:
+		for statement in SEED_STATEMENTS:
+			cur.execute(statement, sizes)
+	conn.commit()
+
+	conn.autocommit = True
+	try:
+		with conn.cursor() as cur:
+			cur.execute('VACUUM ANALYZE')
+	finally:
+		conn.autocommit = False
+
+
+def iter_plan_nodes(plan: dict):
+	"""Yields a plan node and all its child nodes."""
+	yield plan
+	for child in plan.get('Plans', []):
+		yield from iter_plan_nodes(child)
+
+
+def get_scans(plan: dict) -> list[str]:
+	"""Returns the scans of a plan as 'Node Type on relation', the shape compared between runs"""
+	return sorted(
+		f'{node["Node Type"]} on {node["Relation Name"]}' for node in iter_plan_nodes(plan) if 'Relation Name' in node
+	)
+
+
+def time_query(cur, query: str) -> tuple[float, int]:
+	"""Returns the time in milliseconds a query takes, including the transfer of its rows, and its number of rows"""
+	started = time.perf_counter()
+	cur.execute(query)
+	rows = len(cur.fetchall())
+	return (time.perf_counter() - started) * 1000, rows
+
+
+def explain_query(cur, query: str) -> dict:
+	"""Runs EXPLAIN (ANALYZE, BUFFERS) for a query and returns its plan."""
+	cur.execute(f'EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {query}')
+	return cur.fetchone()[0][0]['Plan']
+
+
+def measure_queries(conn, queries: dict[str, tuple[str, str]], repeat: int = 3) -> dict:
+	"""
+		Explains the queries, which also warms the cache up, then times them in repeat rounds.
+
+		Every round runs all the queries, so a burst of load on the machine slows down one
+		round of every query instead of all the runs of one query, and the best time is kept.
+
+		Returns:
+			dict: By query name, its description, best time in milliseconds, number of rows,
+			the scans of its plan and the EXPLAIN (ANALYZE, BUFFERS) plan.
+	"""
+	results = {}
+	with conn.cursor() as cur:
+		for name, (description, query) in queries.items():
+			plan = explain_query(cur, query)
+			results[name] = {'description': description, 'ms': None, 'rows': None, 'scans': get_scans(plan), 'plan': plan}
+
+		for _ in range(repeat):
+			for name, (description, query) in queries.items():
+				duration_ms, results[name]['rows'] = time_query(cur, query)
+				if results[name]['ms'] is None or duration_ms < results[name]['ms']:
+					results[name]['ms'] = round(duration_ms, 3)
+	conn.rollback()
+
+	return results
+
+
+def run_benchmark(conn, scales: list[int], repeat: int = 3) -> dict:
+	"""
+		Times and explains every query of QUERY_FILES on generated datasets of several sizes.
+
+		The tables are recreated from create.sql for every scale, so the database must be a scratch one.
+
+		Args:
+			scales (list[int]): The numbers of tracks of the datasets.
+			repeat (int): The number of timed runs of every query. Defaults to 3.
+
+		Returns:
+			dict: By number of tracks, the measurements of measure_queries.
+	"""
+	queries = {'reference': ('Reference query, independent of the data', REFERENCE_QUERY), **load_queries()}
+	results = {}
+
+	for tracks in scales:
+		recreate_schema(conn)
+		seed_dataset(conn, tracks)
+		results[str(tracks)] = measure_queries(conn, queries, repeat)
+
+	return results
+
+
+def find_regressions(results: dict, baseline: dict, threshold: float = 0.5, min_ms: float = 1.0) -> list[str]:
+	"""
+		Compares the results of a run with a previous one.
+
+		A query regresses if it is slower than the baseline by more than threshold and
+		by more than min_ms, which filters out the noise of fast queries, or if its plan
+		reads a table with a sequential scan the baseline plan did not. The baseline times
+		are first scaled by the change of the time of the reference query, so that a run
+		on a slower or busier machine is not flagged as a whole.
+
+		Returns:
+			list[str]: The description of every regression.
+	"""
+	regressions = []
+
+	for scale, queries in results.items():
+		previous_queries = baseline.get(scale, {})
+		speed = 1.0
+		if 'reference' in queries and 'reference' in previous_queries:
+			speed = queries['reference']['ms'] / previous_queries['reference']['ms']
+
+		for name, result in queries.items():
+			previous = previous_queries.get(name)
+			if previous is None or name == 'reference':
+				continue
+
+			expected_ms = previous['ms'] * speed
+			if result['ms'] > expected_ms * (1 + threshold) and result['ms'] - expected_ms > min_ms:
+				regressions.append(
+					f'{name} at {scale} tracks: {previous["ms"]:.2f} -> {result["ms"]:.2f} ms '
+					f'({result["ms"] / expected_ms:.2f}x, reference query {speed:.2f}x)'
+				)
+
+			new_seq_scans = [
+				scan for scan in result['scans'] if scan.startswith('Seq Scan') and scan not in previous['scans']
+			]
+			if new_seq_scans:
+				regressions.append(f'{name} at {scale} tracks: new {", ".join(new_seq_scans)}')
+
+	return regressions
+
+
+def read_last_results(path: str) -> dict:
+	"""Returns the results of the last run saved in a JSON lines file, or an empty dict"""
+	if not os.path.exists(path):
+		return {}
+
+	last_line = None
+	with open(path, encoding='utf-8') as file:
+		for line in file:
+			if line.strip():
+				last_line = line
+	return json.loads(last_line)['results'] if last_line else {}
+
+
+def write_results(path: str, results: dict, **parameters) -> None:
+	"""Appends a run to the JSON lines file that read_last_results compares the next run with"""
+	record = {'timestamp': datetime.now().isoformat(timespec='seconds'), **parameters, 'results': results}
+
+	with open(path, 'a', encoding='utf-8') as file:
+		file.write(json.dumps(record, ensure_ascii=False) + '\n')
@@ -0,0 +1,84 @@
+import time
+
+from ..catalog.copy_loader import load_catalog
+from ..catalog.generate_catalog import iter_catalog_tables
+from ..track_search.track_search import build_tsquery, create_track_search, get_search_query
+from .query_benchmark import load_queries, measure_queries, recreate_schema
+
+# The three variants of task 2.5 in select_main.sql: ILIKE patterns, string_to_array && and the \y regex
+TASK_QUERIES = ('select_main:6', 'select_main:7', 'select_main:8')
+SEARCH_TEXT = 'my мой'
+PAGE_SIZE = 20
+
+
+def load_search_dataset(conn, tracks: int, skew: float = 1.1, seed: int = 0) -> dict:
+	"""
+		Recreates the schema with the search column and loads a generated catalog into it.
+
+		Returns:
+			dict: The load statistics of load_catalog, the GIN index being built with the other indexes.
+	"""
+	recreate_schema(conn)
+	create_track_search(conn)
+	return load_catalog(conn, iter_catalog_tables(tracks, skew, seed))
+
+
+def get_search_queries(conn) -> dict[str, tuple[str, str]]:
+	"""
+		Returns the variants of task 2.5 and the full-text searches for the same words.
+
+		The full-text variants are the match of all the titles, like the task variants,
+		and the first and a deep page of search_tracks, ranked and limited to PAGE_SIZE.
+	"""
+	task_queries = load_queries(('select_main.sql',))
+	queries = {name: task_queries[name] for name in TASK_QUERIES}
+	query = build_tsquery(SEARCH_TEXT)
+
+	queries['full_text'] = (
+		'Full-text match of all the titles',
+		f"SELECT title FROM tracks WHERE title_tsv @@ to_tsquery('simple', '{query}')"
+	)
+
+	with conn.cursor() as cur:
+		queries['full_text:page_1'] = (
+			'Full-text search, ranked first page', cur.mogrify(*get_search_query(query, PAGE_SIZE)).decode()
+		)
+
+		# The cursor of the 50th page, found by reading the pages before it with their keysets
+		after = None
+		for _ in range(49):
+			cur.execute(*get_search_query(query, PAGE_SIZE, after))
+			tracks = cur.fetchall()
+			if len(tracks) < PAGE_SIZE:
+				break
+			after = tracks[-1][3], tracks[-1][0]
+		queries['full_text:page_50'] = (
+			'Full-text search, ranked 50th page by keyset', cur.mogrify(*get_search_query(query, PAGE_SIZE, after)).decode()
+		)
+	conn.rollback()
+
+	return queries
+
+
+def run_search_benchmark(conn, tracks: int, repeat: int = 3, load: bool = True) -> dict:
+	"""
+		Times the variants of task 2.5 against the full-text search on a generated catalog.
+
+		Args:
+			tracks (int): The number of tracks of the catalog.
+			repeat (int): The number of timed runs of every query. Defaults to 3.
+			load (bool): Recreates and loads the catalog; False reuses the loaded one. Defaults to True.
+
+		Returns:
+			dict: By query name, the measurements of measure_queries, and under 'load'
+			the load statistics and seconds, if the catalog was loaded.
+	"""
+	results = {}
+	if load:
+		started = time.perf_counter()
+		results['load'] = {'stats': load_search_dataset(conn, tracks), 'seconds': time.perf_counter() - started}
+	else:
+		create_track_search(conn)
+
+	results.update(measure_queries(conn, get_search_queries(conn), repeat))
+	return results
@@ -0,0 +1,166 @@
+import re
+import time
+from itertools import islice
+
+# Escapes of the COPY text format
+COPY_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+COPY_SPECIAL_CHARACTER = re.compile(r'[\\\r]')
+# The number of rows formatted and checked at once
+COPY_BATCH_ROWS = 1000
+# The number of characters sent to the server at once
+COPY_BUFFER_SIZE = 1 << 16
+
+
+def format_copy_row(row: tuple) -> str:
+	"""Formats a row as a line of the COPY text format, None being written as NULL"""
+	return '\t'.join('\\N' if value is None else str(value).translate(COPY_ESCAPES) for value in row) + '\n'
+
+
+def format_copy_rows(rows: list[tuple]) -> str:
+	"""
+		Formats rows as lines of the COPY text format.
+
+		Values rarely need escaping, so the rows are joined as they are and the result is
+		checked as a whole: the count of separators, no backslash or carriage return and
+		no None. Only a batch failing the check is formatted value by value.
+	"""
+	text = '\n'.join(['\t'.join(map(str, row)) for row in rows]) + '\n'
+	if (
+		text.count('\t') == sum(map(len, rows)) - len(rows) and text.count('\n') == len(rows)
+		and not COPY_SPECIAL_CHARACTER.search(text) and 'None' not in text
+	):
+		return text
+	return ''.join(map(format_copy_row, rows))
+
+
+class CopyStream:
+	"""
+		File-like reader of rows in the COPY text format, for cursor.copy_expert.
+
+		The rows are formatted while COPY reads them, so a table is never held in memory.
+
+		Args:
+			rows (Iterable[tuple]): The rows, None being written as NULL.
+	"""
+
+	def __init__(self, rows):
+		self.rows = iter(rows)
+		self.count = 0
+		self._buffer = ''
+
+	def read(self, size: int = -1) -> str:
+		"""Returns up to size characters of formatted rows, all of them by default, or an empty string at the end"""
+		while size < 0 or len(self._buffer) < size:
+			batch = list(islice(self.rows, COPY_BATCH_ROWS))
+			if not batch:
+				break
+			self.count += len(batch)
+			self._buffer += format_copy_rows(batch)
+
+		if size < 0:
+			size = len(self._buffer)
+		data, self._buffer = self._buffer[:size], self._buffer[size:]
+		return data
+
+
+def get_deferred_definitions(cur, tables: list[str]) -> tuple[list, list, list]:
+	"""
+		Returns the keys, the indexes and the foreign keys of the tables.
+
+		Returns:
+			tuple[list, list, list]: The (table, constraint name, definition) of the primary
+			keys and unique constraints, the (index name, CREATE INDEX statement) of the other
+			indexes and the (table, constraint name, definition) of the foreign keys.
+	"""
+	cur.execute(
+		'''
+		SELECT c.contype, c.conrelid::regclass::text, c.conname, pg_get_constraintdef(c.oid)
+		FROM pg_constraint c
+		WHERE c.conrelid = ANY(%s::regclass[]) AND c.contype IN ('p', 'u', 'f')
+		ORDER BY c.conrelid::regclass::text, c.conname
+		''',
+		(tables,)
+	)
+	constraints = cur.fetchall()
+
+	cur.execute(
+		'''
+		SELECT i.indexrelid::regclass::text, pg_get_indexdef(i.indexrelid)
+		FROM pg_index i
+		WHERE i.indrelid = ANY(%s::regclass[])
+			AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = i.indexrelid AND c.contype IN ('p', 'u'))
+		ORDER BY i.indexrelid
+		''',
+		(tables,)
+	)
+	indexes = cur.fetchall()
+
+	keys = [constraint[1:] for constraint in constraints if constraint[0] in ('p', 'u')]
+	foreign_keys = [constraint[1:] for constraint in constraints if constraint[0] == 'f']
+	return keys, indexes, foreign_keys
+
+
+def load_catalog(conn, catalog_tables, maintenance_work_mem: str = '256MB') -> dict:
+	"""
+		Replaces the content of the tables of a catalog with COPY, building the indexes after the load.
+
+		The foreign keys, primary keys, unique constraints and indexes of the tables are
+		dropped before the load and created again after it: one sort per index is much
+		faster than inserting every row into every index, and the foreign keys are then
+		checked in one join per constraint instead of one lookup per row. All of it runs
+		in one transaction, so a failed load leaves the tables and their indexes as they were.
+
+		Args:
+			catalog_tables (Iterable[tuple[str, tuple, Iterable[tuple]]]): The table names,
+				columns and rows in foreign key order, like iter_catalog_tables yields them.
+			maintenance_work_mem (str): The memory of every index build. Defaults to '256MB'.
+
+		Returns:
+			dict: By table, the number of rows and the load time in seconds, and under
+			'indexes' the time in seconds of the index and constraint builds.
+	"""
+	catalog_tables = list(catalog_tables)
+	tables = [table for table, _, _ in catalog_tables]
+	stats = {}
+
+	with conn.cursor() as cur:
+		cur.execute('SET LOCAL maintenance_work_mem = %s', (maintenance_work_mem,))
+		keys, indexes, foreign_keys = get_deferred_definitions(cur, tables)
+
+		for table, name, _ in foreign_keys + keys:
+			cur.execute(f'ALTER TABLE {table} DROP CONSTRAINT {name}')
+		for name, _ in indexes:
+			cur.execute(f'DROP INDEX {name}')
+
+		cur.execute(f'TRUNCATE {", ".join(tables)} RESTART IDENTITY')
+
+		for table, columns, rows in catalog_tables:
+			stream = CopyStream(rows)
+			started = time.perf_counter()
+			cur.copy_expert(f'COPY {table} ({", ".join(columns)}) FROM STDIN', stream, COPY_BUFFER_SIZE)
+			stats[table] = {'rows': stream.count, 'seconds': time.perf_counter() - started}
+
+			# The IDs are given explicitly, the sequence continues after them
+			cur.execute('SELECT pg_get_serial_sequence(%s, %s)', (table, columns[0]))
+			sequence, = cur.fetchone()
+			if sequence is not None:
+				cur.execute(f'SELECT setval(%s, COALESCE(MAX({columns[0]}), 0) + 1, false) FROM {table}', (sequence,))
+
+		started = time.perf_counter()
+		for table, name, definition in keys:
+			cur.execute(f'ALTER TABLE {table} ADD CONSTRAINT {name} {definition}')
+		for _, definition in indexes:
+			cur.execute(definition)
+		for table, name, definition in foreign_keys:
+			cur.execute(f'ALTER TABLE {table} ADD CONSTRAINT {name} {definition}')
+		stats['indexes'] = {'seconds': time.perf_counter() - started}
+	conn.commit()
+
+	conn.autocommit = True
+	try:
+		with conn.cursor() as cur:
+			cur.execute(f'ANALYZE {", ".join(tables)}')
+	finally:
+		conn.autocommit = False
+
+	return stats
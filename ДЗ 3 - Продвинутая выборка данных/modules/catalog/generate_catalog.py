@@ -0,0 +1,142 @@
+import random
+from itertools import accumulate
+
+GENRES = (
+	'Pop', 'Rock', 'Hip hop', 'Rap', 'K-pop', 'R&B', 'Jazz', 'Blues', 'Classical', 'Electronic', 'House', 'Techno',
+	'Trance', 'Drum and bass', 'Dubstep', 'Ambient', 'Metal', 'Punk', 'Indie', 'Folk', 'Country', 'Reggae', 'Soul',
+	'Funk', 'Disco', 'Latin', 'Gospel', 'Grunge', 'Shoegaze', 'Lo-fi', 'Synthwave', 'Шансон', 'Русский рок', 'Эстрада',
+)
+# Words of the generated titles and names, English and Russian like the tracks of insert.sql
+TITLE_WORDS = (
+	'my', 'love', 'night', 'day', 'heart', 'fire', 'light', 'dream', 'home', 'way', 'time', 'rain', 'star', 'sky',
+	'girl', 'boy', 'dance', 'summer', 'moon', 'city', 'gold', 'blue', 'wild', 'lost', 'forever', 'again', 'theory',
+	'мой', 'моя', 'любовь', 'ночь', 'день', 'сердце', 'огонь', 'свет', 'мечта', 'дом', 'путь', 'время', 'дождь',
+	'звезда', 'небо', 'танец', 'лето', 'луна', 'город', 'весь', 'мир', 'навсегда', 'снова', 'песня', 'ветер',
+)
+START_YEAR, END_YEAR = 1960, 2025
+
+# The tables of create.sql in foreign key order, with the columns the generator fills
+CATALOG_TABLES = {
+	'genres': ('genre_id', 'name'),
+	'artists': ('artist_id', 'name'),
+	'albums': ('album_id', 'title', 'release_year'),
+	'tracks': ('track_id', 'title', 'duration', 'album_id'),
+	'collections': ('collection_id', 'title', 'release_year'),
+	'artist_genres': ('artist_id', 'genre_id'),
+	'album_artists': ('album_id', 'artist_id'),
+	'collection_tracks': ('collection_id', 'track_id'),
+}
+
+
+def get_catalog_sizes(tracks: int) -> dict:
+	"""Gets the number of rows of every entity for the given number of tracks"""
+	return {
+		'genres': len(GENRES),
+		'artists': max(tracks // 50, 2),
+		'albums': max(tracks // 10, 1),
+		'tracks': max(tracks, 1),
+		'collections': max(tracks // 100, 1),
+	}
+
+
+def get_zipf_weights(count: int, skew: float) -> list[float]:
+	"""Gets cumulative Zipf weights: the item of rank n is chosen with weight 1 / n ** skew"""
+	return list(accumulate(1 / rank ** skew for rank in range(1, count + 1)))
+
+
+def get_title(rng: random.Random, min_words: int = 1, max_words: int = 4) -> str:
+	"""Gets a capitalized title of random TITLE_WORDS"""
+	return ' '.join(rng.choices(TITLE_WORDS, k=rng.randint(min_words, max_words))).capitalize()
+
+
+def get_release_year(rng: random.Random) -> int:
+	"""Gets a release year between START_YEAR and END_YEAR, recent years being the most frequent"""
+	return max(END_YEAR - int(rng.expovariate(1 / 12)), START_YEAR)
+
+
+def iter_catalog_tables(tracks: int, skew: float = 1.1, seed: int = 0):
+	"""
+		Yields the tables of a generated music catalog in foreign key order.
+
+		The artists are ranked by popularity with a Zipf distribution: the popular ones
+		release most albums, have featured artists and fill most of the collections.
+		Every album holds a contiguous range of track IDs, 10 tracks on average.
+		The rows of a table are generated lazily, while it is consumed, so the
+		tables must be consumed in order.
+
+		Args:
+			tracks (int): The number of tracks. The other tables are sized relative to it.
+			skew (float): The Zipf exponent of the artist popularity, 0 spreads it evenly. Defaults to 1.1.
+			seed (int): The random seed, the same seed yields the same catalog. Defaults to 0.
+
+		Yields:
+			tuple[str, tuple, Iterator[tuple]]: The table name, its columns and its rows.
+	"""
+	rng = random.Random(seed)
+	sizes = get_catalog_sizes(tracks)
+	artist_ids = range(1, sizes['artists'] + 1)
+	artist_weights = get_zipf_weights(sizes['artists'], skew)
+
+	# The main artist of every album and the first track of every album, plus the end of the last one
+	album_artists = rng.choices(artist_ids, cum_weights=artist_weights, k=sizes['albums'])
+	album_starts = [1, *sorted(rng.sample(range(2, sizes['tracks'] + 1), sizes['albums'] - 1)), sizes['tracks'] + 1]
+	artist_albums = {}
+	for album_id, artist_id in enumerate(album_artists, 1):
+		artist_albums.setdefault(artist_id, []).append(album_id)
+
+	def iter_genres():
+		for genre_id, name in enumerate(GENRES, 1):
+			yield genre_id, name
+
+	def iter_artists():
+		for artist_id in artist_ids:
+			# Every third name is one word, as task 2.4 looks for them
+			if artist_id % 3:
+				yield artist_id, f'{get_title(rng, 2, 2)} {artist_id}'
+			else:
+				yield artist_id, f'{rng.choice(TITLE_WORDS).capitalize()}{artist_id}'
+
+	def iter_albums():
+		for album_id in range(1, sizes['albums'] + 1):
+			yield album_id, f'{get_title(rng)} {album_id}', get_release_year(rng)
+
+	def iter_tracks():
+		for album_id in range(1, sizes['albums'] + 1):
+			for track_id in range(album_starts[album_id - 1], album_starts[album_id]):
+				duration = min(max(int(rng.lognormvariate(5.35, 0.3)), 30), 1200)
+				yield track_id, get_title(rng), duration, album_id
+
+	def iter_collections():
+		for collection_id in range(1, sizes['collections'] + 1):
+			yield collection_id, f'{get_title(rng)} {collection_id}', get_release_year(rng)
+
+	def iter_artist_genres():
+		for artist_id in artist_ids:
+			genre_ids = {rng.randint(1, sizes['genres']) for _ in range(1 + (rng.random() < 0.3) + (rng.random() < 0.1))}
+			for genre_id in sorted(genre_ids):
+				yield artist_id, genre_id
+
+	def iter_album_artists():
+		for album_id, artist_id in enumerate(album_artists, 1):
+			yield album_id, artist_id
+			if rng.random() < 0.15:
+				featured_id = rng.choices(artist_ids, cum_weights=artist_weights)[0]
+				if featured_id != artist_id:
+					yield album_id, featured_id
+
+	def iter_collection_tracks():
+		for collection_id in range(1, sizes['collections'] + 1):
+			track_ids = set()
+			for artist_id in rng.choices(artist_ids, cum_weights=artist_weights, k=rng.randint(10, 30)):
+				# An artist may have no album, the track is then taken from any album
+				album_id = rng.choice(artist_albums.get(artist_id) or range(1, sizes['albums'] + 1))
+				track_ids.add(rng.randrange(album_starts[album_id - 1], album_starts[album_id]))
+			for track_id in sorted(track_ids):
+				yield collection_id, track_id
+
+	generators = (
+		iter_genres, iter_artists, iter_albums, iter_tracks,
+		iter_collections, iter_artist_genres, iter_album_artists, iter_collection_tracks,
+	)
+	for (table, columns), generator in zip(CATALOG_TABLES.items(), generators):
+		yield table, columns, generator()
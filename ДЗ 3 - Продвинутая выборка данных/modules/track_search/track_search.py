@@ -0,0 +1,137 @@
+import os
+import re
+
+TRACK_SEARCH_SQL = os.path.join(os.path.dirname(__file__), '..', '..', 'track_search.sql')
+# The search modes: any of the words, as task 2.5 does, or all of them
+SEARCH_OPERATORS = {'any': ' | ', 'all': ' & '}
+# Normalization 1 of ts_rank divides the rank by 1 + log of the title length, so short titles come first
+RANK_SQL = "ts_rank(title_tsv, to_tsquery('simple', %(query)s), 1)::numeric(10, 8)"
+WORD_PATTERN = re.compile(r'\w+')
+
+
+def create_track_search(conn) -> None:
+	"""Adds the tsvector column of the track titles and its GIN index of track_search.sql"""
+	with open(TRACK_SEARCH_SQL, encoding='utf-8') as file:
+		script = file.read()
+
+	with conn.cursor() as cur:
+		cur.execute(script)
+	conn.commit()
+
+
+def build_tsquery(text: str, mode: str = 'any') -> str:
+	"""
+		Builds the text of a tsquery from the words of a search string.
+
+		Only the letters, digits and underscores of the string are kept, so that
+		no tsquery operator or syntax error can come from it.
+
+		Args:
+			text (str): The words to search for, like 'my мой'.
+			mode (str): 'any' to match the titles with any of the words, 'all' with all of them.
+
+		Returns:
+			str: The text for to_tsquery('simple', ...), empty if the string has no word.
+
+		Raises:
+			ValueError: If the mode is not one of SEARCH_OPERATORS.
+	"""
+	if mode not in SEARCH_OPERATORS:
+		raise ValueError(f'Unknown search mode: {mode}, expected one of {", ".join(SEARCH_OPERATORS)}')
+	return SEARCH_OPERATORS[mode].join(WORD_PATTERN.findall(text.lower()))
+
+
+def get_matches_sql(max_matches: int = None) -> str:
+	"""Returns the SQL of the tracks matching %(query)s, only the max_matches newest of them if it is given"""
+	if max_matches is None:
+		return "SELECT track_id, title, duration, title_tsv FROM tracks WHERE title_tsv @@ to_tsquery('simple', %(query)s)"
+	return (
+		"SELECT track_id, title, duration, title_tsv FROM tracks WHERE title_tsv @@ to_tsquery('simple', %(query)s) "
+		"ORDER BY track_id DESC LIMIT %(max_matches)s"
+	)
+
+
+def get_search_query(query: str, limit: int = 20, after: tuple = None, max_matches: int = None) -> tuple[str, dict]:
+	"""Returns the SQL and parameters of a page of search_tracks for the text of a tsquery"""
+	keyset = ''
+	params = {'query': query, 'limit': limit, 'max_matches': max_matches}
+	if after is not None:
+		keyset = f'WHERE ({RANK_SQL}, track_id) < (%(rank)s, %(track_id)s)'
+		params['rank'], params['track_id'] = after
+
+	sql = f'''
+		SELECT track_id, title, duration, {RANK_SQL} AS rank
+		FROM ({get_matches_sql(max_matches)}) AS matches
+		{keyset}
+		ORDER BY rank DESC, track_id DESC
+		LIMIT %(limit)s
+	'''
+	return sql, params
+
+
+def is_truncated(cur, query: str, max_matches: int = None) -> bool:
+	"""Checks whether more tracks than max_matches match the text of a tsquery, reading at most one more"""
+	if max_matches is None:
+		return False
+
+	cur.execute(
+		"""
+		SELECT count(*) > %(max_matches)s
+		FROM (
+			SELECT 1 FROM tracks WHERE title_tsv @@ to_tsquery('simple', %(query)s) LIMIT %(max_matches)s + 1
+		) AS matches
+		""",
+		{'query': query, 'max_matches': max_matches}
+	)
+	return cur.fetchone()[0]
+
+
+def search_tracks(
+		conn, text: str, mode: str = 'any', limit: int = 20, after: tuple = None, max_matches: int = None
+) -> tuple[list, tuple, bool]:
+	"""
+		Finds the tracks whose titles contain the words, the most relevant first.
+
+		The titles are matched through the GIN index of title_tsv. The pages are read
+		with a keyset on the rank and the track ID instead of an OFFSET, but the rank is
+		computed, so every page still ranks all the matches to find its rows. For a
+		frequent word that cost can be capped with max_matches: only the newest
+		max_matches matches are then ranked and paged, and the result says so.
+
+		Args:
+			text (str): The words to search for.
+			mode (str): 'any' or 'all' of the words. Defaults to 'any'.
+			limit (int): The number of tracks of a page. Defaults to 20.
+			after (tuple, optional): The cursor returned with the previous page.
+			max_matches (int, optional): Rank only the newest max_matches matches. Defaults to all of them.
+
+		Returns:
+			tuple[list, tuple, bool]: The (track_id, title, duration, rank) of the page, the
+			cursor of the next page, None after the last one, and whether max_matches
+			left out some of the matches.
+	"""
+	query = build_tsquery(text, mode)
+	if not query:
+		return [], None, False
+
+	with conn.cursor() as cur:
+		cur.execute(*get_search_query(query, limit, after, max_matches))
+		tracks = cur.fetchall()
+		truncated = is_truncated(cur, query, max_matches)
+
+	next_after = (tracks[-1][3], tracks[-1][0]) if len(tracks) == limit else None
+	return tracks, next_after, truncated
+
+
+def count_tracks(conn, text: str, mode: str = 'any', max_matches: int = None) -> int:
+	"""Returns the number of tracks whose titles contain the words, at most max_matches as search_tracks pages them"""
+	query = build_tsquery(text, mode)
+	if not query:
+		return 0
+
+	with conn.cursor() as cur:
+		cur.execute(
+			f'SELECT COUNT(*) FROM ({get_matches_sql(max_matches)}) AS matches',
+			{'query': query, 'max_matches': max_matches}
+		)
+		return cur.fetchone()[0]
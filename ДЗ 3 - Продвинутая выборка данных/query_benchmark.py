@@ -0,0 +1,39 @@
+import argparse
+import sys
+
+import psycopg2
+
+from modules.benchmarks.query_benchmark import find_regressions, read_last_results, run_benchmark, write_results
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser(
+		description='Times and explains the queries of select_main.sql and select_additional.sql.'
+	)
+	parser.add_argument('--dsn', default='dbname=music_benchmark',
+						help='libpq connection string of a scratch database, its tables are recreated')
+	parser.add_argument('--scales', default='10000,100000,1000000', help='comma-separated numbers of tracks')
+	parser.add_argument('--repeat', type=int, default=3, help='number of timed runs of every query')
+	parser.add_argument('--output', default='query_benchmark.jsonl', help='JSON lines file the results are appended to')
+	parser.add_argument('--baseline', help='JSON lines file of the run to compare with, defaults to the output file')
+	parser.add_argument('--threshold', type=float, default=0.5,
+						help='slowdown share, beyond the change of the reference query, flagged as a regression')
+	args = parser.parse_args()
+
+	# The last saved run is the baseline, read before the new one is appended
+	baseline = read_last_results(args.baseline or args.output)
+
+	conn = psycopg2.connect(args.dsn)
+	results = run_benchmark(conn, [int(scale) for scale in args.scales.split(',')], args.repeat)
+	conn.close()
+	write_results(args.output, results, scales=args.scales, repeat=args.repeat)
+
+	for scale, queries in results.items():
+		print(f'{scale} tracks:')
+		for name, result in queries.items():
+			print(f'  {name:<24}{result["ms"]:>10.2f} ms{result["rows"]:>9} rows  {result["description"][:60]}')
+
+	# Fail if a query got slower or lost an index scan since the baseline
+	regressions = find_regressions(results, baseline, args.threshold)
+	for regression in regressions:
+		print(f'REGRESSION | {regression}')
+	sys.exit(1 if regressions else 0)
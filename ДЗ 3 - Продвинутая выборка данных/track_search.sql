@@ -0,0 +1,8 @@
+-- == Полнотекстовый поиск треков по словам названия ==
+-- Конфигурация 'simple' приводит слова к нижнему регистру без стемминга,
+-- поэтому одинаково работает для русских и английских названий и ищет слово
+-- целиком, как варианты задания 2.5 ("мой" не находит "моя").
+ALTER TABLE tracks ADD COLUMN IF NOT EXISTS title_tsv tsvector
+    GENERATED ALWAYS AS (to_tsvector('simple', title)) STORED;
+
+CREATE INDEX IF NOT EXISTS tracks_title_tsv_idx ON tracks USING gin (title_tsv);
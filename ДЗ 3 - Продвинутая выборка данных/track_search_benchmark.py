@@ -0,0 +1,28 @@
+import argparse
+
+import psycopg2
+
+from modules.benchmarks.query_benchmark import write_results
+from modules.benchmarks.search_benchmark import run_search_benchmark
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser(description='Times the word searches of task 2.5 against the full-text search.')
+	parser.add_argument('--dsn', default='dbname=music_benchmark',
+						help='libpq connection string of a scratch database, its tables are recreated')
+	parser.add_argument('--tracks', type=int, default=10_000_000, help='number of generated tracks')
+	parser.add_argument('--repeat', type=int, default=3, help='number of timed runs of every query')
+	parser.add_argument('--no-load', action='store_true', help='reuse the catalog loaded by a previous run')
+	parser.add_argument('--output', default='track_search_benchmark.jsonl',
+						help='JSON lines file the results are appended to')
+	args = parser.parse_args()
+
+	conn = psycopg2.connect(args.dsn)
+	results = run_search_benchmark(conn, args.tracks, args.repeat, load=not args.no_load)
+	conn.close()
+	write_results(args.output, results, tracks=args.tracks, repeat=args.repeat)
+
+	if 'load' in results:
+		print(f'Loaded {args.tracks:,} tracks in {results.pop("load")["seconds"]:.1f} s\n')
+
+	for name, result in results.items():
+		print(f'{name:<20}{result["ms"]:>11.2f} ms{result["rows"]:>9} rows  {", ".join(result["scans"])}')
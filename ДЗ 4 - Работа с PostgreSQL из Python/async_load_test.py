@@ -0,0 +1,63 @@
+import asyncio
+import configparser
+import random
+import time
+
+from modules.async_management.async_clients import add_client, create_pool, find_client, show_client_phone
+
+config = configparser.ConfigParser()
+config.read('settings.ini')
+user, password = config['DB']['username'], config['DB']['password']
+host, database = config['DB']['host'], config['DB']['database']
+
+CONCURRENCY_LEVELS = (1, 2, 4, 8, 16, 32, 64)
+OPERATIONS = 2000
+CLIENTS = 1000
+
+
+async def seed_clients(pool) -> list[tuple[int, str]]:
+	"""Adds the clients the load test looks up and returns their ids with the names they were added with"""
+	suffix = int(time.time())
+	clients = []
+
+	for i in range(CLIENTS):
+		name = f'Load{i}'
+		client_id = await add_client(pool, name, 'Test', f'load{i}.{suffix}@ex.com', f'+7{suffix % 10 ** 6:06d}{i:04d}')
+		clients.append((client_id, name))
+
+	return clients
+
+
+async def run_level(pool, clients: list[tuple[int, str]], concurrency: int) -> float:
+	"""Runs OPERATIONS lookups with the given number of concurrent workers and returns operations per second"""
+	remaining = iter(range(OPERATIONS))
+
+	async def worker() -> None:
+		for _ in remaining:
+			client_id, name = random.choice(clients)
+			if random.random() < 0.5:
+				await find_client(pool, name=name, surname='Test')
+			else:
+				await show_client_phone(pool, client_id)
+
+	started = time.perf_counter()
+	await asyncio.gather(*(worker() for _ in range(concurrency)))
+	return OPERATIONS / (time.perf_counter() - started)
+
+
+async def main() -> None:
+	pool = await create_pool(
+		max_size=max(CONCURRENCY_LEVELS), user=user, password=password, host=host, database=database
+	)
+	clients = await seed_clients(pool)
+
+	for concurrency in CONCURRENCY_LEVELS:
+		print(f'concurrency {concurrency:>2}: {await run_level(pool, clients, concurrency):8.0f} ops/s')
+
+	async with pool.acquire() as conn:
+		await conn.execute('DELETE FROM clients WHERE id = ANY($1::int[])', [client_id for client_id, _ in clients])
+	await pool.close()
+
+
+if __name__ == '__main__':
+	asyncio.run(main())
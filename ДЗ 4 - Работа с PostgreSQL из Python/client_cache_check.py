@@ -0,0 +1,69 @@
+import threading
+
+from modules.management.client_cache import ClientCache, MemoryCache
+
+CLIENT_ID = 1
+
+
+def check_phones_load_interleaved_with_invalidate() -> None:
+	"""Checks that phones loaded before an invalidation are not served after it"""
+	cache = ClientCache(MemoryCache())
+	phones = ['+71234567890']
+
+	def load_then_update() -> list[str]:
+		# The read sees the old phones, then the update commits and invalidates before the read stores them
+		old_phones = list(phones)
+		phones[:] = ['+70987654321']
+		cache.invalidate([CLIENT_ID])
+		return old_phones
+
+	assert cache.get_phones(CLIENT_ID, load_then_update) == ['+71234567890']
+	assert cache.get_phones(CLIENT_ID, lambda: list(phones)) == ['+70987654321'], 'the old phones were served'
+	assert cache.get_phones(CLIENT_ID, lambda: ['unexpected load']) == ['+70987654321'], 'the new phones were not cached'
+
+
+def check_search_load_interleaved_with_invalidate() -> None:
+	"""Checks that a search loaded before an invalidation is not served after it"""
+	cache = ClientCache(MemoryCache())
+	criteria = ('Name', None, None, None)
+
+	def load_then_update() -> list[int]:
+		cache.invalidate([CLIENT_ID])
+		return []
+
+	assert cache.get_search(criteria, load_then_update) == []
+	assert cache.get_search(criteria, lambda: [CLIENT_ID]) == [CLIENT_ID], 'the old search result was served'
+
+
+def check_concurrent_load_and_invalidate(rounds: int = 1000) -> None:
+	"""Checks the interleaving with a load and an invalidation running in two threads"""
+	for round_number in range(rounds):
+		cache = ClientCache(MemoryCache())
+		loading, invalidated = threading.Event(), threading.Event()
+		phones = [f'+7{round_number:010d}']
+
+		def load() -> list[str]:
+			old_phones = list(phones)
+			loading.set()
+			invalidated.wait()
+			return old_phones
+
+		def update() -> None:
+			loading.wait()
+			phones[:] = ['+70000000000']
+			cache.invalidate([CLIENT_ID])
+			invalidated.set()
+
+		thread = threading.Thread(target=update)
+		thread.start()
+		cache.get_phones(CLIENT_ID, load)
+		thread.join()
+
+		assert cache.get_phones(CLIENT_ID, lambda: list(phones)) == ['+70000000000'], 'the old phones were served'
+
+
+if __name__ == '__main__':
+	check_phones_load_interleaved_with_invalidate()
+	check_search_load_interleaved_with_invalidate()
+	check_concurrent_load_and_invalidate()
+	print('The client cache checks passed.')
@@ -1,30 +1,58 @@
-import psycopg2
 import configparser
+from modules.db_pool.db_pool import ConnectionPool
 from modules.create_db.create_db import create_db
+from modules.instrumentation.instrumentation import InstrumentedCursor, configure_logging, logger, metrics
 from modules.management.add_delete_client import add_client, del_client
+from modules.management.bulk_clients import add_clients_bulk, read_clients_csv
+from modules.management.client_cache import ClientCache, MemoryCache, get_client_cache, set_client_cache
 from modules.management.find_client import find_client
 from modules.management.phone import add_phone, del_phone
 from modules.management.update_info import update_client_info
 from modules.management.phone import show_client_phone
+from modules.management.search_client import search_clients, search_clients_by_phone
+from modules.show_tables.export_tables import export_table
 from modules.show_tables.show_tables import *
 
 config = configparser.ConfigParser()
 config.read('settings.ini')
 user, password = config['DB']['username'], config['DB']['password']
 host, database = config['DB']['host'], config['DB']['database']
+pool_min, pool_max = config['DB'].getint('pool_min', 1), config['DB'].getint('pool_max', 10)
+# The optional [LOG] section: quiet = yes turns off stdout, json = yes writes the messages as JSON objects,
+# metrics_file receives the latency histograms
+log_level, quiet = config.get('LOG', 'level', fallback='INFO'), config.getboolean('LOG', 'quiet', fallback=False)
+json_format = config.getboolean('LOG', 'json', fallback=False)
+metrics_file = config.get('LOG', 'metrics_file', fallback=None)
 
 if __name__ == '__main__':
-	with psycopg2.connect(
-			user=user,
-			password=password,
-			host=host,
-			database=database
-	) as conn:
+	configure_logging(log_level, quiet, json_format)
+
+	pool = ConnectionPool(
+		pool_min,
+		pool_max,
+		user=user,
+		password=password,
+		host=host,
+		database=database,
+		cursor_factory=InstrumentedCursor
+	)
+
+	# Caching the results of find_client and show_client_phone in the process
+	# (SocketCache('/tmp/memcached.sock') shares them between processes through memcached)
+	set_client_cache(ClientCache(MemoryCache(max_size=10000, ttl=60)))
+
+	# Every operation in the block is committed at its end, or rolled back on an error
+	with pool.transaction() as conn:
 		create_db(conn)
 
 		# |— Adding some clients
 		# add_client(conn, 'John', 'Doe', 'jdoe@ex.com')
 
+		# |— Adding clients from a CSV file with the name, surname, email and phones columns
+		# (its batches are committed one by one, so it takes a connection of its own)
+		# with open('clients.csv', encoding='utf-8') as clients_file, pool.connection() as bulk_conn:
+		# 	client_ids, errors = add_clients_bulk(bulk_conn, read_clients_csv(clients_file))
+
 		# |— Adding some phones
 		# add_phone(conn, 1, '+1233336633')
 
@@ -40,9 +68,22 @@ if __name__ == '__main__':
 		# |— Finding clients id in the database
 		# find_client(conn, name='James')
 
+		# |— Searching clients by a part of their data or with typos
+		# search_clients(conn, 'jam', mode='prefix')
+		# search_clients(conn, 'Jmaes', mode='fuzzy')
+		# search_clients_by_phone(conn, '8 (123) 333')
+
 		# |— Showing client phone
 		# show_client_phone(conn, 1)
 
+		# |— Exporting the clients with their phones without loading the whole table in memory
+		# export_table(conn, 'clients_with_phones', 'csv', 'clients.csv')
+
 		# Checking results from queries above in the terminal
 		show_all_tables(conn)
 
+	logger.info(f'Connection pool usage: {pool.get_stats()}')
+	logger.info(f'Client cache usage: {get_client_cache().get_stats()}')
+	if metrics_file:
+		metrics.write(metrics_file)
+	pool.close()
@@ -0,0 +1,230 @@
+import asyncio
+
+import asyncpg
+
+from ..management.phone import add_plus_to_phone
+from ..validate import validate_client_id, validate_client_info, validate_email, validate_phones, validate_string
+
+
+async def create_pool(min_size: int = 1, max_size: int = 10, **connect_kwargs) -> asyncpg.Pool:
+	"""
+		Creates a pool of asyncpg connections for the async client manager.
+
+		Args:
+			min_size (int): The number of connections opened in advance. Defaults to 1.
+			max_size (int): The maximum number of open connections. Defaults to 10.
+			**connect_kwargs: The asyncpg.connect arguments, e.g. user, password, host, database.
+
+		Returns:
+			asyncpg.Pool: The connection pool.
+	"""
+	return await asyncpg.create_pool(min_size=min_size, max_size=max_size, **connect_kwargs)
+
+
+async def add_client(pool: asyncpg.Pool, name: str, surname: str, email: str, phone: str = None) -> int:
+	"""
+		Adds a new client and, optionally, their phone to the database in one transaction.
+
+		Args:
+			pool (asyncpg.Pool): The connection pool.
+			name (str): The name of the client.
+			surname (str): The surname of the client.
+			email (str): The email of the client.
+			phone (str, optional): The phone of the client.
+
+		Returns:
+			int: The ID of the newly added client.
+
+		Raises:
+			ValueError: If name, surname, email or phone is invalid.
+	"""
+	validate_string('name', name)
+	validate_string('surname', surname)
+	validate_email(email)
+	validate_phones(phone)
+
+	async with pool.acquire() as conn, conn.transaction():
+		client_id = await conn.fetchval(
+			'INSERT INTO clients (name, surname, email) VALUES ($1, $2, $3) RETURNING id',
+			name.strip(), surname.strip(), email.strip()
+		)
+
+		if phone:
+			await conn.execute(
+				'INSERT INTO phones (client_id, phone) VALUES ($1, $2)',
+				client_id, add_plus_to_phone(phone)
+			)
+
+	return client_id
+
+
+async def del_client(pool: asyncpg.Pool, client_id: int) -> None:
+	"""
+		Deletes a client and their associated phone records from the database.
+
+		Raises:
+			ValueError: If client_id is not a positive integer or does not exist in the database.
+	"""
+	validate_client_id(client_id)
+
+	deleted_id = await pool.fetchval('DELETE FROM clients WHERE id = $1 RETURNING id', client_id)
+
+	if deleted_id is None:
+		raise ValueError('Client ID does not exist in the database')
+
+
+async def add_phone(pool: asyncpg.Pool, client_id: int, phone: str) -> int:
+	"""
+		Adds a new phone number to the client's account.
+
+		Returns:
+			int: The ID of the newly added phone.
+
+		Raises:
+			ValueError: If client_id or phone is invalid.
+	"""
+	validate_client_id(client_id)
+	validate_phones(phone)
+
+	return await pool.fetchval(
+		'INSERT INTO phones (client_id, phone) VALUES ($1, $2) RETURNING id',
+		client_id, add_plus_to_phone(phone)
+	)
+
+
+async def del_phone(pool: asyncpg.Pool, client_id: int, phone: str) -> None:
+	"""
+		Deletes a phone number from the client's account.
+
+		Raises:
+			ValueError: If client_id or phone is invalid, or the client has no such phone.
+	"""
+	validate_client_id(client_id)
+	validate_phones(phone)
+
+	deleted_id = await pool.fetchval(
+		'DELETE FROM phones WHERE client_id = $1 AND phone = $2 RETURNING id',
+		client_id, add_plus_to_phone(phone)
+	)
+
+	if deleted_id is None:
+		raise ValueError('The client has no such phone number')
+
+
+async def update_client_info(
+		pool: asyncpg.Pool, client_id: int, name: str = None,
+		surname: str = None, email: str = None, phones: list[str] | str = None
+) -> None:
+	"""
+		Updates the information of a client in one transaction.
+
+		Only the given fields are changed. The given phones replace the client's phones,
+		and only the difference between the current and the new phones is written.
+
+		Raises:
+			ValueError: If the arguments are invalid or client_id does not exist in the database.
+	"""
+	validate_client_id(client_id)
+	validate_client_info(name, surname, email, phones)
+
+	changes = {column: value for column, value in (('name', name), ('surname', surname), ('email', email))
+			   if value is not None}
+
+	async with pool.acquire() as conn, conn.transaction():
+		if changes:
+			assignments = ', '.join(f'{column} = ${number}' for number, column in enumerate(changes, start=2))
+			updated_id = await conn.fetchval(
+				f'UPDATE clients SET {assignments} WHERE id = $1 RETURNING id',
+				client_id, *changes.values()
+			)
+		else:
+			updated_id = await conn.fetchval('SELECT id FROM clients WHERE id = $1', client_id)
+
+		if updated_id is None:
+			raise ValueError('Client ID does not exist in the database')
+
+		if phones:
+			await sync_client_phones(conn, client_id, phones)
+
+
+async def sync_client_phones(conn: asyncpg.Connection, client_id: int, phones: list[str] | str) -> None:
+	"""
+		Replaces the phones of a client with the new ones, writing only the changed rows.
+
+		The removed phones are deleted first, so the inserted ones never clash with them.
+	"""
+	if isinstance(phones, str):
+		phones = [phones]
+	new_phones = [add_plus_to_phone(phone) for phone in phones]
+
+	await conn.execute(
+		'DELETE FROM phones WHERE client_id = $1 AND phone <> ALL($2::varchar[])',
+		client_id, new_phones
+	)
+	await conn.execute(
+		"""
+		INSERT INTO phones (client_id, phone)
+		SELECT DISTINCT $1::integer, n.phone
+		FROM unnest($2::varchar[]) AS n (phone)
+		WHERE NOT EXISTS (SELECT 1 FROM phones p WHERE p.client_id = $1 AND p.phone = n.phone)
+		""",
+		client_id, new_phones
+	)
+
+
+async def find_client(
+		pool: asyncpg.Pool, name: str = None, surname: str = None,
+		email: str = None, phone: str = None
+) -> list[int]:
+	"""
+		Finds clients by name, surname, email and phone number.
+
+		Only the given criteria are added to the query, as in the synchronous find_client.
+
+		Returns:
+			list[int]: The IDs of the found clients.
+
+		Raises:
+			ValueError: If no criterion is given or a criterion is invalid.
+	"""
+	validate_client_info(name, surname, email, phone)
+
+	criteria = {'c.name = {}': name, 'c.surname = {}': surname, 'lower(c.email) = lower({})': email}
+	if phone:
+		criteria['p.phone = {}'] = add_plus_to_phone(phone)
+	criteria = {condition: value for condition, value in criteria.items() if value is not None}
+
+	join = 'JOIN phones p ON p.client_id = c.id' if phone else ''
+	conditions = ' AND '.join(
+		condition.format(f'${number}') for number, condition in enumerate(criteria, start=1)
+	)
+	rows = await pool.fetch(f'SELECT c.id FROM clients c {join} WHERE {conditions}', *criteria.values())
+
+	return [row['id'] for row in rows]
+
+
+async def show_client_phone(pool: asyncpg.Pool, client_id: int) -> list[str]:
+	"""
+		Returns the phone numbers of the client with the given ID.
+
+		Raises:
+			ValueError: If client_id is not a positive integer.
+	"""
+	validate_client_id(client_id)
+
+	rows = await pool.fetch('SELECT phone FROM phones WHERE client_id = $1', client_id)
+	return [row['phone'] for row in rows]
+
+
+async def find_clients_concurrently(pool: asyncpg.Pool, criteria: list[dict]) -> list[list[int]]:
+	"""
+		Runs several client searches concurrently on the connections of the pool.
+
+		Args:
+			pool (asyncpg.Pool): The connection pool.
+			criteria (list[dict]): The find_client keyword arguments of every search.
+
+		Returns:
+			list[list[int]]: The IDs of the found clients for every search, in the given order.
+	"""
+	return await asyncio.gather(*(find_client(pool, **search) for search in criteria))
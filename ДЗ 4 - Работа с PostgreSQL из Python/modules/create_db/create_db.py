@@ -1,6 +1,7 @@
 def create_db(conn) -> None:
     """
-        Creates a database with two tables: 'clients' and 'phones'.
+        Creates a database with two tables: 'clients' and 'phones', and the indexes of
+        the client search.
 
         Parameters:
             conn (psycopg2.extensions.connection): The database connection object.
@@ -24,5 +25,19 @@ def create_db(conn) -> None:
                 phone VARCHAR(20) UNIQUE CHECK (phone ~ '^[0-9+()-]{10,20}$')
             );
         """)
+        cur.execute('CREATE INDEX IF NOT EXISTS phones_client_id_idx ON phones (client_id);')
+        cur.execute('CREATE INDEX IF NOT EXISTS clients_surname_name_idx ON clients (surname, name);')
+        cur.execute('CREATE INDEX IF NOT EXISTS clients_name_idx ON clients (name);')
+        cur.execute('CREATE INDEX IF NOT EXISTS clients_email_lower_idx ON clients (lower(email));')
+
+        # Trigram indexes of the prefix, substring and fuzzy search in search_client
+        cur.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm;')
+        cur.execute('CREATE INDEX IF NOT EXISTS clients_name_trgm_idx ON clients USING gin (name gin_trgm_ops);')
+        cur.execute('CREATE INDEX IF NOT EXISTS clients_surname_trgm_idx ON clients USING gin (surname gin_trgm_ops);')
+        cur.execute('CREATE INDEX IF NOT EXISTS clients_email_trgm_idx ON clients USING gin (email gin_trgm_ops);')
+        cur.execute("""
+            CREATE INDEX IF NOT EXISTS phones_normalized_trgm_idx
+            ON phones USING gin (('+' || regexp_replace(phone, '[^0-9]', '', 'g')) gin_trgm_ops);
+        """)
         conn.commit()
 
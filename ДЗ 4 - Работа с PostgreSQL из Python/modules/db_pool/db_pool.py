@@ -0,0 +1,152 @@
+import threading
+import time
+from contextlib import contextmanager
+
+from psycopg2.pool import ThreadedConnectionPool
+
+
+class DeferredCommitConnection:
+	"""
+		Connection proxy whose commit() does nothing.
+
+		The management functions commit by themselves. Inside a transaction block they get
+		this proxy, so their work is committed once, when the block ends. A commit() call
+		marks the block as having uncommitted changes, and the actions that must wait for
+		the real commit, e.g. a cache invalidation, are registered with call_after_commit().
+	"""
+
+	def __init__(self, conn):
+		self._conn = conn
+		self.has_changes = False
+		self._after_commit = []
+
+	def commit(self) -> None:
+		self.has_changes = True
+
+	def call_after_commit(self, callback) -> None:
+		"""Registers a callable to run once the transaction block is committed, dropped if it is rolled back"""
+		self._after_commit.append(callback)
+
+	def run_after_commit(self) -> None:
+		"""Runs the callables registered with call_after_commit"""
+		callbacks, self._after_commit = self._after_commit, []
+		for callback in callbacks:
+			callback()
+
+	def __getattr__(self, name):
+		return getattr(self._conn, name)
+
+
+class ConnectionPool:
+	"""
+		Thread-safe pool of database connections.
+
+		Unlike ThreadedConnectionPool, which raises PoolError when all connections are
+		in use, a caller waits for a free connection and the wait time is recorded.
+
+		Args:
+			minconn (int): The number of connections opened in advance.
+			maxconn (int): The maximum number of open connections.
+			**connect_kwargs: The psycopg2.connect arguments, e.g. user, password, host, database.
+	"""
+
+	def __init__(self, minconn: int, maxconn: int, **connect_kwargs):
+		self.maxconn = maxconn
+		self._pool = ThreadedConnectionPool(minconn, maxconn, **connect_kwargs)
+		self._slots = threading.BoundedSemaphore(maxconn)
+		self._lock = threading.Lock()
+		self._in_use = 0
+		self._checkouts = 0
+		self._timeouts = 0
+		self._wait_time = 0.0
+		self._max_wait_time = 0.0
+
+	@contextmanager
+	def connection(self, timeout: float = None):
+		"""
+			Takes a connection from the pool for the duration of the with block.
+
+			Args:
+				timeout (float, optional): The maximum number of seconds to wait for a free
+					connection. Defaults to None, which waits without a limit.
+
+			Yields:
+				psycopg2.extensions.connection: The database connection object.
+
+			Raises:
+				TimeoutError: If no connection becomes free within the timeout.
+		"""
+		started = time.perf_counter()
+		acquired = self._slots.acquire(timeout=timeout)
+		waited = time.perf_counter() - started
+
+		with self._lock:
+			self._wait_time += waited
+			self._max_wait_time = max(self._max_wait_time, waited)
+			if not acquired:
+				self._timeouts += 1
+			else:
+				self._checkouts += 1
+				self._in_use += 1
+
+		if not acquired:
+			raise TimeoutError(f'No database connection became free within {timeout} seconds')
+
+		try:
+			conn = self._pool.getconn()
+			try:
+				yield conn
+			finally:
+				self._pool.putconn(conn)
+		finally:
+			with self._lock:
+				self._in_use -= 1
+			self._slots.release()
+
+	@contextmanager
+	def transaction(self, timeout: float = None):
+		"""
+			Takes a connection from the pool and runs the with block in one transaction.
+
+			The commits of the management functions called in the block are deferred:
+			everything is committed when the block ends, or rolled back if it raises.
+			The callables registered with call_after_commit run after the commit.
+
+			Args:
+				timeout (float, optional): The maximum number of seconds to wait for a free connection.
+
+			Yields:
+				DeferredCommitConnection: The connection to pass to the management functions.
+		"""
+		with self.connection(timeout) as conn:
+			proxy = DeferredCommitConnection(conn)
+			try:
+				yield proxy
+			except BaseException:
+				conn.rollback()
+				raise
+			else:
+				conn.commit()
+		proxy.run_after_commit()
+
+	def get_stats(self) -> dict:
+		"""
+			Returns the usage statistics of the pool.
+
+			Returns:
+				dict: The maximum number of connections, the connections in use, the number of
+				checkouts and timeouts, and the total and maximum wait time in seconds.
+		"""
+		with self._lock:
+			return {
+				'maxconn': self.maxconn,
+				'in_use': self._in_use,
+				'checkouts': self._checkouts,
+				'timeouts': self._timeouts,
+				'wait_time': self._wait_time,
+				'max_wait_time': self._max_wait_time,
+			}
+
+	def close(self) -> None:
+		"""Closes all connections of the pool."""
+		self._pool.closeall()
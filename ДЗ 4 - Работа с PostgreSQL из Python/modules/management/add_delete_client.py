@@ -1,7 +1,10 @@
+from .client_cache import invalidate_clients
+from ..instrumentation.instrumentation import instrument, logger
 from .phone import add_phone, add_plus_to_phone
 from ..validate import validate_client_id, validate_email, validate_string, validate_phones
 
 
+@instrument()
 def add_client(conn, name: str, surname: str, email: str, phone: str = None) -> int:
 	"""
 		Adds a new client to the database with the given name, surname, and email.
@@ -41,11 +44,13 @@ def add_client(conn, name: str, surname: str, email: str, phone: str = None) ->
 			add_phone(conn, client_id, phone)
 
 		conn.commit()
-		print(f'Client {name} {surname} added successfully! Client ID: {client_id} '
-			  f'Email: {email}. Phone: {phone}', end='\n\n')
+		invalidate_clients(conn, client_id)
+		logger.info(f'Client {name} {surname} added successfully! Client ID: {client_id} '
+					f'Email: {email}. Phone: {phone}')
 		return client_id
 
 
+@instrument()
 def del_client(conn, client_id: int) -> None:
 	"""
 		Deletes a client and their associated phone records from the database.
@@ -64,17 +69,10 @@ def del_client(conn, client_id: int) -> None:
 	validate_client_id(client_id)
 
 	with conn.cursor() as cur:
-		if not check_client_exists(conn, client_id):
+		cur.execute('DELETE FROM clients WHERE id = %s RETURNING id', (client_id,))
+		if cur.fetchone() is None:
 			raise ValueError('Client ID does not exist in the database')
 
-		cur.execute('DELETE FROM clients WHERE id = %s', (client_id,))
 		conn.commit()
-		print(f'The client with the identifier {client_id} has been permanently deleted from the database!', end='\n\n')
-
-
-def check_client_exists(conn, client_id: int) -> bool:
-	"""Checking the existence of the client in the database"""
-	with conn.cursor() as cur:
-		cur.execute('SELECT id FROM clients WHERE id = %s', (client_id,))
-		return cur.fetchone() is not None
-
+		invalidate_clients(conn, client_id)
+		logger.info(f'The client with the identifier {client_id} has been permanently deleted from the database!')
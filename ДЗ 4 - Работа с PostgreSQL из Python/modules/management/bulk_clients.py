@@ -0,0 +1,181 @@
+import csv
+from collections.abc import Iterable, Iterator
+from itertools import islice
+
+import psycopg2
+from psycopg2.extras import execute_values
+
+from .client_cache import invalidate_clients
+from ..instrumentation.instrumentation import instrument, logger
+from .phone import add_plus_to_phone
+from ..validate import validate_clients_batch
+
+
+def read_clients_csv(stream, phone_separator: str = ';') -> Iterator[dict]:
+	"""
+		Reads clients from a CSV stream with the name, surname, email and phones columns.
+
+		Args:
+			stream: A text stream with a header row, e.g. an open file.
+			phone_separator (str): The separator of the phones in the phones column. Defaults to ';'.
+
+		Yields:
+			dict: The client with the phones as a list.
+	"""
+	for row in csv.DictReader(stream):
+		phones = row.get('phones') or ''
+		yield {
+			'name': row.get('name'),
+			'surname': row.get('surname'),
+			'email': row.get('email'),
+			'phones': [phone.strip() for phone in phones.split(phone_separator) if phone.strip()],
+		}
+
+
+def prepare_phones(phones: list[str] | str | None) -> list[str]:
+	"""Normalizes the validated phones of a client: stripped, prefixed with "+" and without repeats."""
+	if isinstance(phones, str):
+		phones = [phones]
+	return list(dict.fromkeys(add_plus_to_phone(phone.strip()) for phone in phones or []))
+
+
+def load_batch(conn, batch: list[tuple]) -> tuple[dict, dict]:
+	"""
+		Inserts a batch of prepared clients and their phones in one transaction.
+
+		Clients whose email or one of whose phones already exists in the database are
+		not inserted and are reported as errors instead of aborting the batch.
+
+		Args:
+			conn (psycopg2.extensions.connection): The database connection object.
+			batch (list[tuple]): The (row index, client, phones) tuples of the batch.
+
+		Returns:
+			tuple[dict, dict]: The client IDs and the error messages by row index.
+	"""
+	client_ids, errors = {}, {}
+
+	with conn.cursor() as cur:
+		cur.execute(
+			'SELECT phone FROM phones WHERE phone = ANY(%s)',
+			([phone for _, _, phones in batch for phone in phones],)
+		)
+		existing_phones = {row[0] for row in cur.fetchall()}
+
+		if existing_phones:
+			for index, _, phones in batch:
+				phone = next((phone for phone in phones if phone in existing_phones), None)
+				if phone is not None:
+					errors[index] = f'phone {phone} already exists'
+			batch = [row for row in batch if row[0] not in errors]
+
+		if batch:
+			inserted = execute_values(
+				cur,
+				"""
+				INSERT INTO clients (name, surname, email) VALUES %s
+				ON CONFLICT (email) DO NOTHING
+				RETURNING id, email
+				""",
+				[client for _, client, _ in batch],
+				page_size=len(batch),
+				fetch=True
+			)
+			ids_by_email = {email: client_id for client_id, email in inserted}
+
+			phone_rows = []
+			for index, client, phones in batch:
+				client_id = ids_by_email.get(client[2])
+				if client_id is None:
+					errors[index] = f'email {client[2]} already exists'
+					continue
+				client_ids[index] = client_id
+				phone_rows.extend((client_id, phone) for phone in phones)
+
+			# A phone added by a concurrent transaction fails the batch, which is then loaded row by row
+			if phone_rows:
+				execute_values(
+					cur,
+					'INSERT INTO phones (client_id, phone) VALUES %s',
+					phone_rows,
+					page_size=len(phone_rows)
+				)
+
+	conn.commit()
+	return client_ids, errors
+
+
+def load_batch_or_rows(conn, batch: list[tuple]) -> tuple[dict, dict]:
+	"""Loads a batch, or its rows one by one if the batch fails, so that only the failed rows are rejected"""
+	try:
+		return load_batch(conn, batch)
+	except psycopg2.Error as error:
+		conn.rollback()
+		if len(batch) == 1:
+			return {}, {batch[0][0]: str(error).strip()}
+
+	client_ids, errors = {}, {}
+	for row in batch:
+		row_ids, row_errors = load_batch_or_rows(conn, [row])
+		client_ids.update(row_ids)
+		errors.update(row_errors)
+	return client_ids, errors
+
+
+@instrument()
+def add_clients_bulk(conn, clients: Iterable[dict], batch_size: int = 1000) -> tuple[dict, dict]:
+	"""
+		Adds many clients with their phones to the database.
+
+		The clients of every batch are validated at once with validate_clients_batch,
+		then loaded with multi-row INSERTs in batches of batch_size clients with one
+		commit per batch. Invalid or conflicting rows are reported instead of aborting
+		the load, and every row is either added or rejected. Because the batches are committed one by
+		one, pass a plain connection, not the connection of a transaction block.
+
+		Args:
+			conn (psycopg2.extensions.connection): The database connection object.
+			clients (Iterable[dict]): The clients as dicts with the name, surname, email
+				and optional phones keys, e.g. from read_clients_csv.
+			batch_size (int): The number of clients per batch. Defaults to 1000.
+
+		Returns:
+			tuple[dict, dict]: The IDs of the added clients and the error messages of the
+			rejected rows, both keyed by the index of the row in clients.
+	"""
+	client_ids, errors = {}, {}
+	rows = enumerate(clients)
+
+	while chunk := list(islice(rows, batch_size)):
+		columns = [[client.get(key) for _, client in chunk] for key in ('name', 'surname', 'email', 'phones')]
+		batch, emails, phones_in_batch = [], set(), set()
+
+		for (index, client), error in zip(chunk, validate_clients_batch(*columns)):
+			if error is not None:
+				errors[index] = error
+				continue
+
+			prepared_client = tuple(client[key].strip() for key in ('name', 'surname', 'email'))
+			phones = prepare_phones(client.get('phones'))
+
+			if prepared_client[2] in emails:
+				errors[index] = f'email {prepared_client[2]} is duplicated in the batch'
+				continue
+			duplicated_phone = next((phone for phone in phones if phone in phones_in_batch), None)
+			if duplicated_phone is not None:
+				errors[index] = f'phone {duplicated_phone} is duplicated in the batch'
+				continue
+
+			emails.add(prepared_client[2])
+			phones_in_batch.update(phones)
+			batch.append((index, prepared_client, phones))
+
+		if batch:
+			batch_ids, batch_errors = load_batch_or_rows(conn, batch)
+			client_ids.update(batch_ids)
+			errors.update(batch_errors)
+
+	if client_ids:
+		invalidate_clients(conn, *client_ids.values())
+	logger.info(f'{len(client_ids)} clients added successfully, {len(errors)} rows rejected.')
+	return client_ids, errors
@@ -0,0 +1,250 @@
+import hashlib
+import pickle
+import socket
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from ..db_pool.db_pool import DeferredCommitConnection
+
+# Returned by the backends for a key that is absent or expired
+MISSING = object()
+
+
+class MemoryCache:
+	"""
+		In-process cache with a time to live and least recently used eviction.
+
+		Args:
+			max_size (int): The maximum number of entries. Defaults to 10000.
+			ttl (float): The number of seconds an entry lives. Defaults to 60.
+	"""
+
+	def __init__(self, max_size: int = 10000, ttl: float = 60.0):
+		self.max_size = max_size
+		self.ttl = ttl
+		self.evictions = 0
+		self._entries = OrderedDict()
+		self._lock = threading.Lock()
+
+	def get(self, key):
+		"""Returns the value of the key, or MISSING if it is absent or expired"""
+		with self._lock:
+			entry = self._entries.get(key)
+			if entry is None:
+				return MISSING
+
+			expires_at, value = entry
+			if expires_at < time.monotonic():
+				del self._entries[key]
+				self.evictions += 1
+				return MISSING
+
+			self._entries.move_to_end(key)
+			return value
+
+	def set(self, key, value) -> None:
+		"""Stores the value of the key, evicting the least recently used entry if the cache is full"""
+		with self._lock:
+			self._entries[key] = (time.monotonic() + self.ttl, value)
+			self._entries.move_to_end(key)
+
+			while len(self._entries) > self.max_size:
+				self._entries.popitem(last=False)
+				self.evictions += 1
+
+	def delete(self, key) -> None:
+		"""Removes the key from the cache"""
+		with self._lock:
+			self._entries.pop(key, None)
+
+	def get_evictions(self) -> int:
+		"""Returns the number of entries evicted because of the size limit or the time to live"""
+		return self.evictions
+
+
+class SocketCache:
+	"""
+		Cache shared by several processes through a memcached server on a local socket.
+
+		Args:
+			address (str | tuple): The path of the Unix socket, or the (host, port) of a TCP socket.
+				Defaults to '/tmp/memcached.sock'.
+			ttl (int): The number of seconds an entry lives. Defaults to 60.
+			timeout (float): The socket timeout in seconds. Defaults to 1.
+
+		Raises:
+			OSError: If the server cannot be reached.
+	"""
+
+	def __init__(self, address: str | tuple = '/tmp/memcached.sock', ttl: int = 60, timeout: float = 1.0):
+		self.ttl = ttl
+		family = socket.AF_UNIX if isinstance(address, str) else socket.AF_INET
+		self._socket = socket.socket(family, socket.SOCK_STREAM)
+		self._socket.settimeout(timeout)
+		self._socket.connect(address)
+		self._reader = self._socket.makefile('rb')
+		self._lock = threading.Lock()
+
+	@staticmethod
+	def _build_key(key) -> bytes:
+		"""Turns a key into a memcached key: at most 250 characters without spaces"""
+		return b'clients:' + hashlib.sha1(repr(key).encode()).hexdigest().encode()
+
+	def _send(self, command: bytes) -> bytes:
+		"""Sends a command and returns the first line of the response"""
+		self._socket.sendall(command)
+		return self._reader.readline().rstrip(b'\r\n')
+
+	def get(self, key):
+		"""Returns the value of the key, or MISSING if it is absent or expired"""
+		with self._lock:
+			line = self._send(b'get ' + self._build_key(key) + b'\r\n')
+			if line == b'END':
+				return MISSING
+
+			size = int(line.split()[3])
+			data = self._reader.read(size + 2)[:size]
+			self._reader.readline()
+			return pickle.loads(data)
+
+	def set(self, key, value) -> None:
+		"""Stores the value of the key"""
+		data = pickle.dumps(value)
+		with self._lock:
+			self._send(
+				b'set %s 0 %d %d\r\n' % (self._build_key(key), self.ttl, len(data)) + data + b'\r\n'
+			)
+
+	def delete(self, key) -> None:
+		"""Removes the key from the cache"""
+		with self._lock:
+			self._send(b'delete ' + self._build_key(key) + b'\r\n')
+
+	def get_evictions(self) -> int:
+		"""Returns the number of entries the server evicted to free memory"""
+		evictions = 0
+		with self._lock:
+			line = self._send(b'stats\r\n')
+			while line != b'END':
+				if line.startswith(b'STAT evictions '):
+					evictions = int(line.split()[2])
+				line = self._reader.readline().rstrip(b'\r\n')
+		return evictions
+
+	def close(self) -> None:
+		"""Closes the connection to the server"""
+		self._reader.close()
+		self._socket.close()
+
+
+class ClientCache:
+	"""
+		Read-through cache of the client searches and the client phones.
+
+		The searches are keyed by their criteria, the phones by the client ID. Any change
+		of a client may change the result of any search, so an invalidation replaces the
+		generation token that is part of every search key instead of looking for the
+		affected searches, and the version token that is part of the phones key of every
+		changed client. The token is read before the load, so a load that started before
+		the invalidation stores its result under the old token, where it is never read.
+
+		Args:
+			backend (MemoryCache | SocketCache): The storage of the entries.
+	"""
+
+	def __init__(self, backend: MemoryCache | SocketCache):
+		self.backend = backend
+		self.hits = 0
+		self.misses = 0
+		self._lock = threading.Lock()
+
+	def _get_token(self, key) -> str:
+		"""Returns the token stored under the key, creating one if it is absent or evicted"""
+		token = self.backend.get(key)
+		if token is MISSING:
+			token = uuid.uuid4().hex
+			self.backend.set(key, token)
+		return token
+
+	def _read_through(self, key, load):
+		"""Returns the cached value of the key, or loads and caches it"""
+		value = self.backend.get(key)
+		with self._lock:
+			if value is MISSING:
+				self.misses += 1
+			else:
+				self.hits += 1
+
+		if value is MISSING:
+			value = load()
+			self.backend.set(key, value)
+		return value
+
+	def get_search(self, criteria: tuple, load):
+		"""Returns the cached result of the search with the given criteria, or runs load"""
+		return self._read_through(('find', self._get_token('find_generation'), criteria), load)
+
+	def get_phones(self, client_id: int, load):
+		"""Returns the cached phones of the client, or runs load"""
+		return self._read_through(('phones', client_id, self._get_token(('phones_version', client_id))), load)
+
+	def invalidate(self, client_ids: list[int] = ()) -> None:
+		"""Drops all the cached searches and the cached phones of the given clients"""
+		self.backend.set('find_generation', uuid.uuid4().hex)
+		for client_id in client_ids:
+			self.backend.set(('phones_version', client_id), uuid.uuid4().hex)
+
+	def get_stats(self) -> dict:
+		"""
+			Returns the counters of the cache.
+
+			Returns:
+				dict: The number of hits, misses and evictions.
+		"""
+		with self._lock:
+			return {'hits': self.hits, 'misses': self.misses, 'evictions': self.backend.get_evictions()}
+
+
+_client_cache = None
+
+
+def set_client_cache(cache: ClientCache | None) -> None:
+	"""
+		Enables the cache of find_client and show_client_phone, or disables it with None.
+
+		The cache is invalidated by the management functions of this package once their
+		changes are committed. Changes made to the database in other ways are seen only
+		when the entries expire.
+	"""
+	global _client_cache
+	_client_cache = cache
+
+
+def get_client_cache(conn=None) -> ClientCache | None:
+	"""
+		Returns the enabled client cache, or None.
+
+		Given the connection of the read, None is also returned while it is a transaction
+		block with uncommitted changes: its reads may see rows the other connections do not.
+	"""
+	if isinstance(conn, DeferredCommitConnection) and conn.has_changes:
+		return None
+	return _client_cache
+
+
+def invalidate_clients(conn, *client_ids: int) -> None:
+	"""
+		Drops the cached searches and the cached phones of the given clients, if the cache is enabled.
+
+		Call it after conn.commit(): inside a transaction block that commit is deferred, so the
+		invalidation waits for the end of the block, and is dropped if the block is rolled back.
+	"""
+	if _client_cache is None:
+		return
+
+	if isinstance(conn, DeferredCommitConnection):
+		conn.call_after_commit(lambda: invalidate_clients(None, *client_ids))
+	else:
+		_client_cache.invalidate(client_ids)
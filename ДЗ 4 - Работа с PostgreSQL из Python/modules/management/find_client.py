@@ -1,26 +1,36 @@
 from ..validate import validate_client_info
+from .client_cache import get_client_cache
+from ..instrumentation.instrumentation import instrument, logger
 from .phone import add_plus_to_phone
 
 
 def build_query(name: str, surname: str, email: str, phone: str) -> tuple:
-	"""Forming a database query for finding clients by name, surname, email, and phone number."""
-	query = """
-		SELECT id FROM clients
-		WHERE (%(name)s IS NULL OR name = %(name)s)
-		AND (%(surname)s IS NULL OR surname = %(surname)s)
-		AND (%(email)s IS NULL OR email = %(email)s)
-		AND (%(phone)s IS NULL OR id IN (SELECT client_id FROM phones WHERE phone = %(phone)s))
 	"""
-	params = {
-		'name': name,
-		'surname': surname,
-		'email': email,
-		'phone': phone
+		Forming a database query for finding clients by name, surname, email, and phone number.
+
+		Only the given criteria become predicates, so every combination gets its own
+		index-friendly query. The phones table is joined only when a phone is given,
+		and the email is compared case-insensitively to use the lower(email) index.
+	"""
+	criteria = {
+		'name': ('c.name = %(name)s', name),
+		'surname': ('c.surname = %(surname)s', surname),
+		'email': ('lower(c.email) = lower(%(email)s)', email),
+		'phone': ('p.phone = %(phone)s', phone),
 	}
+	conditions = [condition for condition, value in criteria.values() if value is not None]
+	params = {key: value for key, (_, value) in criteria.items() if value is not None}
+	join = 'JOIN phones p ON p.client_id = c.id' if phone is not None else ''
+
+	query = f"""
+		SELECT c.id FROM clients c
+		{join}
+		WHERE {' AND '.join(conditions)}
+	"""
 	return query, params
 
 
-def execute_query(conn, query: str, params: list) -> list:
+def execute_query(conn, query: str, params: dict) -> list:
 	"""Executing a database query"""
 	with conn.cursor() as cur:
 		cur.execute(query, params)
@@ -31,21 +41,29 @@ def process_results(results: list) -> list:
 	"""Processing the results of the enquiry"""
 	if results:
 		client_ids = [row[0] for row in results]
-		print(f'The unique identifiers of the identified clients: {", ".join(f"{x}" for x in client_ids)}', end='\n\n')
+		logger.info(f'The unique identifiers of the identified clients: {", ".join(f"{x}" for x in client_ids)}')
 		return client_ids
 	else:
-		print('Warning: The search for the specified criteria was unsuccessful', end='\n\n')
+		logger.info('Warning: The search for the specified criteria was unsuccessful')
 
 
+@instrument()
 def find_client(
 		conn, name: str = None, surname: str = None,
 		email: str = None, phone: str = None
 ) -> list:
-	"""Finding clients by name, surname, email, and phone number"""
+	"""Finding clients by name, surname, email, and phone number, through the client cache if it is enabled"""
 	validate_client_info(name, surname, email, phone)
 	if phone:
 		phone = add_plus_to_phone(phone)
 	query, params = build_query(name, surname, email, phone)
-	results = execute_query(conn, query, params)
+
+	cache = get_client_cache(conn)
+	if cache is None:
+		results = execute_query(conn, query, params)
+	else:
+		criteria = (name, surname, email.lower() if email is not None else None, phone)
+		results = cache.get_search(criteria, lambda: execute_query(conn, query, params))
+
 	return process_results(results)
 
@@ -1,6 +1,9 @@
+from .client_cache import get_client_cache, invalidate_clients
+from ..instrumentation.instrumentation import instrument, logger
 from ..validate import validate_client_id, validate_phones
 
 
+@instrument()
 def add_phone(conn, client_id: int, phone: str) -> None:
     """
         Adds a new phone number to the phones table in the database.
@@ -34,10 +37,12 @@ def add_phone(conn, client_id: int, phone: str) -> None:
 
         phone_id = cur.fetchone()[0]
         conn.commit()
-        print(f"Phone '{phone}', with ID {phone_id}, has been successfully added "
-              f"to the client's account with ID: {client_id}.", end='\n\n')
+        invalidate_clients(conn, client_id)
+        logger.info(f"Phone '{phone}', with ID {phone_id}, has been successfully added "
+                    f"to the client's account with ID: {client_id}.")
 
 
+@instrument()
 def del_phone(conn, client_id: int, phone: str) -> None:
     """
         Deletes a phone number from the database.
@@ -52,42 +57,26 @@ def del_phone(conn, client_id: int, phone: str) -> None:
 
         Raises:
             TypeError: If client_id is not an integer or phone is not a string.
-            ValueError: If either client_id or phone is None or empty.
+            ValueError: If either client_id or phone is None or empty,
+                or the client has no such phone number.
     """
     validate_client_id(client_id)
     validate_phones(phone)
 
     phone = add_plus_to_phone(phone)
-    phone_id = get_phone_id(conn, client_id, phone)
 
     with conn.cursor() as cur:
-        cur.execute('DELETE FROM phones WHERE id = %s', (phone_id,))
-        conn.commit()
-        print(f"Phone '{phone}' has been successfully deleted "
-              f"from the client's account with ID: {client_id}.", end='\n\n')
-
-
-def get_phone_id(conn, client_id: int, phone: str) -> int | None:
-    """
-        Returns the ID of the phone number in the database.
-
-        Args:
-            conn (psycopg2.extensions.connection): The database connection object.
-            client_id (int): The ID of the client associated with the phone number.
-            phone (str): The phone number to be retrieved.
-
-        Returns:
-            int: The ID of the phone number in the database.
-            None: If the phone number is not found in the database.
-
-        Raises:
-            ValueError: If either client_id or phone is None.
-    """
+        cur.execute(
+            'DELETE FROM phones WHERE client_id = %s AND phone = %s RETURNING id',
+            (client_id, phone)
+        )
+        if cur.fetchone() is None:
+            raise ValueError('The client has no such phone number')
 
-    with conn.cursor() as cur:
-        cur.execute('SELECT id FROM phones WHERE client_id = %s AND phone = %s', (client_id, phone))
-        result = cur.fetchone()
-        return result[0] if result else None
+        conn.commit()
+        invalidate_clients(conn, client_id)
+        logger.info(f"Phone '{phone}' has been successfully deleted "
+                    f"from the client's account with ID: {client_id}.")
 
 
 def add_plus_to_phone(phone: str) -> str:
@@ -103,10 +92,13 @@ def add_plus_to_phone(phone: str) -> str:
     return "+" + phone if not phone.startswith("+") else phone
 
 
+@instrument()
 def show_client_phone(conn, client_id: int) -> None:
     """
     Displays the phone number of the client with the given ID.
 
+    The phones are read through the client cache if it is enabled.
+
     Args:
         conn (psycopg2.extensions.connection): The database connection object.
         client_id (int): The ID of the client whose phone number to display.
@@ -120,15 +112,23 @@ def show_client_phone(conn, client_id: int) -> None:
     """
     validate_client_id(client_id)
 
+    cache = get_client_cache(conn)
+    if cache is None:
+        result = get_client_phones(conn, client_id)
+    else:
+        result = cache.get_phones(client_id, lambda: get_client_phones(conn, client_id))
+
+    if result:
+        logger.info(
+            f"Phone number of the client with ID {client_id}: \n - {"\n - ".join(phone[0] for phone in result)}"
+        )
+    else:
+        logger.info(f"Client with ID {client_id} has no phone number.")
+
+
+def get_client_phones(conn, client_id: int) -> list[tuple]:
+    """Reads the phone numbers of the client from the database"""
     with conn.cursor() as cur:
         cur.execute('SELECT phone FROM phones WHERE client_id = %s', (client_id,))
-        result = cur.fetchall()
-
-        if result:
-            print(
-                f"Phone number of the client with ID {client_id}: \n - {"\n - ".join(phone[0] for phone in result)}",
-                end='\n\n'
-            )
-        else:
-            print(f"Client with ID {client_id} has no phone number.", end='\n\n')
+        return cur.fetchall()
 
@@ -0,0 +1,146 @@
+import re
+
+from .phone import add_plus_to_phone
+from ..instrumentation.instrumentation import instrument, logger
+from ..validate import validate_string
+
+SEARCH_FIELDS = ('name', 'surname', 'email')
+SEARCH_MODES = ('prefix', 'substring', 'fuzzy')
+
+# Must match the expression of the phones_normalized_trgm_idx index in create_db
+NORMALIZED_PHONE_SQL = "('+' || regexp_replace(phone, '[^0-9]', '', 'g'))"
+
+
+def normalize_phone(phone: str) -> str:
+	"""Drops the formatting characters of a phone number and prefixes it with "+"."""
+	return add_plus_to_phone(re.sub(r'[^0-9]', '', phone))
+
+
+def escape_like(term: str) -> str:
+	"""Escapes the LIKE wildcards in a search term."""
+	return term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def build_search_query(fields: tuple, mode: str) -> str:
+	"""
+		Forming a ranked client search query over the given fields.
+
+		The prefix and substring modes use ILIKE, the fuzzy mode uses the pg_trgm
+		similarity operator. Every mode is served by the trigram GIN indexes.
+	"""
+	if mode not in SEARCH_MODES:
+		raise ValueError(f'mode must be one of: {", ".join(SEARCH_MODES)}')
+	if not fields or not set(fields) <= set(SEARCH_FIELDS):
+		raise ValueError(f'fields must be a non-empty subset of: {", ".join(SEARCH_FIELDS)}')
+
+	operator = '%%' if mode == 'fuzzy' else 'ILIKE'
+	conditions = ' OR '.join(f'{field} {operator} %(pattern)s' for field in fields)
+	rank = ', '.join(f'similarity({field}, %(term)s)' for field in fields)
+
+	return f"""
+		SELECT id, name, surname, email, GREATEST({rank}, 0) AS rank
+		FROM clients
+		WHERE {conditions}
+		ORDER BY rank DESC, id
+		LIMIT %(limit)s
+	"""
+
+
+@instrument()
+def search_clients(
+		conn, term: str, fields: tuple = SEARCH_FIELDS,
+		mode: str = 'substring', limit: int = 20
+) -> list[tuple]:
+	"""
+		Searches clients by a partial or misspelled name, surname or email.
+
+		Args:
+			conn (psycopg2.extensions.connection): The database connection object.
+			term (str): The search term.
+			fields (tuple): The fields to search in. Defaults to name, surname and email.
+			mode (str): 'prefix', 'substring' or 'fuzzy' (typo-tolerant). Defaults to 'substring'.
+			limit (int): The maximum number of results. Defaults to 20.
+
+		Returns:
+			list[tuple]: The (id, name, surname, email, rank) rows, the most similar first.
+
+		Raises:
+			ValueError: If term is empty, or mode or fields are unknown.
+	"""
+	validate_string('term', term)
+	if term is None:
+		raise ValueError('term cannot be None')
+
+	patterns = {
+		'prefix': f'{escape_like(term)}%',
+		'substring': f'%{escape_like(term)}%',
+		'fuzzy': term,
+	}
+
+	with conn.cursor() as cur:
+		cur.execute(build_search_query(fields, mode), {
+			'term': term,
+			'pattern': patterns.get(mode),
+			'limit': limit,
+		})
+		results = cur.fetchall()
+
+	print_search_results(results)
+	return results
+
+
+@instrument()
+def search_clients_by_phone(conn, phone: str, mode: str = 'substring', limit: int = 20) -> list[tuple]:
+	"""
+		Searches clients by a partial phone number, ignoring formatting characters.
+
+		Both the given number and the stored numbers are normalized with normalize_phone,
+		so '+7 (999) 123' and '7999123' find the same clients.
+
+		Args:
+			conn (psycopg2.extensions.connection): The database connection object.
+			phone (str): The full or partial phone number.
+			mode (str): 'prefix' or 'substring'. Defaults to 'substring'.
+			limit (int): The maximum number of results. Defaults to 20.
+
+		Returns:
+			list[tuple]: The (id, name, surname, email, phone) rows.
+
+		Raises:
+			ValueError: If the phone has no digits or mode is unknown.
+	"""
+	validate_string('phone', phone)
+	if phone is None or not re.search(r'[0-9]', phone):
+		raise ValueError('phone must contain digits')
+
+	if mode == 'prefix':
+		pattern = f'{escape_like(normalize_phone(phone))}%'
+	elif mode == 'substring':
+		pattern = f'%{escape_like(normalize_phone(phone)[1:])}%'
+	else:
+		raise ValueError('mode must be prefix or substring')
+
+	with conn.cursor() as cur:
+		cur.execute(
+			f"""
+			SELECT c.id, c.name, c.surname, c.email, p.phone
+			FROM phones p
+			JOIN clients c ON c.id = p.client_id
+			WHERE {NORMALIZED_PHONE_SQL} LIKE %(pattern)s
+			ORDER BY c.id
+			LIMIT %(limit)s
+			""",
+			{'pattern': pattern, 'limit': limit}
+		)
+		results = cur.fetchall()
+
+	print_search_results(results)
+	return results
+
+
+def print_search_results(results: list[tuple]) -> None:
+	"""Printing the found clients"""
+	if results:
+		logger.info('\n - '.join(['Found clients:', *(' | '.join(str(value) for value in row) for row in results)]))
+	else:
+		logger.info('Warning: The search for the specified criteria was unsuccessful')
@@ -1,7 +1,10 @@
+from .client_cache import invalidate_clients
+from ..instrumentation.instrumentation import instrument, logger
 from .phone import add_phone, add_plus_to_phone
-from ..validate import validate_client_info, validate_client_id
+from ..validate import validate_client_info, validate_client_id, validate_phones
 
 
+@instrument()
 def update_client_info(
 		conn, client_id: int, name: str = None,
 		surname: str = None, email: str = None, phones: list[str] | str = None
@@ -21,7 +24,7 @@ def update_client_info(
 			None
 
 		Raises:
-			None
+			ValueError: If the arguments are invalid or client_id does not exist in the database.
 	"""
 	validate_client_id(client_id)
 	validate_client_info(name, surname, email, phones)
@@ -32,13 +35,16 @@ def update_client_info(
 		update_client_phones(conn, client_id, phones)
 
 	conn.commit()
-	print(f"The client's data with ID {client_id} has been successfully updated!", end='\n\n')
+	invalidate_clients(conn, client_id)
+	logger.info(f"The client's data with ID {client_id} has been successfully updated!")
 
 
 def change_client_info(conn, client_id: int, name: str = None, surname: str = None, email: str = None) -> None:
 	"""
 	Updates the information of a client in the database.
 
+	Only the given fields are changed, with one UPDATE statement.
+
 	Args:
 		conn (psycopg2.extensions.connection): The database connection object.
 		client_id (int): The ID of the client to update.
@@ -48,25 +54,27 @@ def change_client_info(conn, client_id: int, name: str = None, surname: str = No
 
 	Returns:
 		None
+
+	Raises:
+		ValueError: If client_id does not exist in the database.
 	"""
-	with conn.cursor() as cur:
-		if name is not None:
-			cur.execute(
-				'UPDATE clients SET name = %s WHERE id = %s',
-				(name, client_id))
+	changes = {column: value for column, value in (('name', name), ('surname', surname), ('email', email))
+			   if value is not None}
+	if not changes:
+		return
 
-		if surname is not None:
-			cur.execute(
-				'UPDATE clients SET surname = %s WHERE id = %s',
-				(surname, client_id))
+	assignments = ', '.join(f'{column} = %({column})s' for column in changes)
 
-		if email is not None:
-			cur.execute(
-				'UPDATE clients SET email = %s WHERE id = %s',
-				(email, client_id))
+	with conn.cursor() as cur:
+		cur.execute(
+			f'UPDATE clients SET {assignments} WHERE id = %(client_id)s RETURNING id',
+			{**changes, 'client_id': client_id}
+		)
+		if cur.fetchone() is None:
+			raise ValueError('Client ID does not exist in the database')
 
 
-def update_client_phones(conn, client_id: int, phones: list[str] | str) -> None:
+def update_client_phones(conn, client_id: int, phones: list[str] | str) -> dict:
 	"""
 		Updates the phone numbers of a client in the database.
 
@@ -76,23 +84,125 @@ def update_client_phones(conn, client_id: int, phones: list[str] | str) -> None:
 			phones (list[str] or str): The new phone numbers of the client.
 
 		Returns:
-			None
+			dict: The added and removed (client_id, phone) pairs.
 
 		Notes:
-			This function first deletes all existing phone numbers associated with the client,
-			and then inserts the new phone numbers. The `add_plus_to_phone` function is used
-			to format the phone numbers before inserting them into the database.
+			Only the difference between the current and the new phone numbers is written:
+			the numbers the client keeps are not touched. The `add_plus_to_phone` function
+			is used to format the phone numbers before comparing them.
 	"""
 	with conn.cursor() as cur:
-		# Delete existing phones
-		cur.execute('DELETE FROM phones WHERE client_id = %s', (client_id,))
+		return sync_clients_phones(cur, {client_id: phones})
+
+
+@instrument()
+def update_clients_phones_bulk(conn, phones_by_client: dict[int, list[str] | str]) -> dict:
+	"""
+		Updates the phone numbers of many clients in one transaction.
+
+		Args:
+			conn (psycopg2.extensions.connection): The database connection object.
+			phones_by_client (dict[int, list[str] | str]): The new phone numbers by client ID.
+				An empty list removes all the phones of the client.
+
+		Returns:
+			dict: The added and removed (client_id, phone) pairs.
+
+		Raises:
+			ValueError: If a client ID or a phone is invalid, or a client does not exist in the database.
+	"""
+	for client_id, phones in phones_by_client.items():
+		validate_client_id(client_id)
+		if phones:
+			validate_phones(phones)
 
+	with conn.cursor() as cur:
+		changes = sync_clients_phones(cur, phones_by_client)
+
+	conn.commit()
+	invalidate_clients(conn, *phones_by_client)
+	logger.info(
+		f"The phones of {len(phones_by_client)} clients have been successfully updated: "
+		f"{len(changes['added'])} added, {len(changes['removed'])} removed."
+	)
+	return changes
+
+
+def sync_clients_phones(cur, phones_by_client: dict[int, list[str] | str]) -> dict:
+	"""
+		Replaces the phones of the given clients with the new ones in two statements.
+
+		The phones to remove and to add are computed in SQL, so only the changed rows of
+		the phones table are written. The removed phones are deleted by the first statement,
+		so a phone moved from one client of the batch to another is free when it is inserted.
+
+		Args:
+			cur (psycopg2.extensions.cursor): The database cursor.
+			phones_by_client (dict[int, list[str] | str]): The new phone numbers by client ID.
+
+		Returns:
+			dict: The added and removed (client_id, phone) pairs.
+
+		Raises:
+			ValueError: If a client does not exist in the database. Nothing is changed then.
+	"""
+	client_ids, new_phones = [], []
+
+	for client_id, phones in phones_by_client.items():
 		if isinstance(phones, str):
 			phones = [phones]
-
-		# Adding new phones
-		phones = [add_plus_to_phone(phone) for phone in phones]
-		cur.executemany(
-			'INSERT INTO phones (client_id, phone) VALUES (%s, %s)',
-			[(client_id, phone) for phone in phones]
+		# A row without a phone keeps a client with no new phones in the diff
+		for phone in phones or [None]:
+			client_ids.append(client_id)
+			new_phones.append(add_plus_to_phone(phone) if phone is not None else None)
+
+	cur.execute(
+		"""
+		WITH new_phones AS (
+			SELECT DISTINCT client_id, phone
+			FROM unnest(%s::integer[], %s::varchar[]) AS new_phones (client_id, phone)
+		), missing AS (
+			SELECT DISTINCT n.client_id
+			FROM new_phones n
+			WHERE NOT EXISTS (SELECT 1 FROM clients c WHERE c.id = n.client_id)
+		), removed AS (
+			DELETE FROM phones p
+			WHERE NOT EXISTS (SELECT 1 FROM missing)
+			AND p.client_id IN (SELECT client_id FROM new_phones)
+			AND NOT EXISTS (
+				SELECT 1 FROM new_phones n WHERE n.client_id = p.client_id AND n.phone = p.phone
+			)
+			RETURNING p.client_id, p.phone
+		)
+		SELECT 'missing', client_id, NULL FROM missing
+		UNION ALL
+		SELECT 'removed', client_id, phone FROM removed
+		""",
+		(client_ids, new_phones)
+	)
+
+	changes = {'added': [], 'removed': [], 'missing': []}
+	for change, client_id, phone in cur.fetchall():
+		changes[change].append((client_id, phone))
+
+	missing = sorted(client_id for client_id, _ in changes.pop('missing'))
+	if len(missing) == 1:
+		raise ValueError('Client ID does not exist in the database')
+	if missing:
+		raise ValueError(f'Client IDs do not exist in the database: {", ".join(map(str, missing))}')
+
+	cur.execute(
+		"""
+		INSERT INTO phones (client_id, phone)
+		SELECT DISTINCT n.client_id, n.phone
+		FROM unnest(%s::integer[], %s::varchar[]) AS n (client_id, phone)
+		WHERE n.phone IS NOT NULL
+		AND NOT EXISTS (
+			SELECT 1 FROM phones p WHERE p.client_id = n.client_id AND p.phone = n.phone
 		)
+		RETURNING client_id, phone
+		""",
+		(client_ids, new_phones)
+	)
+	changes['added'] = cur.fetchall()
+	return changes
@@ -0,0 +1,175 @@
+import csv
+import json
+import sys
+from collections.abc import Iterator
+from itertools import count
+
+# The queries of the exported views. Every query is paginated by the id of its first column.
+EXPORT_QUERIES = {
+	'clients': """
+		SELECT id, name, surname, email
+		FROM clients
+		WHERE id > %(after_id)s
+		ORDER BY id
+		LIMIT %(page_size)s
+	""",
+	'phones': """
+		SELECT id, client_id, phone
+		FROM phones
+		WHERE id > %(after_id)s
+		ORDER BY id
+		LIMIT %(page_size)s
+	""",
+	'clients_with_phones': """
+		SELECT c.id, c.name, c.surname, c.email,
+			COALESCE(array_agg(p.phone ORDER BY p.id) FILTER (WHERE p.id IS NOT NULL), '{}') AS phones
+		FROM (
+			SELECT id, name, surname, email
+			FROM clients
+			WHERE id > %(after_id)s
+			ORDER BY id
+			LIMIT %(page_size)s
+		) c
+		LEFT JOIN phones p ON p.client_id = c.id
+		GROUP BY c.id, c.name, c.surname, c.email
+		ORDER BY c.id
+	""",
+}
+
+_cursor_numbers = count(1)
+
+
+def iter_rows(conn, view: str, after_id: int = 0, page_size: int = 10000, itersize: int = 1000) -> Iterator[dict]:
+	"""
+	Streams the rows of a table or of the clients with phones view.
+
+	The rows are read page by page with keyset pagination on id, so every page is a
+	short index range scan. Each page is fetched through a named (server-side) cursor
+	in chunks of itersize rows, so only one chunk is held in memory.
+
+	Args:
+		conn (psycopg2.extensions.connection): The database connection object.
+		view (str): 'clients', 'phones' or 'clients_with_phones'.
+		after_id (int): The id after which to start, e.g. the last id of an interrupted export. Defaults to 0.
+		page_size (int): The number of rows per page. Defaults to 10000.
+		itersize (int): The number of rows fetched from the server at once. Defaults to 1000.
+
+	Yields:
+		dict: The row by column name.
+
+	Raises:
+		ValueError: If the view is unknown.
+	"""
+	if view not in EXPORT_QUERIES:
+		raise ValueError(f'view must be one of: {", ".join(EXPORT_QUERIES)}')
+
+	while True:
+		rows = 0
+		with conn.cursor(name=f'export_{view}_{next(_cursor_numbers)}') as cur:
+			cur.itersize = itersize
+			cur.execute(EXPORT_QUERIES[view], {'after_id': after_id, 'page_size': page_size})
+
+			for row in cur:
+				if not rows:
+					columns = [column.name for column in cur.description]
+				rows += 1
+				after_id = row[0]
+				yield dict(zip(columns, row))
+
+		if rows < page_size:
+			return
+
+
+def write_csv(rows: Iterator[dict], stream, phone_separator: str = ';') -> int:
+	"""
+	Writes rows to a CSV stream with a header row.
+
+	The phones lists are joined with phone_separator, as read_clients_csv expects them.
+
+	Returns:
+		int: The number of written rows.
+	"""
+	writer, written = None, 0
+
+	for row in rows:
+		if writer is None:
+			writer = csv.DictWriter(stream, fieldnames=list(row))
+			writer.writeheader()
+		if isinstance(row.get('phones'), list):
+			row['phones'] = phone_separator.join(row['phones'])
+		writer.writerow(row)
+		written += 1
+
+	return written
+
+
+def write_json_lines(rows: Iterator[dict], stream) -> int:
+	"""
+	Writes rows to a stream as JSON lines, one object per row.
+
+	Returns:
+		int: The number of written rows.
+	"""
+	written = 0
+
+	for row in rows:
+		stream.write(json.dumps(row, ensure_ascii=False) + '\n')
+		written += 1
+
+	return written
+
+
+def write_stdout(rows: Iterator[dict], stream=None) -> int:
+	"""
+	Prints rows one per line, without collecting them in memory.
+
+	It is the raw output of the 'stdout' export format and is kept out of the logging
+	stream on purpose, so the exported rows can be piped; show_table logs them instead.
+
+	Returns:
+		int: The number of printed rows.
+	"""
+	written = 0
+
+	for row in rows:
+		print(' | '.join(str(value) for value in row.values()), file=stream or sys.stdout)
+		written += 1
+
+	return written
+
+
+EXPORT_WRITERS = {
+	'csv': write_csv,
+	'jsonl': write_json_lines,
+	'stdout': write_stdout,
+}
+
+
+def export_table(conn, view: str, export_format: str = 'stdout', path: str = None, **iter_kwargs) -> int:
+	"""
+	Exports a table or the clients with phones view as CSV, JSON lines or plain text.
+
+	Args:
+		conn (psycopg2.extensions.connection): The database connection object.
+		view (str): 'clients', 'phones' or 'clients_with_phones'.
+		export_format (str): 'csv', 'jsonl' or 'stdout'. Defaults to 'stdout'.
+		path (str, optional): The file to write to. Defaults to None, which writes to stdout.
+		**iter_kwargs: The after_id, page_size and itersize arguments of iter_rows.
+
+	Returns:
+		int: The number of exported rows.
+
+	Raises:
+		ValueError: If the view or export_format is unknown.
+	"""
+	if export_format not in EXPORT_WRITERS:
+		raise ValueError(f'export_format must be one of: {", ".join(EXPORT_WRITERS)}')
+
+	rows = iter_rows(conn, view, **iter_kwargs)
+	write = EXPORT_WRITERS[export_format]
+
+	if path is None:
+		return write(rows, sys.stdout)
+
+	with open(path, 'w', encoding='utf-8', newline='') as file:
+		return write(rows, file)
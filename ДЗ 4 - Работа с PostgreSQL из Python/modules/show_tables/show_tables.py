@@ -1,37 +1,74 @@
+import logging
+
+from .export_tables import iter_rows
+from ..instrumentation.instrumentation import logger
+
+
+def show_table(conn, view: str, title: str) -> None:
+	"""
+	Logs the title and the rows of a table or view at the INFO level, one message per row.
+
+	Every row message has the view and the row in its fields, so the JSON format of
+	configure_logging writes it as an object. Nothing is read when the output is turned
+	off with configure_logging(quiet=True) or a level above INFO.
+	"""
+	if not logger.isEnabledFor(logging.INFO):
+		return
+
+	logger.info(title, extra={'fields': {'view': view}})
+	for row in iter_rows(conn, view):
+		logger.info(' | '.join(str(value) for value in row.values()), extra={'fields': {'view': view, 'row': row}})
+
+
 def show_clients(conn) -> None:
 	"""
 	Show the content of the 'clients' table in the database.
 
+	The rows are streamed page by page instead of being fetched all at once.
+
 	Parameters:
 		conn (psycopg2.extensions.connection): The connection to the database.
 
 	Returns:
 		None
 	"""
-	with conn.cursor() as cur:
-		cur.execute('SELECT * FROM clients')
-		print('— Clients table content:\n', cur.fetchall())
+	show_table(conn, 'clients', '— Clients table content:')
 
 
 def show_phones(conn) -> None:
 	"""
 	Show the content of the 'phones' table in the database.
 
+	The rows are streamed page by page instead of being fetched all at once.
+
 	Parameters:
 		conn (psycopg2.extensions.connection): The connection to the database.
 
 	Returns:
 		None
 	"""
-	with conn.cursor() as cur:
-		cur.execute('SELECT * FROM phones')
-		print('— Phones table content:\n', cur.fetchall())
+	show_table(conn, 'phones', '— Phones table content:')
+
+
+def show_clients_with_phones(conn) -> None:
+	"""
+	Show every client with the list of their phones, aggregated in one query.
+
+	Parameters:
+		conn (psycopg2.extensions.connection): The connection to the database.
+
+	Returns:
+		None
+	"""
+	show_table(conn, 'clients_with_phones', '— Clients with phones:')
 
 
 def show_all_tables(conn) -> None:
 	"""
 	Displays the contents of the clients and phones tables in the given database connection.
 
+	Nothing is displayed when the output is turned off with configure_logging(quiet=True).
+
 	Args:
 		conn (psycopg2.extensions.connection): The database connection object.
 
@@ -40,4 +77,3 @@ def show_all_tables(conn) -> None:
 	"""
 	show_clients(conn)
 	show_phones(conn)
-
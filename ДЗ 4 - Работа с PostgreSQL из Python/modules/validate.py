@@ -1,3 +1,15 @@
+import re
+from bisect import bisect_right
+from itertools import accumulate, chain, repeat
+from operator import contains, not_
+
+# Mirrors the CHECK constraint of the phones table in create_db
+PHONE_PATTERN = re.compile(r'^[0-9+()-]{10,20}$')
+# The two parts of PHONE_PATTERN, which the batch validation checks over a whole column
+PHONE_LENGTHS = range(10, 21)
+PHONE_INVALID_CHARACTER = re.compile(r'[^0-9+()\n-]+')
+
+
 def validate_client_id(client_id: int) -> None:
     """Checks that client_id is a positive integer."""
     if not isinstance(client_id, int) or client_id <= 0:
@@ -30,6 +42,9 @@ def validate_phones(phones: list[str] | str = None) -> None:
     if isinstance(phones, str):
         phones = [phones]
 
+    if not isinstance(phones, (list, tuple)):
+        raise ValueError('phones must be a string or a list of strings')
+
     if not phones:
         raise ValueError('phones list cannot be empty')
 
@@ -38,6 +53,12 @@ def validate_phones(phones: list[str] | str = None) -> None:
             raise ValueError('phone must be a non-empty string')
 
 
+def validate_phone_format(phone: str) -> None:
+    """Checks that the phone matches the CHECK constraint of the phones table."""
+    if not PHONE_PATTERN.fullmatch(phone):
+        raise ValueError(f'phone {phone} must consist of 10-20 digits, "+", "(", ")" or "-"')
+
+
 def validate_at_least_one_parameter(name: str, surname: str, email: str, phone: list[str] | str) -> None:
     """Checks that at least one parameter is not None."""
     if all(arg is None for arg in [name, surname, email, phone]):
@@ -55,3 +76,134 @@ def validate_client_info(
     validate_email(email)
     validate_phones(phones)
 
+
+def get_string_column(values: list) -> tuple[list, list[int]]:
+    """Returns the column with the non-string values replaced with '' and the indexes of those values."""
+    try:
+        ''.join(values)
+        return values, []
+    except TypeError:
+        non_strings = find_false(map(isinstance, values, repeat(str)))
+        values = list(values)
+        for index in non_strings:
+            values[index] = ''
+        return values, non_strings
+
+
+def find_values(column: list, values) -> list[int]:
+    """Returns the sorted indexes of the items equal to one of the values, found by list.index in C."""
+    indexes = []
+    for value in values:
+        index = -1
+        try:
+            while True:
+                index = column.index(value, index + 1)
+                indexes.append(index)
+        except ValueError:
+            pass
+    return sorted(indexes)
+
+
+def find_false(flags) -> list[int]:
+    """Returns the indexes of the false values of a column."""
+    return find_values(list(map(not_, flags)), [True])
+
+
+def validate_clients_batch(names: list, surnames: list, emails: list, phones: list = None) -> list[str | None]:
+    """
+    Checks the columns of many clients at once and reports the errors instead of raising.
+
+    A row gets the error the scalar validators give it in the bulk import: a missing,
+    non-string or empty name, surname or email, an email without "@", a phones cell that
+    is not a string or a list, an empty or non-string phone, and a phone, stripped and
+    prefixed with "+", that breaks the CHECK constraint of the phones table. An empty
+    phones cell means no phones. Only the first error of a row is reported.
+
+    Every column is first checked as a whole with built-in functions, which run the loop
+    over the values in C, and only a column with errors is searched for the invalid rows.
+    The characters of the phones are checked with one scan of a precompiled pattern.
+
+    Args:
+        names (list): The names of the clients. Any sequence, e.g. a list or an array.
+        surnames (list): The surnames of the clients.
+        emails (list): The emails of the clients.
+        phones (list, optional): The phone, list of phones or None of every client.
+
+    Returns:
+        list[str | None]: The error message of every row, or None if the row is valid.
+
+    Raises:
+        ValueError: If the columns have different lengths.
+    """
+    size = len(names)
+    if len(surnames) != size or len(emails) != size or (phones is not None and len(phones) != size):
+        raise ValueError('all columns must have the same length')
+
+    errors = [None] * size
+
+    def report(indexes, message) -> None:
+        for index in indexes:
+            if errors[index] is None:
+                errors[index] = message
+
+    for arg_name, column in (('name', names), ('surname', surnames), ('email', emails)):
+        values, non_strings = get_string_column(column)
+        report((index for index in non_strings if column[index] is None), f'{arg_name} is required')
+        report(non_strings, f'{arg_name} must be a string or None')
+        if not all(values):
+            report(find_false(values), f'{arg_name} cannot be an empty string')
+        if arg_name == 'email' and not all(map(contains, values, repeat('@'))):
+            report(find_false(map(contains, values, repeat('@'))), 'email must contain the @ symbol')
+
+    if phones is not None:
+        # None marks a cell of a wrong type, an empty cell has no phones
+        rows = [
+            row if type(row) is list else () if not row else [row] if isinstance(row, str)
+            else row if isinstance(row, (list, tuple)) else None
+            for row in phones
+        ]
+        if None in rows:
+            invalid_cells = [index for index, row in enumerate(rows) if row is None]
+            report(invalid_cells, 'phones must be a string or a list of strings')
+            for index in invalid_cells:
+                rows[index] = ()
+
+        ends = list(accumulate(map(len, rows)))
+        numbers, _ = get_string_column(list(chain.from_iterable(rows)))
+        if not all(numbers):
+            report(
+                (bisect_right(ends, position) for position in find_false(numbers)),
+                'phone must be a non-empty string'
+            )
+
+        # The numbers that may break PHONE_PATTERN: those of lengths the "+" prefix cannot make
+        # valid, and those with characters out of it, found by one scan of all the numbers, one
+        # per line. Only they are stripped, prefixed and matched as the scalar validation does it
+        lengths = list(map(len, numbers))
+        positions = set(find_values(lengths, set(lengths).difference(PHONE_LENGTHS[:-1])))
+
+        joined = '\n'.join(numbers)
+        if joined.count('\n') != max(len(numbers) - 1, 0):
+            joined = '\n'.join(number.replace('\n', ' ') for number in numbers)
+        line, offset = 0, 0
+        for match in PHONE_INVALID_CHARACTER.finditer(joined):
+            line += joined.count('\n', offset, match.start())
+            offset = match.start()
+            positions.add(line)
+
+        for position in sorted(positions):
+            number = numbers[position].strip()
+            number = number if number.startswith('+') else '+' + number
+            if not PHONE_PATTERN.fullmatch(number):
+                report(
+                    [bisect_right(ends, position)],
+                    f'phone {number} must consist of 10-20 digits, "+", "(", ")" or "-"'
+                )
+
+    return errors
+
+
+def get_validation_report(errors: list[str | None]) -> dict:
+    """Summarizes the errors of validate_clients_batch: the number of rows, of invalid rows and the errors by row."""
+    invalid = {index: error for index, error in enumerate(errors) if error is not None}
+    return {'rows': len(errors), 'invalid': len(invalid), 'errors': invalid}
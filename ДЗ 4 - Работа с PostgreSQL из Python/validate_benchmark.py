@@ -0,0 +1,131 @@
+import random
+import time
+
+from modules.validate import (
+	get_validation_report, validate_clients_batch, validate_email,
+	validate_phone_format, validate_phones, validate_string
+)
+
+ROWS = 1_000_000
+INVALID_SHARES = (0.0, 0.001, 0.05)
+
+# Rows of every kind of error, and of the cells of wrong types, that both validators must agree on
+MIXED_ROWS = [
+	('Name', 'Surname', 'user@ex.com', ['71234567890', '+7 (123) 456']),
+	(None, 'Surname', 'user@ex.com', None),
+	(42, 'Surname', 'user@ex.com', None),
+	('', None, None, None),
+	('Name', 'Surname', None, 123),
+	('Name', 'Surname', b'user@ex.com', None),
+	('Name', 'Surname', '', None),
+	('Name', 'Surname', 'user.ex.com', ['71234567890']),
+	('Name', 'Surname', 'user@ex.com', 71234567890),
+	('Name', 'Surname', 'user@ex.com', {'phone': '71234567890'}),
+	('Name', 'Surname', 'user@ex.com', []),
+	('Name', 'Surname', 'user@ex.com', ''),
+	('Name', 'Surname', 'user@ex.com', ['abc', None]),
+	('Name', 'Surname', 'user@ex.com', ['71234567890', 71234567890]),
+	('Name', 'Surname', 'user@ex.com', ['71234567890', '']),
+	('Name', 'Surname', 'user@ex.com', ' 71234567890 '),
+	('Name', 'Surname', 'user@ex.com', '   '),
+	('Name', 'Surname', 'user@ex.com', ('712345678', '+712345678', '7123456789012345678')),
+	('Name', 'Surname', 'user@ex.com', ['71234567890123456789', '+71234567890123456789']),
+	('Name', 'Surname', 'user@ex.com', ['7123456\n7890', '(812)-555-0000']),
+	('Name', 'Surname', 'user@ex.com', ['7123456789', '8 123 456 78 90']),
+]
+
+
+def generate_columns(rows: int, invalid_share: float, seed: int = 0) -> tuple[list, list, list, list]:
+	"""Generates the name, surname, email and phones columns with a share of invalid values"""
+	rng = random.Random(seed)
+	names, surnames, emails, phones = [], [], [], []
+
+	for i in range(rows):
+		broken = rng.random() < invalid_share
+		field = rng.randrange(6) if broken else None
+		names.append('' if field == 0 else f'Name{i}')
+		surnames.append(None if field == 1 else f'Surname{i}')
+		emails.append(f'user{i}.ex.com' if field == 2 else f'user{i}@ex.com')
+		phones.append(
+			i if field == 4 else [f'7{i:010d}', None] if field == 5
+			else [f'7{i:010d}', 'abc' if field == 3 else f'8{i:010d}']
+		)
+
+	return names, surnames, emails, phones
+
+
+def validate_row(name, surname, email, phones) -> None:
+	"""Validates a client with the scalar validators as the bulk import does it"""
+	for arg_name, arg_value in (('name', name), ('surname', surname)):
+		if arg_value is None:
+			raise ValueError(f'{arg_name} is required')
+		validate_string(arg_name, arg_value)
+	if email is None:
+		raise ValueError('email is required')
+	validate_email(email)
+
+	phones = phones or []
+	if isinstance(phones, str):
+		phones = [phones]
+	if phones:
+		validate_phones(phones)
+	for phone in phones:
+		phone = phone.strip()
+		validate_phone_format(phone if phone.startswith('+') else '+' + phone)
+
+
+def validate_scalar(names: list, surnames: list, emails: list, phones: list) -> list[str | None]:
+	"""Validates the rows one by one with the scalar validators"""
+	errors = []
+
+	for row in zip(names, surnames, emails, phones):
+		try:
+			validate_row(*row)
+		except ValueError as error:
+			errors.append(str(error))
+		else:
+			errors.append(None)
+
+	return errors
+
+
+def check_against_scalar(rows: int = 10_000, seed: int = 0) -> None:
+	"""
+		Checks that the batch validator reports the same error of every row as the scalar validators.
+
+		The rows are MIXED_ROWS followed by random combinations of their cells.
+	"""
+	rng = random.Random(seed)
+	cells = list(zip(*MIXED_ROWS))
+	mixed_rows = MIXED_ROWS + [tuple(map(rng.choice, cells)) for _ in range(rows)]
+
+	columns = [list(column) for column in zip(*mixed_rows)]
+	scalar_errors, batch_errors = validate_scalar(*columns), validate_clients_batch(*columns)
+
+	for row, scalar_error, batch_error in zip(mixed_rows, scalar_errors, batch_errors):
+		assert scalar_error == batch_error, f'{row}: scalar {scalar_error!r}, batch {batch_error!r}'
+
+
+def main() -> None:
+	check_against_scalar()
+
+	for invalid_share in INVALID_SHARES:
+		columns = generate_columns(ROWS, invalid_share)
+
+		started = time.perf_counter()
+		scalar_errors = validate_scalar(*columns)
+		scalar_time = time.perf_counter() - started
+
+		started = time.perf_counter()
+		batch_errors = validate_clients_batch(*columns)
+		batch_time = time.perf_counter() - started
+
+		assert scalar_errors == batch_errors, 'the scalar and batch validators disagree'
+
+		print(f'{ROWS} rows, {get_validation_report(batch_errors)["invalid"]} invalid')
+		print(f'  scalar: {scalar_time:7.3f} s, {ROWS / scalar_time:12,.0f} rows/s')
+		print(f'  batch:  {batch_time:7.3f} s, {ROWS / batch_time:12,.0f} rows/s ({scalar_time / batch_time:.1f}x)')
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,114 @@
+import configparser
+import os
+import time
+from contextlib import redirect_stdout
+
+import psycopg2
+from psycopg2.extensions import cursor
+
+from modules.management.add_delete_client import add_client, del_client
+from modules.management.phone import del_phone
+from modules.management.update_info import change_client_info
+
+config = configparser.ConfigParser()
+config.read('settings.ini')
+user, password = config['DB']['username'], config['DB']['password']
+host, database = config['DB']['host'], config['DB']['database']
+
+OPERATIONS = 1000
+
+
+class CountingCursor(cursor):
+	"""Cursor that counts the statements sent to the server"""
+	statements = 0
+
+	def execute(self, query, vars=None):
+		CountingCursor.statements += 1
+		return super().execute(query, vars)
+
+
+def legacy_change_client_info(conn, client_id: int, name: str = None, surname: str = None, email: str = None) -> None:
+	"""The previous change_client_info: one UPDATE per changed field"""
+	with conn.cursor() as cur:
+		for column, value in (('name', name), ('surname', surname), ('email', email)):
+			if value is not None:
+				cur.execute(f'UPDATE clients SET {column} = %s WHERE id = %s', (value, client_id))
+
+
+def legacy_del_client(conn, client_id: int) -> None:
+	"""The previous del_client: an existence SELECT before the DELETE"""
+	with conn.cursor() as cur:
+		cur.execute('SELECT id FROM clients WHERE id = %s', (client_id,))
+		if cur.fetchone() is None:
+			raise ValueError('Client ID does not exist in the database')
+		cur.execute('DELETE FROM clients WHERE id = %s', (client_id,))
+		conn.commit()
+
+
+def legacy_del_phone(conn, client_id: int, phone: str) -> None:
+	"""The previous del_phone: a phone ID SELECT before the DELETE"""
+	with conn.cursor() as cur:
+		cur.execute('SELECT id FROM phones WHERE client_id = %s AND phone = %s', (client_id, phone))
+		phone_id = cur.fetchone()[0]
+		cur.execute('DELETE FROM phones WHERE id = %s', (phone_id,))
+		conn.commit()
+
+
+def measure(conn, operation, arguments: list[tuple]) -> tuple[float, float]:
+	"""Runs the operation for every arguments tuple and returns the statements and milliseconds per call"""
+	CountingCursor.statements = 0
+
+	with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+		started = time.perf_counter()
+		for args in arguments:
+			operation(conn, *args)
+		elapsed = time.perf_counter() - started
+
+	return CountingCursor.statements / len(arguments), elapsed * 1000 / len(arguments)
+
+
+def seed_clients(conn, run: int) -> list[tuple[int, str]]:
+	"""Adds the clients, with one phone each, the benchmark changes and deletes"""
+	suffix = int(time.time()) % 10 ** 5
+	clients = []
+
+	with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+		for i in range(OPERATIONS):
+			phone = f'+7{suffix:05d}{run}{i:04d}'
+			client_id = add_client(conn, f'Bench{i}', 'Test', f'bench{i}.{run}.{suffix}@ex.com', phone)
+			clients.append((client_id, phone))
+
+	return clients
+
+
+def main() -> None:
+	conn = psycopg2.connect(
+		user=user, password=password, host=host, database=database, cursor_factory=CountingCursor
+	)
+	benchmarks = (
+		('change_client_info', legacy_change_client_info, change_client_info,
+		 lambda client_id, phone: (client_id, 'Name', 'Surname', f'changed{client_id}@ex.com')),
+		('del_phone', legacy_del_phone, del_phone, lambda client_id, phone: (client_id, phone)),
+		('del_client', legacy_del_client, del_client, lambda client_id, phone: (client_id,)),
+	)
+
+	print(f'{"operation":<20}{"variant":<10}{"statements":>12}{"ms/op":>10}')
+	run = 0
+	for name, legacy, current, build_args in benchmarks:
+		for variant, operation in (('legacy', legacy), ('current', current)):
+			clients = seed_clients(conn, run)
+			run += 1
+
+			statements, latency = measure(conn, operation, [build_args(*client) for client in clients])
+			conn.commit()
+			print(f'{name:<20}{variant:<10}{statements:>12.1f}{latency:>10.3f}')
+
+			with conn.cursor() as cur:
+				cur.execute('DELETE FROM clients WHERE id = ANY(%s)', ([client_id for client_id, _ in clients],))
+			conn.commit()
+
+	conn.close()
+
+
+if __name__ == '__main__':
+	main()
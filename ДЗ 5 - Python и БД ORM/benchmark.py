@@ -0,0 +1,34 @@
+import argparse
+import os
+import tempfile
+
+from modules.benchmarks.benchmark_runner import IMPORTERS, run_benchmark, write_results
+from modules.fixtures_generator.generate_fixtures import write_fixture_file
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser(description='Times the JSON importers and the publisher reports.')
+	parser.add_argument('--dsn', default='sqlite:///benchmark.db',
+						help='scratch database, its tables are recreated (PostgreSQL or SQLite file)')
+	parser.add_argument('--sales', type=int, default=10_000, help='number of generated sales')
+	parser.add_argument('--skew', type=float, default=1.1, help='Zipf exponent of the books per publisher')
+	parser.add_argument('--fixture', help='existing fixture file to use instead of a generated one')
+	parser.add_argument('--importers', default='orm,bulk', help=f'comma-separated: {", ".join(IMPORTERS)}')
+	parser.add_argument('--repeat', type=int, default=3, help='number of runs of every report')
+	parser.add_argument('--output', default='benchmark_results.jsonl', help='JSON lines file the results are appended to')
+	args = parser.parse_args()
+
+	# Generate the fixture file unless one is given
+	fixture_path = args.fixture
+	if fixture_path is None:
+		fixture_path = os.path.join(tempfile.mkdtemp(), 'fixtures.jsonl')
+		write_fixture_file(fixture_path, args.sales, args.skew)
+
+	# Run the benchmarks and save the results
+	results = run_benchmark({'dsn': args.dsn}, fixture_path, args.importers.split(','), args.repeat)
+	write_results(
+		args.output, results,
+		dsn_dialect=args.dsn.split(':', 1)[0], sales=args.sales, skew=args.skew, fixture=args.fixture
+	)
+
+	for name, seconds in results.items():
+		print(f'{name}: {seconds:.3f} s')
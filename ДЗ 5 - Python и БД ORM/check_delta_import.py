@@ -0,0 +1,79 @@
+import argparse
+import json
+import os
+import tempfile
+
+from sqlalchemy import event, func, select
+
+from modules.read_config.read_config import read_config
+from modules.db_session.create_db_session import create_database_session
+from modules.db_management.db_operations import *
+from modules.db_management.models import Book, Publisher, Sale
+from modules.json_to_db.delta_import import delta_import_json_data_to_db
+from modules.fs_tools.path_utils import get_absolute_path
+
+# Every record comes before the records it references, the opposite of the foreign key order
+CHILDREN_FIRST = [
+	{'model': 'sale', 'pk': 1, 'fields': {'price': '10.50', 'date_sale': '2018-10-25T09:45:24.552Z', 'count': 2, 'id_stock': 1}},
+	{'model': 'stock', 'pk': 1, 'fields': {'id_shop': 1, 'id_book': 1, 'count': 10}},
+	{'model': 'book', 'pk': 1, 'fields': {'title': 'Learning Python', 'id_publisher': 1}},
+	{'model': 'shop', 'pk': 1, 'fields': {'name': 'Labirint'}},
+	{'model': 'publisher', 'pk': 1, 'fields': {'name': 'Pearson'}},
+]
+# A new book placed before its new publisher, and the changed sale of CHILDREN_FIRST
+CHANGES = [
+	{'model': 'book', 'pk': 2, 'fields': {'title': 'Fluent Python', 'id_publisher': 2}},
+	{'model': 'sale', 'pk': 1, 'fields': {'price': '12.00', 'date_sale': '2018-10-25T09:45:24.552Z', 'count': 2, 'id_stock': 1}},
+	{'model': 'publisher', 'pk': 2, 'fields': {'name': "O'Reilly"}},
+]
+
+
+def enable_sqlite_foreign_keys(engine) -> None:
+	"""Makes SQLite check the foreign keys, which it does not do by default"""
+	if engine.dialect.name == 'sqlite':
+		event.listen(engine, 'connect', lambda connection, _: connection.execute('PRAGMA foreign_keys = ON'))
+
+
+def write_fixture(directory: str, records: list) -> str:
+	"""Writes the records to a JSON file and returns its path"""
+	path = os.path.join(directory, 'fixture.json')
+	with open(path, 'w', encoding='utf-8') as file:
+		json.dump(records, file)
+	return path
+
+
+def check_children_before_parents(session) -> None:
+	"""Checks that the delta import loads a file whose children come before their parents"""
+	with tempfile.TemporaryDirectory() as directory:
+		# A partition of one record puts every child into an earlier partition than its parent
+		stats = delta_import_json_data_to_db(session, write_fixture(directory, CHILDREN_FIRST), batch_size=1)
+		assert stats['inserted'] == len(CHILDREN_FIRST), stats
+
+		stats = delta_import_json_data_to_db(session, write_fixture(directory, CHANGES + CHILDREN_FIRST[1:]), batch_size=1)
+		assert (stats['inserted'], stats['updated'], stats['unchanged']) == (2, 1, 4), stats
+
+	assert session.execute(select(Book.id_publisher).where(Book.id == 2)).scalar_one() == 2
+	assert session.execute(select(Sale.price).where(Sale.id == 1)).scalar_one() == 12.0
+	assert session.execute(select(func.count()).select_from(Publisher)).scalar_one() == 2
+
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser(description='Checks that the delta import loads the parents of a file first.')
+	parser.add_argument('--section',
+						help='settings.ini section of a scratch database, its tables are recreated. '
+							 'Defaults to an in-memory SQLite database')
+	args = parser.parse_args()
+
+	if args.section:
+		config_dict = read_config(get_absolute_path(['settings.ini']), args.section)
+	else:
+		config_dict = {'dsn': 'sqlite://'}
+
+	session, engine = create_database_session(config_dict)
+	enable_sqlite_foreign_keys(engine)
+	drop_tables(engine)
+	create_tables(engine)
+
+	check_children_before_parents(session)
+	session.close()
+	print('The delta import checks passed.')
@@ -0,0 +1,30 @@
+import argparse
+import sys
+
+from modules.read_config.read_config import read_config
+from modules.db_session.create_db_session import create_database_session
+from modules.db_management.db_operations import *
+from modules.query_plans.explain_reports import seed_dataset, check_report_plans
+from modules.fs_tools.path_utils import get_absolute_path
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser(description='Checks the query plans of the publisher sales reports.')
+	parser.add_argument('--section', default='benchmark',
+						help='settings.ini section of a scratch PostgreSQL database, its tables are recreated')
+	parser.add_argument('--sales', type=int, default=1_000_000, help='number of generated sales')
+	parser.add_argument('--min-rows', type=int, default=10_000, help='number of rows of a large table')
+	args = parser.parse_args()
+
+	# Read config file
+	config_dict = read_config(get_absolute_path(['settings.ini']), args.section)
+
+	# Recreate the tables and fill them with a generated dataset
+	session, engine = create_database_session(config_dict)
+	drop_tables(engine)
+	create_tables(engine)
+	seed_dataset(session, args.sales)
+
+	# Fail if a report query reads a large table with a sequential scan
+	passed = check_report_plans(session, args.min_rows)
+	session.close()
+	sys.exit(0 if passed else 1)
@@ -0,0 +1,13 @@
+import argparse
+
+from modules.fixtures_generator.generate_fixtures import write_fixture_file
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser(description='Generates a bookstore fixture file in the tests_data.json format.')
+	parser.add_argument('path', help='output file, .jsonl or .ndjson for JSON lines')
+	parser.add_argument('--sales', type=int, default=10_000, help='number of sales, from 10k to 100M')
+	parser.add_argument('--skew', type=float, default=1.1, help='Zipf exponent of the books per publisher')
+	parser.add_argument('--seed', type=int, default=0, help='random seed')
+	args = parser.parse_args()
+
+	write_fixture_file(args.path, args.sales, args.skew, args.seed)
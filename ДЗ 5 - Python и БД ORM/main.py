@@ -1,9 +1,10 @@
 from modules.read_config.read_config import read_config
 from modules.db_session.create_db_session import create_database_session
 from modules.db_management.db_operations import *
-from modules.json_to_db.json2db import import_json_data_to_db
+from modules.json_to_db.bulk_import import bulk_import_json_data_to_db
 from modules.publisher_reports.publisher_sales import get_publisher_sales_report
 from modules.fs_tools.path_utils import get_absolute_path
+from modules.instrumentation.instrumentation import configure_logging, metrics
 
 if __name__ == '__main__':
 	# Create paths
@@ -13,17 +14,27 @@ if __name__ == '__main__':
 	# Read config file
 	config_dict = read_config(settings_data)
 
-	# Create engine for the database
-	engine = create_database_session(config_dict)[1]
+	# Optional [log] section: quiet = yes turns off stdout, json = yes writes the messages as JSON objects,
+	# metrics_file receives the latency histograms
+	try:
+		log_config = read_config(settings_data, 'log')
+	except KeyError:
+		log_config = {}
+	configure_logging(
+		log_config.get('level', 'INFO'),
+		log_config.get('quiet', 'no').strip().lower() in ('1', 'yes', 'true', 'on'),
+		log_config.get('json', 'no').strip().lower() in ('1', 'yes', 'true', 'on')
+	)
+
+	# Create session and engine for the database
+	session, engine = create_database_session(config_dict)
 
 	# Create tables in the database
 	create_tables(engine)
-
-	# Create session for the database
-	session = create_database_session(config_dict)[0]
+	create_indexes(engine)
 
 	# (Task #3) Upload data from json file to database
-	import_json_data_to_db(session, json_data)
+	bulk_import_json_data_to_db(session, json_data)
 
 	# (Task #2) Get sales report
 	input_publisher = input("Enter the publisher's name or ID: ")
@@ -32,3 +43,6 @@ if __name__ == '__main__':
 	# Close the session
 	session.close()
 
+	if log_config.get('metrics_file'):
+		metrics.write(log_config['metrics_file'])
+
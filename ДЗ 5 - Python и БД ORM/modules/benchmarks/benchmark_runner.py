@@ -0,0 +1,103 @@
+import json
+import os
+import subprocess
+import time
+from contextlib import redirect_stdout
+from datetime import datetime, timezone
+
+from sqlalchemy import func, select
+
+from ..db_management.db_operations import create_tables, drop_tables
+from ..db_management.models import Book, Publisher
+from ..db_session.create_db_session import create_database_session
+from ..json_to_db.bulk_import import bulk_import_json_data_to_db
+from ..json_to_db.delta_import import delta_import_json_data_to_db
+from ..json_to_db.json2db import import_json_data_to_db
+from ..json_to_db.lookup_cache import LookupCache
+from ..publisher_reports.publisher_sales import get_publisher, get_publisher_sales_report
+
+IMPORTERS = {
+	'orm': import_json_data_to_db,
+	'orm_cached': lambda session, path: import_json_data_to_db(session, path, cache=LookupCache()),
+	'bulk': bulk_import_json_data_to_db,
+	'delta': delta_import_json_data_to_db,
+}
+
+
+def time_call(function, *args) -> float:
+	"""Returns the time in seconds a call takes, with its output discarded"""
+	with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+		started = time.perf_counter()
+		function(*args)
+		return time.perf_counter() - started
+
+
+def get_hot_publisher_name(session) -> str:
+	"""Gets the name of the publisher with the most books"""
+	return session.execute(
+		select(Publisher.name).
+		join(Book, Book.id_publisher == Publisher.id).
+		group_by(Publisher.id, Publisher.name).
+		order_by(func.count(Book.id).desc()).
+		limit(1)
+	).scalar_one()
+
+
+def get_git_commit() -> str | None:
+	"""Gets the hash of the current git commit, or None outside a git repository"""
+	try:
+		return subprocess.run(
+			['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+		).stdout.strip()
+	except (OSError, subprocess.CalledProcessError):
+		return None
+
+
+def run_benchmark(config_dict: dict, fixture_path: str, importers: list[str], repeat: int = 3) -> dict:
+	"""
+		Times the importers and the publisher reports on a fixture file.
+
+		Every importer loads the fixture into freshly recreated tables. The reports are
+		then run repeat times for the publisher with the most books and the best time is kept.
+
+		Args:
+			config_dict (dict): The database connection parameters, or a dsn key.
+			fixture_path (str): The path to the JSON or JSON lines fixture file.
+			importers (list[str]): The names of the importers from IMPORTERS to time.
+			repeat (int): The number of runs of every report. Defaults to 3.
+
+		Returns:
+			dict: The time in seconds of every benchmark.
+	"""
+	session, engine = create_database_session(config_dict)
+	results = {}
+
+	for name in importers:
+		session.close()
+		drop_tables(engine)
+		create_tables(engine)
+		results[f'import_{name}'] = time_call(IMPORTERS[name], session, fixture_path)
+
+	publisher_name = get_hot_publisher_name(session)
+	results['get_publisher'] = min(
+		time_call(get_publisher, session, publisher_name) for _ in range(repeat)
+	)
+	results['get_publisher_sales_report'] = min(
+		time_call(get_publisher_sales_report, config_dict, publisher_name) for _ in range(repeat)
+	)
+
+	session.close()
+	return results
+
+
+def write_results(path: str, results: dict, **parameters) -> None:
+	"""Appends the results of a benchmark run as one JSON line with the run's parameters"""
+	record = {
+		'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+		'commit': get_git_commit(),
+		**parameters,
+		'results': results,
+	}
+
+	with open(path, 'a', encoding='utf-8') as file:
+		file.write(json.dumps(record) + '\n')
@@ -6,6 +6,13 @@ def create_tables(engine):
 	Base.metadata.create_all(engine)
 
 
+def create_indexes(engine):
+	"""Creates the missing indexes of the tables that already exist in the database"""
+	for table in Base.metadata.sorted_tables:
+		for index in table.indexes:
+			index.create(engine, checkfirst=True)
+
+
 def drop_tables(engine):
 	"""Drops all tables in the database"""
 	Base.metadata.drop_all(engine)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, CheckConstraint, Float
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, CheckConstraint, Float, Index
 from sqlalchemy.orm import relationship, DeclarativeBase
 
 
@@ -28,6 +28,10 @@ class Book(Base):
     id_publisher = Column(Integer, ForeignKey('publisher.id'))
     publisher = relationship(Publisher)
 
+    __table_args__ = (
+        Index('ix_book_id_publisher', 'id_publisher', postgresql_include=['title']),
+    )
+
     def __str__(self):
         return f'Book: {self.title} (Publisher: {self.publisher.name})'
 
@@ -60,6 +64,8 @@ class Stock(Base):
 
     __table_args__ = (
         CheckConstraint('count >= 0', name='ck_stock_count_positive'),
+        Index('ix_stock_id_book_id_shop', 'id_book', 'id_shop', postgresql_include=['id']),
+        Index('ix_stock_id_shop', 'id_shop', postgresql_include=['id']),
     )
 
     def __str__(self):
@@ -81,6 +87,7 @@ class Sale(Base):
 
     __table_args__ = (
         CheckConstraint('count >= 0', name='ck_stock_count_positive'),
+        Index('ix_sale_id_stock_date_sale', 'id_stock', 'date_sale', postgresql_include=['id', 'price', 'count']),
     )
 
     def __str__(self):
@@ -89,3 +96,23 @@ class Sale(Base):
     def __repr__(self):
         return f'Sale(id={self.id}, stock_id={self.id_stock}, price={self.price}, date_sale="{self.date_sale}")'
 
+
+class ImportHash(Base):
+    """Represents the content hash of an imported JSON record."""
+    __tablename__ = 'import_hash'
+    model = Column(String(50), primary_key=True)
+    pk = Column(Integer, primary_key=True)
+    hash = Column(String(64), nullable=False)
+
+    def __repr__(self):
+        return f'ImportHash(model="{self.model}", pk={self.pk}, hash="{self.hash}")'
+
+
+class ImportSeen(Base):
+    """Represents a JSON record found in the file by a running delta import."""
+    __tablename__ = 'import_seen'
+    model = Column(String(50), primary_key=True)
+    pk = Column(Integer, primary_key=True)
+
+    def __repr__(self):
+        return f'ImportSeen(model="{self.model}", pk={self.pk})'
@@ -1,12 +1,11 @@
-from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
+from .engine_registry import get_engine
+
 
 def create_database_session(config_dict: dict) -> tuple:
-    """Creates a session for working with the database"""
-    dbms, user, password, host, port, dbname = config_dict.values()
-    DSN = f'{dbms}://{user}:{password}@{host}:{port}/{dbname}'
-    engine = create_engine(DSN)
+    """Creates a session for working with the database on the shared engine for its DSN"""
+    engine = get_engine(config_dict)
     Session = sessionmaker(bind=engine)
 
     return Session(), engine
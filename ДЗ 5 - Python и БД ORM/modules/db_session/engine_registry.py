@@ -0,0 +1,154 @@
+import threading
+import time
+
+from sqlalchemy import create_engine, event, pool
+
+from ..instrumentation.instrumentation import instrument_engine
+
+# Optional [engine] settings passed to create_engine, with their value types
+ENGINE_OPTIONS = {
+	'pool_size': int,
+	'max_overflow': int,
+	'pool_timeout': float,
+	'pool_recycle': int,
+	'pool_pre_ping': lambda value: value.strip().lower() in ('1', 'yes', 'true', 'on'),
+	'poolclass': lambda value: getattr(pool, value.strip()),
+}
+
+_engines = {}
+_statistics = {}
+_lock = threading.Lock()
+
+
+class PoolStatistics:
+	"""
+		Counts the checkouts and new connections of an engine's pool with the public pool events.
+
+		The events of the pool's connections come from several threads, so the counters
+		are only changed under a lock. The times are in seconds: connect is the time to
+		open a new connection, hold is the time a connection stays checked out.
+	"""
+
+	def __init__(self, engine):
+		self._lock = threading.Lock()
+		self.checkouts = self.connects = 0
+		self.connect_time = self.max_connect_time = 0.0
+		self.hold_time = self.max_hold_time = 0.0
+
+		event.listen(engine, 'do_connect', self.before_connect)
+		event.listen(engine, 'connect', self.on_connect)
+		event.listen(engine, 'checkout', self.on_checkout)
+		event.listen(engine, 'checkin', self.on_checkin)
+
+	def before_connect(self, dialect, connection_record, cargs, cparams) -> None:
+		connection_record.info['connect_started'] = time.perf_counter()
+
+	def on_connect(self, dbapi_connection, connection_record) -> None:
+		started = connection_record.info.pop('connect_started', None)
+		if started is None:
+			return
+		elapsed = time.perf_counter() - started
+		with self._lock:
+			self.connects += 1
+			self.connect_time += elapsed
+			self.max_connect_time = max(self.max_connect_time, elapsed)
+
+	def on_checkout(self, dbapi_connection, connection_record, connection_proxy) -> None:
+		connection_record.info['checked_out_at'] = time.perf_counter()
+		with self._lock:
+			self.checkouts += 1
+
+	def on_checkin(self, dbapi_connection, connection_record) -> None:
+		checked_out_at = connection_record.info.pop('checked_out_at', None)
+		if checked_out_at is None:
+			return
+		held = time.perf_counter() - checked_out_at
+		with self._lock:
+			self.hold_time += held
+			self.max_hold_time = max(self.max_hold_time, held)
+
+	def as_dict(self) -> dict:
+		with self._lock:
+			return {
+				'checkouts': self.checkouts,
+				'connects': self.connects,
+				'connect_time': self.connect_time,
+				'max_connect_time': self.max_connect_time,
+				'hold_time': self.hold_time,
+				'max_hold_time': self.max_hold_time,
+			}
+
+
+def build_dsn(config_dict: dict) -> str:
+	"""Builds the DSN from the connection parameters of the [engine] section, or takes its dsn key"""
+	if 'dsn' in config_dict:
+		return config_dict['dsn']
+
+	connection_values = [value for key, value in config_dict.items() if key not in ENGINE_OPTIONS]
+	dbms, user, password, host, port, dbname = connection_values
+	return f'{dbms}://{user}:{password}@{host}:{port}/{dbname}'
+
+
+def get_engine_options(config_dict: dict) -> dict:
+	"""Gets the pool options of the [engine] section converted to their types"""
+	return {key: convert(config_dict[key]) for key, convert in ENGINE_OPTIONS.items() if key in config_dict}
+
+
+def get_engine(config_dict: dict):
+	"""
+		Returns the process-wide engine for the DSN, creating it on the first call with its statements counted.
+
+		The engine keeps the dialect's default pool class, e.g. QueuePool for PostgreSQL
+		and SingletonThreadPool for in-memory SQLite, unless poolclass is configured.
+	"""
+	dsn = build_dsn(config_dict)
+
+	with _lock:
+		engine = _engines.get(dsn)
+		if engine is None:
+			engine = create_engine(dsn, **get_engine_options(config_dict))
+			instrument_engine(engine)
+			_engines[dsn] = engine
+			_statistics[dsn] = PoolStatistics(engine)
+
+	return engine
+
+
+def get_pool_statistics(config_dict: dict) -> dict:
+	"""
+		Returns the usage statistics of the engine's connection pool.
+
+		Args:
+			config_dict (dict): The parameters of the [engine] section.
+
+		Returns:
+			dict: The pool size and the numbers of checked-out and overflow connections, which
+			are None for a pool without a queue, the numbers of checkouts and new connections,
+			and the total and maximum connect and hold times in seconds.
+	"""
+	engine_pool = get_engine(config_dict).pool
+	queue_pool = isinstance(engine_pool, pool.QueuePool)
+
+	with _lock:
+		statistics = _statistics[build_dsn(config_dict)]
+
+	return {
+		'size': engine_pool.size() if queue_pool else None,
+		'checked_out': engine_pool.checkedout() if queue_pool else None,
+		'overflow': max(engine_pool.overflow(), 0) if queue_pool else None,
+		**statistics.as_dict(),
+	}
+
+
+def dispose_engines(close: bool = True) -> None:
+	"""
+		Disposes all registered engines and clears the registry.
+
+		Call it with close=False in a forked child process, so that the connections
+		inherited from the parent are dropped without being closed.
+	"""
+	with _lock:
+		for engine in _engines.values():
+			engine.dispose(close=close)
+		_engines.clear()
+		_statistics.clear()
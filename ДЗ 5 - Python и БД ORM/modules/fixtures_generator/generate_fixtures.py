@@ -0,0 +1,88 @@
+import json
+import random
+from datetime import datetime, timedelta
+from itertools import accumulate
+
+from ..json_to_db.read_json_file import JSON_LINES_EXTENSIONS
+
+START_DATE = datetime(2018, 1, 1)
+PERIOD_SECONDS = 5 * 365 * 24 * 60 * 60
+
+
+def get_fixture_sizes(sales: int) -> dict:
+	"""Gets the number of records of every model for the given number of sales"""
+	return {
+		'publisher': max(sales // 10_000, 4),
+		'shop': max(sales // 100_000, 3),
+		'book': max(sales // 100, 6),
+		'stock': max(sales // 10, 9),
+		'sale': sales,
+	}
+
+
+def get_zipf_weights(count: int, skew: float) -> list[float]:
+	"""Gets cumulative Zipf weights: the item of rank n is chosen with weight 1 / n ** skew"""
+	return list(accumulate(1 / rank ** skew for rank in range(1, count + 1)))
+
+
+def iter_fixture_records(sales: int, skew: float = 1.1, seed: int = 0):
+	"""
+		Yields publisher, shop, book, stock and sale records in the tests_data.json format.
+
+		The records are yielded in foreign key order. Books are spread over publishers
+		with a Zipf distribution, so a few hot publishers own most books and sales.
+
+		Args:
+			sales (int): The number of sales. The other models are sized relative to it.
+			skew (float): The Zipf exponent, 0 spreads books evenly. Defaults to 1.1.
+			seed (int): The random seed, the same seed yields the same records. Defaults to 0.
+	"""
+	rng = random.Random(seed)
+	sizes = get_fixture_sizes(sales)
+
+	for pk in range(1, sizes['publisher'] + 1):
+		yield {'model': 'publisher', 'pk': pk, 'fields': {'name': f'Publisher {pk}'}}
+
+	for pk in range(1, sizes['shop'] + 1):
+		yield {'model': 'shop', 'pk': pk, 'fields': {'name': f'Shop {pk}'}}
+
+	publisher_weights = get_zipf_weights(sizes['publisher'], skew)
+	publisher_ids = range(1, sizes['publisher'] + 1)
+	for pk in range(1, sizes['book'] + 1):
+		id_publisher = rng.choices(publisher_ids, cum_weights=publisher_weights)[0]
+		yield {'model': 'book', 'pk': pk, 'fields': {'title': f'Book {pk}', 'id_publisher': id_publisher}}
+
+	for pk in range(1, sizes['stock'] + 1):
+		yield {'model': 'stock', 'pk': pk, 'fields': {
+			'id_shop': rng.randint(1, sizes['shop']),
+			'id_book': (pk - 1) % sizes['book'] + 1,
+			'count': rng.randint(0, 100),
+		}}
+
+	for pk in range(1, sales + 1):
+		date_sale = START_DATE + timedelta(seconds=rng.randrange(PERIOD_SECONDS), milliseconds=rng.randrange(1000))
+		yield {'model': 'sale', 'pk': pk, 'fields': {
+			'price': f'{rng.uniform(5, 100):.2f}',
+			'date_sale': f'{date_sale.isoformat(timespec="milliseconds")}Z',
+			'count': rng.randint(1, 20),
+			'id_stock': rng.randint(1, sizes['stock']),
+		}}
+
+
+def write_fixture_file(path: str, sales: int, skew: float = 1.1, seed: int = 0) -> None:
+	"""Writes generated records to a JSON array file, or to a JSON lines file for .jsonl/.ndjson paths"""
+	json_lines = path.lower().endswith(JSON_LINES_EXTENSIONS)
+
+	with open(path, 'w', encoding='utf-8') as file:
+		if not json_lines:
+			file.write('[\n')
+
+		for index, record in enumerate(iter_fixture_records(sales, skew, seed)):
+			if index and not json_lines:
+				file.write(',\n')
+			file.write(json.dumps(record, ensure_ascii=False))
+			if json_lines:
+				file.write('\n')
+
+		if not json_lines:
+			file.write('\n]\n')
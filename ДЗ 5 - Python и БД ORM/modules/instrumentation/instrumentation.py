@@ -0,0 +1,201 @@
+import json
+import logging
+import sys
+import threading
+import time
+from functools import wraps
+
+from sqlalchemy import event
+
+logger = logging.getLogger('bookstore')
+
+# The upper bounds in milliseconds of the latency histogram buckets
+LATENCY_BUCKETS_MS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class StdoutHandler(logging.StreamHandler):
+	"""Handler writing to the current sys.stdout, so that redirect_stdout applies to it"""
+
+	def __init__(self):
+		super().__init__(sys.stdout)
+
+	@property
+	def stream(self):
+		return sys.stdout
+
+	@stream.setter
+	def stream(self, value) -> None:
+		pass
+
+
+class JsonFormatter(logging.Formatter):
+	"""Formats a record as one JSON object with its level, logger, message and extra fields"""
+
+	def format(self, record: logging.LogRecord) -> str:
+		entry = {
+			'time': self.formatTime(record),
+			'level': record.levelname,
+			'logger': record.name,
+			'message': record.getMessage(),
+			**getattr(record, 'fields', {}),
+		}
+		if record.exc_info:
+			entry['exception'] = self.formatException(record.exc_info)
+		return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def configure_logging(level: int | str = logging.INFO, quiet: bool = False, json_format: bool = False) -> None:
+	"""
+		Configures the output of the import and report functions.
+
+		By default the messages are written to stdout as plain text, as print did.
+
+		Args:
+			level (int | str): The minimum level of the messages, e.g. logging.DEBUG or 'debug'. Defaults to INFO.
+			quiet (bool): Turns off stdout: only warnings and errors are written, to stderr. Defaults to False.
+			json_format (bool): Writes every message as a JSON object with its fields. Defaults to False.
+
+		Raises:
+			ValueError: If the level name is unknown.
+	"""
+	if isinstance(level, str):
+		level_name, level = level, logging.getLevelNamesMapping().get(level.strip().upper())
+		if level is None:
+			raise ValueError(f'Unknown logging level: {level_name}')
+
+	if quiet:
+		handler = logging.StreamHandler(sys.stderr)
+		level = max(level, logging.WARNING)
+	else:
+		handler = StdoutHandler()
+
+	handler.setFormatter(JsonFormatter() if json_format else logging.Formatter('%(message)s'))
+	logger.handlers = [handler]
+	logger.setLevel(level)
+	logger.propagate = False
+
+
+configure_logging()
+
+
+class Histogram:
+	"""Cumulative latency histogram with the LATENCY_BUCKETS_MS buckets"""
+
+	def __init__(self):
+		self.buckets = [0] * len(LATENCY_BUCKETS_MS)
+		self.count = 0
+		self.sum = 0.0
+
+	def observe(self, value: float) -> None:
+		"""Adds a value in milliseconds"""
+		self.count += 1
+		self.sum += value
+		for index, bound in enumerate(LATENCY_BUCKETS_MS):
+			if value <= bound:
+				self.buckets[index] += 1
+
+
+class Metrics:
+	"""Thread-safe latency histograms, call, error and query counters by operation, exported to a JSON file"""
+
+	def __init__(self):
+		self._lock = threading.Lock()
+		self._operations = {}
+
+	def observe(self, operation: str, duration_ms: float, queries: int, failed: bool) -> None:
+		"""Records a call of an operation"""
+		with self._lock:
+			stats = self._operations.get(operation)
+			if stats is None:
+				stats = self._operations[operation] = {'histogram': Histogram(), 'errors': 0, 'queries': 0}
+			stats['histogram'].observe(duration_ms)
+			stats['queries'] += queries
+			stats['errors'] += failed
+
+	def get_snapshot(self) -> dict:
+		"""
+			Returns the collected metrics.
+
+			Returns:
+				dict: By operation, the calls, errors, queries, total milliseconds and the
+				cumulative counts of the histogram buckets by their upper bound.
+		"""
+		with self._lock:
+			return {
+				operation: {
+					'calls': stats['histogram'].count,
+					'errors': stats['errors'],
+					'queries': stats['queries'],
+					'total_ms': round(stats['histogram'].sum, 3),
+					'buckets_ms': dict(zip(map(str, LATENCY_BUCKETS_MS), stats['histogram'].buckets)),
+				}
+				for operation, stats in self._operations.items()
+			}
+
+	def write(self, path: str) -> None:
+		"""Writes the collected metrics to a JSON file"""
+		with open(path, 'w', encoding='utf-8') as file:
+			json.dump(self.get_snapshot(), file, indent=2)
+
+
+metrics = Metrics()
+_query_counter = threading.local()
+
+
+def get_query_count() -> int:
+	"""Returns the number of queries sent by the current thread"""
+	return getattr(_query_counter, 'value', 0)
+
+
+def count_query(conn, cursor, statement, parameters, context, executemany) -> None:
+	"""Counts a statement sent by an engine in the current thread"""
+	_query_counter.value = get_query_count() + 1
+
+
+def instrument_engine(engine) -> None:
+	"""
+		Counts the statements of an engine and its sessions, for the query counters of instrument.
+
+		Registering the same engine again has no effect.
+	"""
+	if not event.contains(engine, 'before_cursor_execute', count_query):
+		event.listen(engine, 'before_cursor_execute', count_query)
+
+
+def instrument(operation: str = None):
+	"""
+		Decorator timing the calls of a function and counting their queries and errors in metrics.
+
+		Every call is logged at the DEBUG level with its duration and number of queries,
+		a failed call at the WARNING level.
+
+		Args:
+			operation (str, optional): The name of the operation. Defaults to the name of the function.
+	"""
+	def decorator(function):
+		name = operation or function.__name__
+
+		@wraps(function)
+		def wrapper(*args, **kwargs):
+			queries = get_query_count()
+			started = time.perf_counter()
+			failed = False
+			try:
+				return function(*args, **kwargs)
+			except Exception as error:
+				failed = True
+				logger.warning(f'{name} failed: {error}', extra={'fields': {'operation': name}})
+				raise
+			finally:
+				duration_ms = (time.perf_counter() - started) * 1000
+				queries = get_query_count() - queries
+				metrics.observe(name, duration_ms, queries, failed)
+				if logger.isEnabledFor(logging.DEBUG):
+					logger.debug(
+						f'{name} took {duration_ms:.3f} ms, {queries} queries',
+						extra={'fields': {'operation': name, 'duration_ms': duration_ms, 'queries': queries}}
+					)
+
+		return wrapper
+
+	return decorator
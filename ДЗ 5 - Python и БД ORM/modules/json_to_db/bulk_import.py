@@ -0,0 +1,124 @@
+import time
+
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from ..instrumentation.instrumentation import instrument, logger
+from .json2db import MODELS, convert_string_to_datetime, convert_string_to_float, reset_id_sequence
+from .read_json_file import iter_json_records
+
+# Foreign key order: every model is loaded only after the models it references
+LOAD_ORDER = ('publisher', 'shop', 'book', 'stock', 'sale')
+
+# Dependency barriers: a stage starts only after every record of the previous one is loaded
+LOAD_STAGES = (('publisher',), ('shop', 'book'), ('stock',), ('sale',))
+
+INSERT_BY_DIALECT = {
+	'postgresql': postgresql_insert,
+	'sqlite': sqlite_insert,
+}
+
+
+def build_row(model: type, record: dict) -> dict:
+	"""Build a table row from a JSON record, using the record's pk as the row id"""
+	fields = convert_string_to_float(dict(record.get('fields')))
+	fields = convert_string_to_datetime(model, fields)
+	return {'id': record.get('pk'), **fields}
+
+
+def upsert_rows(session, model: type, rows: list[dict]) -> None:
+	"""
+		Insert rows with multi-row INSERT ... ON CONFLICT statements, updating the rows
+		whose primary key already exists.
+
+		The rows are passed as executemany parameters, which SQLAlchemy sends as
+		multi-row VALUES batches without compiling a statement for every row set.
+	"""
+	dialect = session.get_bind().dialect.name
+	insert = INSERT_BY_DIALECT.get(dialect)
+
+	if insert is None:
+		raise ValueError(f'Bulk import is not supported for the "{dialect}" dialect')
+
+	statement = insert(model)
+	key_columns = [column.name for column in model.__table__.primary_key]
+	update_columns = {
+		column.name: statement.excluded[column.name]
+		for column in model.__table__.columns
+		if not column.primary_key and column.name in rows[0]
+	}
+	session.execute(statement.on_conflict_do_update(index_elements=key_columns, set_=update_columns), rows)
+
+
+def iter_record_partitions(path: str, model_names: tuple, partition_size: int):
+	"""Yield (model name, records) partitions of at most partition_size JSON records for the given models"""
+	partitions = {model_name: {} for model_name in model_names}
+
+	for record in iter_json_records(path):
+		model_name = record.get('model')
+
+		if model_name not in partitions:
+			continue
+
+		partitions[model_name][record.get('pk')] = record
+
+		if len(partitions[model_name]) == partition_size:
+			yield model_name, list(partitions[model_name].values())
+			partitions[model_name] = {}
+
+	for model_name, records in partitions.items():
+		if records:
+			yield model_name, list(records.values())
+
+
+def iter_partitions(path: str, model_names: tuple, partition_size: int):
+	"""Yield (model name, rows) partitions of at most partition_size rows for the given models"""
+	for model_name, records in iter_record_partitions(path, model_names, partition_size):
+		yield model_name, [build_row(MODELS[model_name], record) for record in records]
+
+
+def print_import_rate(model_name: str, count: int, elapsed: float) -> float:
+	"""Print and return the number of rows per second loaded for a model"""
+	rate = count / elapsed if elapsed > 0 else 0.0
+	logger.info(f'{model_name}: {count} rows in {elapsed:.2f} s ({rate:.0f} rows/s)')
+	return rate
+
+
+@instrument()
+def bulk_import_json_data_to_db(session, path: str, batch_size: int = 5000) -> dict:
+	"""
+		Upload data from a JSON file to the database with set-based writes.
+
+		The file is streamed once for every stage of the foreign key order: publishers,
+		then shops and books, then stock, then sales. The records of a stage are grouped
+		by model into batches of batch_size rows, and every batch is written with one
+		multi-row INSERT ... ON CONFLICT (id) DO UPDATE statement and committed. Every
+		referenced record is therefore loaded first, wherever it is in the file.
+
+		Args:
+			session (sqlalchemy.orm.Session): The database session.
+			path (str): The path to the JSON or JSON lines file.
+			batch_size (int): The number of rows per batch. Defaults to 5000.
+
+		Returns:
+			dict: Rows per second loaded for every model.
+	"""
+	counts = dict.fromkeys(LOAD_ORDER, 0)
+	elapsed = dict.fromkeys(LOAD_ORDER, 0.0)
+
+	for stage in LOAD_STAGES:
+		for model_name, rows in iter_partitions(path, stage, batch_size):
+			started = time.perf_counter()
+			upsert_rows(session, MODELS[model_name], rows)
+			session.commit()
+			elapsed[model_name] += time.perf_counter() - started
+			counts[model_name] += len(rows)
+
+	for model_name in LOAD_ORDER:
+		reset_id_sequence(session, MODELS[model_name])
+	session.commit()
+
+	return {
+		model_name: print_import_rate(model_name, counts[model_name], elapsed[model_name])
+		for model_name in LOAD_ORDER
+	}
@@ -0,0 +1,163 @@
+import hashlib
+import json
+
+from sqlalchemy import delete, exists, select
+
+from ..instrumentation.instrumentation import instrument, logger
+from .bulk_import import INSERT_BY_DIALECT, LOAD_ORDER, LOAD_STAGES, build_row, iter_record_partitions, upsert_rows
+from .json2db import MODELS, reset_id_sequence
+from ..db_management.models import ImportHash, ImportSeen
+
+
+def get_record_hash(record: dict) -> str:
+	"""Get the content hash of a JSON record from its model, pk and fields"""
+	content = json.dumps(
+		[record.get('model'), record.get('pk'), record.get('fields')],
+		sort_keys=True, ensure_ascii=False, separators=(',', ':')
+	)
+	return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+def read_import_hashes(session, keys: list) -> dict:
+	"""Read the stored content hashes of the given (model, pk) keys as a {(model, pk): hash} dictionary"""
+	hashes = {}
+
+	for model_name in {name for name, _ in keys}:
+		pks = [pk for name, pk in keys if name == model_name]
+		query = select(ImportHash.pk, ImportHash.hash).where(ImportHash.model == model_name, ImportHash.pk.in_(pks))
+		hashes.update(((model_name, pk), record_hash) for pk, record_hash in session.execute(query))
+
+	return hashes
+
+
+def mark_seen_records(session, keys: list) -> None:
+	"""Record the (model, pk) keys found in the file by the running import"""
+	insert = INSERT_BY_DIALECT[session.get_bind().dialect.name]
+	session.execute(
+		insert(ImportSeen).on_conflict_do_nothing(),
+		[{'model': model_name, 'pk': pk} for model_name, pk in set(keys)]
+	)
+
+
+def get_referencing_columns(model: type) -> list:
+	"""Get the foreign key columns of the other tables that reference the model"""
+	return [
+		foreign_key.parent
+		for table in model.metadata.sorted_tables
+		for foreign_key in table.foreign_keys
+		if foreign_key.column.table is model.__table__
+	]
+
+
+def delete_missing_records(session) -> int:
+	"""
+		Delete the imported records that the import did not find in the file, referencing models first.
+
+		The records are compared in SQL: a record is missing if its key is in import_hash
+		but not in import_seen. A missing record still referenced by another record, e.g.
+		a publisher whose books are still in the database, is kept with its hash, so the
+		next import tries to delete it again.
+
+		Returns:
+			int: The number of deleted records.
+	"""
+	deleted = 0
+
+	for model_name in reversed(LOAD_ORDER):
+		model = MODELS[model_name]
+		missing_pks = select(ImportHash.pk).where(
+			ImportHash.model == model_name,
+			~exists().where(ImportSeen.model == ImportHash.model, ImportSeen.pk == ImportHash.pk)
+		)
+
+		statement = delete(model).where(model.id.in_(missing_pks))
+		for column in get_referencing_columns(model):
+			statement = statement.where(~exists().where(column == model.id))
+		deleted += session.execute(statement).rowcount
+
+		session.execute(delete(ImportHash).where(
+			ImportHash.model == model_name,
+			~exists().where(ImportSeen.model == ImportHash.model, ImportSeen.pk == ImportHash.pk),
+			~exists().where(model.id == ImportHash.pk)
+		))
+
+	kept = session.execute(
+		select(ImportHash.model, ImportHash.pk).
+		where(~exists().where(ImportSeen.model == ImportHash.model, ImportSeen.pk == ImportHash.pk)).
+		limit(1)
+	).first()
+	if kept is not None:
+		logger.warning(f'Some missing records are still referenced and were kept, e.g. {kept[0]} {kept[1]}')
+
+	session.execute(delete(ImportSeen))
+	session.commit()
+	return deleted
+
+
+@instrument()
+def delta_import_json_data_to_db(
+		session, path: str, batch_size: int = 5000, delete_missing: bool = False
+) -> dict:
+	"""
+		Upload only the records that changed since the previous import.
+
+		The content hash of every imported record is stored in the import_hash table.
+		The file is streamed once for every stage of the foreign key order, like the bulk
+		import does it, so every referenced record is written first wherever it is in the
+		file. Every partition is compared with the stored hashes of its own keys, so the
+		hashes are never all loaded at once. Records whose hash did not change are skipped,
+		new and changed records are upserted, and records that disappeared from the
+		file are deleted if asked to.
+
+		Args:
+			session (sqlalchemy.orm.Session): The database session.
+			path (str): The path to the JSON or JSON lines file.
+			batch_size (int): The number of records per partition. Defaults to 5000.
+			delete_missing (bool): Delete the records missing from the file. Defaults to False.
+
+		Returns:
+			dict: The number of inserted, updated, unchanged and deleted records.
+	"""
+	stats = dict.fromkeys(('inserted', 'updated', 'unchanged', 'deleted'), 0)
+
+	if delete_missing:
+		# The keys left over by an interrupted import must not count as found in this file
+		session.execute(delete(ImportSeen))
+
+	for stage in LOAD_STAGES:
+		for model_name, records in iter_record_partitions(path, stage, batch_size):
+			model = MODELS[model_name]
+			keys = [(model_name, record.get('pk')) for record in records]
+			stored_hashes = read_import_hashes(session, keys)
+			changed_rows, changed_hashes = [], []
+
+			for key, record in zip(keys, records):
+				record_hash = get_record_hash(record)
+				stored_hash = stored_hashes.get(key)
+
+				if stored_hash == record_hash:
+					stats['unchanged'] += 1
+					continue
+
+				stats['updated' if stored_hash is not None else 'inserted'] += 1
+				changed_rows.append(build_row(model, record))
+				changed_hashes.append({'model': model_name, 'pk': key[1], 'hash': record_hash})
+
+			if changed_rows:
+				upsert_rows(session, model, changed_rows)
+				upsert_rows(session, ImportHash, changed_hashes)
+
+			if delete_missing:
+				mark_seen_records(session, keys)
+
+			session.commit()
+
+	for model_name in LOAD_ORDER:
+		reset_id_sequence(session, MODELS[model_name])
+	session.commit()
+
+	if delete_missing:
+		stats['deleted'] = delete_missing_records(session)
+
+	logger.info(', '.join(f'{name}: {count}' for name, count in stats.items()))
+	return stats
@@ -1,6 +1,20 @@
-from .read_json_file import read_json_file
+from datetime import datetime
+
+from sqlalchemy import DateTime, text
+
+from ..instrumentation.instrumentation import instrument
+from .lookup_cache import LookupCache, get_key_column, get_natural_key
+from .read_json_file import iter_chunks, iter_json_records
 from ..db_management.models import Book, Shop, Sale, Stock, Publisher
 
+MODELS = {
+	'publisher': Publisher,
+	'shop': Shop,
+	'book': Book,
+	'stock': Stock,
+	'sale': Sale,
+}
+
 
 def convert_string_to_float(fields: dict) -> dict:
 	"""Convert string values to float if possible"""
@@ -13,43 +27,109 @@ def convert_string_to_float(fields: dict) -> dict:
 	return fields
 
 
+def convert_string_to_datetime(model: type, fields: dict) -> dict:
+	"""Convert ISO 8601 strings to datetime for the DateTime columns of the model"""
+	for column in model.__table__.columns:
+		value = fields.get(column.name)
+		if isinstance(column.type, DateTime) and isinstance(value, str):
+			value = datetime.fromisoformat(value)
+			# A column without time zone stores the local time as it is written in the file
+			fields[column.name] = value if column.type.timezone else value.replace(tzinfo=None)
+	return fields
+
+
 def get_model(model_name: str, models: dict) -> type:
 	"""Get a model class by its name"""
 	return models.get(model_name)
 
 
-def create_or_update_record(session, model: type, fields: dict) -> None:
-	"""Create or update a record in the database"""
-	existing_record = session.query(model).filter_by(**fields).first()
+def create_or_update_record(session, model: type, fields: dict, pk: int) -> None:
+	"""Create or update a record in the database, keeping the pk of the JSON record as its id"""
+	existing_record = session.get(model, pk)
 
 	if existing_record is not None:
 		for key, value in fields.items():
 			setattr(existing_record, key, value)
 	else:
-		session.add(model(**fields))
+		session.add(model(id=pk, **fields))
+
+
+def reset_id_sequence(session, model: type) -> None:
+	"""Move the PostgreSQL id sequence past the explicitly inserted ids"""
+	if session.get_bind().dialect.name != 'postgresql':
+		return
+
+	table = model.__tablename__
+	session.execute(text(
+		f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), COALESCE(MAX(id), 1)) FROM {table}"
+	))
+
+
+def create_or_update_cached_record(session, model: type, fields: dict, pk: int, cache: LookupCache) -> None:
+	"""
+		Create or update a record in the database, looking it up by its natural key in the cache.
+
+		Unchanged records send no query at all. A record missing from the cache is looked up
+		in the database only if its table did not fit into the cache.
+
+		Args:
+			session (sqlalchemy.orm.Session): The database session.
+			model (type): The model class of the record.
+			fields (dict): The column values of the record.
+			pk (int): The pk of the JSON record.
+			cache (LookupCache): The cache of the rows already stored in the database.
+	"""
+	key_column = get_key_column(model)
+	key = get_natural_key(model, fields, pk)
+	cached_row = cache.get(model, key)
+
+	if cached_row is None and model not in cache.complete:
+		existing_record = session.query(model).filter_by(**{key_column: key}).first()
+		if existing_record is not None:
+			cached_row = {column.name: getattr(existing_record, column.name) for column in model.__table__.columns}
+
+	if cached_row is None:
+		session.add(model(id=pk, **fields))
+		cache.put(model, key, {'id': pk, **fields})
+		return
+
+	if any(cached_row.get(column) != value for column, value in fields.items()):
+		session.query(model).filter_by(**{key_column: key}).update(fields, synchronize_session=False)
+	cache.put(model, key, {**cached_row, **fields})
+
+
+@instrument()
+def import_json_data_to_db(session, path: str, chunk_size: int = 1000, cache: LookupCache = None) -> None:
+	"""
+		Upload data from a JSON file to the database, committing every chunk_size records.
 
+		Every record is inserted with its pk as the id. Without a cache the records are
+		looked up by their pk. With a cache the records are matched on their natural key
+		(publisher and shop name, pk for the other models) and the cache is pre-warmed
+		from the database first.
+	"""
+	if cache is not None:
+		cache.warm_up(session, MODELS.values())
 
-def import_json_data_to_db(session, path: str) -> None:
-	"""Upload data from a JSON file to the database"""
-	data = read_json_file(path)
-	models = {
-		'publisher': Publisher,
-		'shop': Shop,
-		'book': Book,
-		'stock': Stock,
-		'sale': Sale,
-	}
+	for chunk in iter_chunks(iter_json_records(path), chunk_size):
+		for record in chunk:
+			model_name = record.get('model')
+			model = get_model(model_name, MODELS)
 
-	for record in data:
-		model_name = record.get('model')
-		model = get_model(model_name, models)
+			if model is None:
+				continue
 
-		if model is None:
-			continue
+			fields = record.get('fields')
+			fields = convert_string_to_float(fields)
+			fields = convert_string_to_datetime(model, fields)
 
-		fields = record.get('fields')
-		fields = convert_string_to_float(fields)
+			if cache is None:
+				create_or_update_record(session, model, fields, record.get('pk'))
+			else:
+				create_or_update_cached_record(session, model, fields, record.get('pk'), cache)
 
-		create_or_update_record(session, model, fields)
+		session.commit()
 
+	for model in MODELS.values():
+		reset_id_sequence(session, model)
 	session.commit()
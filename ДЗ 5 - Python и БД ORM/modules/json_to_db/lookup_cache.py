@@ -0,0 +1,78 @@
+from collections import OrderedDict
+
+from sqlalchemy import select
+
+from ..db_management.models import Publisher, Shop
+
+# Models looked up by a unique column instead of the JSON pk
+NATURAL_KEYS = {
+	Publisher: 'name',
+	Shop: 'name',
+}
+
+
+def get_key_column(model: type) -> str:
+	"""Get the name of the column that identifies a record of the model"""
+	return NATURAL_KEYS.get(model, 'id')
+
+
+def get_natural_key(model: type, fields: dict, pk: int = None):
+	"""Get the natural key of a JSON record"""
+	key_column = get_key_column(model)
+	return pk if key_column == 'id' else fields.get(key_column)
+
+
+class LookupCache:
+	"""
+		LRU cache of the rows already stored in the database, keyed on each model's natural key.
+
+		The cache is pre-warmed with one SELECT per table. When a whole table fits into the
+		cache, a cache miss means that the row does not exist, so no query is needed for it.
+
+		Attributes:
+			max_size (int): The maximum number of cached rows for all models together.
+			complete (set): The models whose whole table is cached.
+			hits (int): The number of lookups answered from the cache.
+			misses (int): The number of lookups not found in the cache.
+	"""
+
+	def __init__(self, max_size: int = 100_000):
+		self.max_size = max_size
+		self.complete = set()
+		self.hits = 0
+		self.misses = 0
+		self._rows = OrderedDict()
+
+	def get(self, model: type, key) -> dict | None:
+		"""Get the cached column values of a row, or None if the row is not cached"""
+		row = self._rows.get((model, key))
+
+		if row is None:
+			self.misses += 1
+			return None
+
+		self._rows.move_to_end((model, key))
+		self.hits += 1
+		return row
+
+	def put(self, model: type, key, row: dict) -> None:
+		"""Cache the column values of a row, evicting the least recently used row if the cache is full"""
+		self._rows[(model, key)] = row
+		self._rows.move_to_end((model, key))
+
+		if len(self._rows) > self.max_size:
+			(evicted_model, _), _ = self._rows.popitem(last=False)
+			self.complete.discard(evicted_model)
+
+	def warm_up(self, session, models) -> None:
+		"""Load the rows of the models into the cache with one SELECT per table"""
+		for model in models:
+			columns = model.__table__.columns
+			limit = self.max_size - len(self._rows)
+			rows = session.execute(select(*columns).limit(limit + 1)).mappings().all()
+
+			for row in rows[:limit]:
+				self.put(model, row[get_key_column(model)], dict(row))
+
+			if len(rows) <= limit:
+				self.complete.add(model)
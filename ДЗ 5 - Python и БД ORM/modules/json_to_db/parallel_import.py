@@ -0,0 +1,105 @@
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from sqlalchemy.exc import DBAPIError
+
+from ..instrumentation.instrumentation import instrument
+from .bulk_import import LOAD_STAGES, iter_partitions, print_import_rate, upsert_rows
+from .json2db import MODELS, reset_id_sequence
+from ..db_session.create_db_session import create_database_session
+from ..db_session.engine_registry import dispose_engines
+
+# PostgreSQL error codes: serialization_failure, deadlock_detected
+RETRYABLE_PGCODES = ('40001', '40P01')
+RETRY_DELAY = 0.1
+
+_worker_session = None
+
+
+def init_worker(config_dict: dict) -> None:
+	"""Open a database session with its own engine in a worker process"""
+	global _worker_session
+	# Drop the pooled connections inherited from the parent process
+	dispose_engines(close=False)
+	_worker_session = create_database_session(config_dict)[0]
+
+
+def is_retryable_error(error: DBAPIError) -> bool:
+	"""Check whether the error is a serialization failure or a deadlock"""
+	return getattr(error.orig, 'pgcode', None) in RETRYABLE_PGCODES
+
+
+def load_partition(model_name: str, rows: list[dict], max_retries: int) -> tuple[str, int]:
+	"""Upsert a partition of rows in the worker's session, retrying it on serialization failures and deadlocks"""
+	model = MODELS[model_name]
+
+	for attempt in range(max_retries + 1):
+		try:
+			upsert_rows(_worker_session, model, rows)
+			_worker_session.commit()
+			return model_name, len(rows)
+		except DBAPIError as error:
+			_worker_session.rollback()
+			if attempt == max_retries or not is_retryable_error(error):
+				raise
+			time.sleep(RETRY_DELAY * 2 ** attempt)
+
+
+@instrument()
+def parallel_import_json_data_to_db(
+		config_dict: dict, path: str, workers: int = None,
+		partition_size: int = 5000, max_retries: int = 3
+) -> dict:
+	"""
+		Upload data from a JSON file to the database from a pool of worker processes.
+
+		Every worker opens its own engine and connection. The models are loaded in stages:
+		publishers, then shops and books, then stock, then sales. Within a stage the records
+		are split into partitions that the workers upsert concurrently, and a partition that
+		fails with a serialization failure or a deadlock is retried.
+
+		Args:
+			config_dict (dict): The database connection parameters.
+			path (str): The path to the JSON or JSON lines file.
+			workers (int, optional): The number of worker processes. Defaults to the number of CPUs.
+			partition_size (int): The number of rows per partition. Defaults to 5000.
+			max_retries (int): The number of retries for a failed partition. Defaults to 3.
+
+		Returns:
+			dict: Rows per second loaded for every model.
+	"""
+	workers = workers or os.cpu_count()
+	counts = dict.fromkeys(MODELS, 0)
+	rates = {}
+
+	def collect(futures) -> None:
+		for future in futures:
+			model_name, count = future.result()
+			counts[model_name] += count
+
+	with ProcessPoolExecutor(workers, initializer=init_worker, initargs=(config_dict,)) as executor:
+		for stage in LOAD_STAGES:
+			started = time.perf_counter()
+			pending = set()
+
+			for model_name, rows in iter_partitions(path, stage, partition_size):
+				# Keep only a few partitions per worker in memory
+				if len(pending) >= workers * 2:
+					done, pending = wait(pending, return_when=FIRST_COMPLETED)
+					collect(done)
+				pending.add(executor.submit(load_partition, model_name, rows, max_retries))
+
+			collect(wait(pending).done)
+			stage_time = time.perf_counter() - started
+
+			for model_name in stage:
+				rates[model_name] = print_import_rate(model_name, counts[model_name], stage_time)
+
+	session = create_database_session(config_dict)[0]
+	for model in MODELS.values():
+		reset_id_sequence(session, model)
+	session.commit()
+	session.close()
+
+	return rates
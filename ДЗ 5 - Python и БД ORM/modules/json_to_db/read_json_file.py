@@ -1,7 +1,85 @@
 import json
+from collections.abc import Iterable, Iterator
+from itertools import islice
+
+JSON_LINES_EXTENSIONS = ('.jsonl', '.ndjson')
+READ_SIZE = 1 << 16
 
 
 def read_json_file(path: str) -> dict:
 	"""Read json file and return data"""
 	with open(path, 'r', encoding='utf-8') as file:
 		return json.load(file)
+
+
+def iter_json_array(path: str, read_size: int = READ_SIZE) -> Iterator[dict]:
+	"""
+		Yield the items of a top-level JSON array one at a time.
+
+		The file is read in blocks of read_size characters and every item is decoded
+		as soon as it is complete, so memory use does not depend on the file size.
+
+		Args:
+			path (str): The path to the JSON file.
+			read_size (int): The number of characters read from the file at once.
+
+		Yields:
+			dict: The next item of the array.
+
+		Raises:
+			ValueError: If the file does not contain a complete top-level JSON array.
+	"""
+	decoder = json.JSONDecoder()
+
+	with open(path, 'r', encoding='utf-8') as file:
+		buffer = file.read(read_size).lstrip()
+
+		if not buffer.startswith('['):
+			raise ValueError(f'{path} does not contain a top-level JSON array')
+
+		position = 1
+
+		while True:
+			while position < len(buffer) and buffer[position] in ' \t\r\n,':
+				position += 1
+
+			if position < len(buffer):
+				if buffer[position] == ']':
+					return
+
+				try:
+					item, position = decoder.raw_decode(buffer, position)
+				except json.JSONDecodeError:
+					pass
+				else:
+					yield item
+					continue
+
+			# The buffer ends inside an item: keep its beginning and read the next block
+			more = file.read(read_size)
+			if not more:
+				raise ValueError(f'{path} is not a complete JSON array')
+			buffer, position = buffer[position:] + more, 0
+
+
+def iter_json_lines(path: str) -> Iterator[dict]:
+	"""Yield the records of a newline-delimited JSON file one at a time"""
+	with open(path, 'r', encoding='utf-8') as file:
+		for line in file:
+			line = line.strip()
+			if line:
+				yield json.loads(line)
+
+
+def iter_json_records(path: str) -> Iterator[dict]:
+	"""Yield records from a JSON array file or, for .jsonl/.ndjson files, from JSON lines"""
+	if path.lower().endswith(JSON_LINES_EXTENSIONS):
+		return iter_json_lines(path)
+	return iter_json_array(path)
+
+
+def iter_chunks(records: Iterable, chunk_size: int) -> Iterator[list]:
+	"""Split an iterable into lists of at most chunk_size items"""
+	iterator = iter(records)
+	while chunk := list(islice(iterator, chunk_size)):
+		yield chunk
@@ -0,0 +1,147 @@
+from sqlalchemy import func, or_, select
+
+from ..db_management.models import Book, Shop, Sale, Stock, Publisher
+from ..instrumentation.instrumentation import instrument, logger
+
+# Date formats of the periods for PostgreSQL to_char and SQLite strftime
+PERIOD_FORMATS = {
+	'day': ('YYYY-MM-DD', '%Y-%m-%d'),
+	'month': ('YYYY-MM', '%Y-%m'),
+}
+
+
+def get_period_expression(session, period: str):
+	"""Gets an SQL expression formatting the sale date as its day or month."""
+	if period not in PERIOD_FORMATS:
+		raise ValueError(f'period must be one of: {", ".join(PERIOD_FORMATS)}')
+
+	postgresql_format, sqlite_format = PERIOD_FORMATS[period]
+
+	if session.get_bind().dialect.name == 'postgresql':
+		return func.to_char(Sale.date_sale, postgresql_format)
+	return func.strftime(sqlite_format, Sale.date_sale)
+
+
+def get_group_expression(session, group_by: str):
+	"""Gets the SQL expression the sales totals are grouped by."""
+	if group_by == 'shop':
+		return Shop.name
+	if group_by == 'book':
+		return Book.title
+	return get_period_expression(session, group_by)
+
+
+def get_sales_totals_query(session, publisher: Publisher, group_by: str = 'shop'):
+	"""
+		Gets a query computing the sales totals of a publisher in the database.
+
+		Args:
+			session (sqlalchemy.orm.Session): The database session.
+			publisher (Publisher): The publisher.
+			group_by (str): 'shop', 'book', 'day' or 'month'. Defaults to 'shop'.
+
+		Returns:
+			sqlalchemy.Select: Rows of (group, number of sales, copies sold, revenue),
+			ordered by revenue, where revenue is the sum of price * count.
+	"""
+	group = get_group_expression(session, group_by).label('group')
+	revenue = func.coalesce(func.sum(Sale.price * Sale.count), 0).label('revenue')
+
+	return select(group, func.count().label('sales'), func.sum(Sale.count).label('copies'), revenue). \
+		join(Stock, Sale.id_stock == Stock.id). \
+		join(Book, Stock.id_book == Book.id). \
+		join(Shop, Stock.id_shop == Shop.id). \
+		where(Book.id_publisher == publisher.id). \
+		group_by(group). \
+		order_by(revenue.desc())
+
+
+def get_sales_details_query(session, publisher: Publisher, after: tuple = None):
+	"""
+		Gets a query of the sales of a publisher ordered by stock ID and sale ID.
+
+		Pages start with the stocks, so each page only sorts the sales of the stocks it reads.
+
+		Args:
+			session (sqlalchemy.orm.Session): The database session.
+			publisher (Publisher): The publisher.
+			after (tuple, optional): The (stock ID, sale ID) of the last sale of the previous page.
+
+		Returns:
+			sqlalchemy.Select: Rows of (title, shop, price, date, count, stock ID, sale ID).
+	"""
+	query = select(Book.title, Shop.name, Sale.price, Sale.date_sale, Sale.count, Stock.id.label('id_stock'), Sale.id). \
+		join(Stock, Sale.id_stock == Stock.id). \
+		join(Book, Stock.id_book == Book.id). \
+		join(Shop, Stock.id_shop == Shop.id). \
+		where(Book.id_publisher == publisher.id). \
+		order_by(Stock.id, Sale.id)
+
+	if after is not None:
+		after_stock, after_sale = after
+		query = query.where(Stock.id >= after_stock, or_(Stock.id > after_stock, Sale.id > after_sale))
+
+	return query
+
+
+def get_sales_page(session, publisher: Publisher, after: tuple = None, page_size: int = 100) -> list:
+	"""
+		Gets one page of the sales of a publisher using keyset pagination.
+
+		Args:
+			session (sqlalchemy.orm.Session): The database session.
+			publisher (Publisher): The publisher.
+			after (tuple, optional): The (stock ID, sale ID) of the last sale of the previous page.
+			page_size (int): The maximum number of sales on the page. Defaults to 100.
+
+		Returns:
+			list: Rows of (title, shop, price, date, count, stock ID, sale ID). Pass the stock ID
+			and sale ID of the last row as after to get the next page.
+	"""
+	return session.execute(get_sales_details_query(session, publisher, after).limit(page_size)).all()
+
+
+def iter_sales(session, publisher: Publisher, page_size: int = 10000, batch_size: int = 1000):
+	"""
+		Yields the sales of a publisher by keyset pages read through a server-side cursor.
+
+		Every page is streamed with yield_per, so only batch_size rows are held in memory,
+		and the next page starts after the last sale yielded.
+
+		Args:
+			session (sqlalchemy.orm.Session): The database session.
+			publisher (Publisher): The publisher.
+			page_size (int): The maximum number of sales read by one query. Defaults to 10000.
+			batch_size (int): The number of rows fetched from the cursor at a time. Defaults to 1000.
+
+		Yields:
+			Row: The (title, shop, price, date, count, stock ID, sale ID) of a sale.
+	"""
+	after = None
+
+	while True:
+		query = get_sales_details_query(session, publisher, after).limit(page_size). \
+			execution_options(yield_per=batch_size)
+		rows = 0
+
+		for row in session.execute(query):
+			rows += 1
+			after = row.id_stock, row.id
+			yield row
+
+		if rows < page_size:
+			return
+
+
+def print_sales_totals(rows, title: str) -> None:
+	"""Prints the sales totals by shop, book or period."""
+	logger.info(f'— Sales by {title}:')
+	for group, sales, copies, revenue in rows:
+		logger.info(f'{group} | sales: {sales} | copies: {copies} | revenue: {revenue:.2f}')
+
+
+@instrument()
+def get_publisher_sales_summary(session, publisher: Publisher) -> None:
+	"""Prints the sales totals of a publisher by shop, book and month."""
+	for group_by in ('shop', 'book', 'month'):
+		print_sales_totals(session.execute(get_sales_totals_query(session, publisher, group_by)), group_by)
@@ -0,0 +1,126 @@
+import logging
+
+from sqlalchemy import func, select, text
+
+from ..db_management.models import Book, Sale, Stock, Publisher
+from ..instrumentation.instrumentation import logger
+from ..publisher_reports.sales_summary import get_sales_details_query, get_sales_page, get_sales_totals_query
+
+SEED_STATEMENTS = (
+	"INSERT INTO publisher (id, name) SELECT g, 'Publisher ' || g FROM generate_series(1, :publishers) g",
+	"INSERT INTO shop (id, name) SELECT g, 'Shop ' || g FROM generate_series(1, :shops) g",
+	"INSERT INTO book (id, title, id_publisher) "
+	"SELECT g, 'Book ' || g, 1 + g % :publishers FROM generate_series(1, :books) g",
+	"INSERT INTO stock (id, id_book, id_shop, count) "
+	"SELECT g, 1 + g % :books, 1 + (g / :books) % :shops, 100 FROM generate_series(1, :stocks) g",
+	"INSERT INTO sale (id, price, date_sale, count, id_stock) "
+	"SELECT g, 10 + g % 90, timestamp '2020-01-01' + g * interval '1 minute', 1 + g % 5, 1 + g % :stocks "
+	"FROM generate_series(1, :sales) g",
+)
+
+
+def seed_dataset(session, sales: int = 1_000_000) -> None:
+	"""
+		Fills the empty tables with a generated dataset and updates the planner statistics and visibility map.
+
+		Args:
+			session (sqlalchemy.orm.Session): The PostgreSQL database session.
+			sales (int): The number of sales. The other tables are sized relative to it.
+	"""
+	sizes = {
+		'sales': sales,
+		'stocks': max(sales // 10, 1),
+		'books': max(sales // 100, 1),
+		'shops': 50,
+		'publishers': 100,
+	}
+
+	for statement in SEED_STATEMENTS:
+		session.execute(text(statement), sizes)
+	session.commit()
+
+	with session.get_bind().connect() as connection:
+		connection.execution_options(isolation_level='AUTOCOMMIT').exec_driver_sql('VACUUM ANALYZE')
+
+
+def get_report_queries(session) -> dict:
+	"""Gets the report queries for the publisher with the most sales."""
+	publisher_id = session.execute(
+		select(Book.id_publisher).
+		join(Stock, Stock.id_book == Book.id).
+		join(Sale, Sale.id_stock == Stock.id).
+		group_by(Book.id_publisher).
+		order_by(func.count().desc()).
+		limit(1)
+	).scalar_one()
+
+	publisher = Publisher(id=publisher_id)
+	queries = {'sales report': get_sales_details_query(session, publisher).limit(1000)}
+
+	for group_by in ('shop', 'book', 'month'):
+		queries[f'totals by {group_by}'] = get_sales_totals_query(session, publisher, group_by)
+
+	last_sale = get_sales_page(session, publisher)[-1]
+	queries['sales page'] = get_sales_details_query(session, publisher, (last_sale.id_stock, last_sale.id)).limit(100)
+	return queries
+
+
+def explain_query(session, query) -> dict:
+	"""Runs EXPLAIN (ANALYZE, BUFFERS) for a query and returns its plan."""
+	compiled = query.compile(dialect=session.get_bind().dialect)
+	connection = session.connection()
+	result = connection.exec_driver_sql(f'EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {compiled}', compiled.params)
+	return result.scalar()[0]['Plan']
+
+
+def iter_plan_nodes(plan: dict):
+	"""Yields a plan node and all its child nodes."""
+	yield plan
+	for child in plan.get('Plans', []):
+		yield from iter_plan_nodes(child)
+
+
+def get_large_tables(session, min_rows: int) -> set:
+	"""Gets the tables with at least min_rows estimated rows."""
+	rows = session.execute(
+		text("SELECT relname FROM pg_class WHERE relkind = 'r' AND reltuples >= :min_rows"),
+		{'min_rows': min_rows}
+	)
+	return {row[0] for row in rows}
+
+
+def find_seq_scans(plan: dict, tables: set) -> list:
+	"""Gets the names of the given tables read with a sequential scan in a plan."""
+	return [
+		node['Relation Name'] for node in iter_plan_nodes(plan)
+		if node['Node Type'] == 'Seq Scan' and node.get('Relation Name') in tables
+	]
+
+
+def check_report_plans(session, min_rows: int = 10_000) -> bool:
+	"""
+		Checks that the report queries read no large table with a sequential scan.
+
+		Args:
+			session (sqlalchemy.orm.Session): The PostgreSQL database session.
+			min_rows (int): The number of rows from which a table is considered large.
+
+		Returns:
+			bool: True if no report query reads a large table with a sequential scan.
+	"""
+	large_tables = get_large_tables(session, min_rows)
+	passed = True
+
+	for name, query in get_report_queries(session).items():
+		plan = explain_query(session, query)
+		seq_scans = find_seq_scans(plan, large_tables)
+		status = 'FAIL' if seq_scans else 'OK'
+		logger.log(
+			logging.WARNING if seq_scans else logging.INFO,
+			f'{status} | {name} | {plan["Actual Total Time"]:.2f} ms | seq scans: {", ".join(seq_scans) or "-"}',
+			extra={'fields': {'query': name, 'duration_ms': plan['Actual Total Time'], 'seq_scans': seq_scans}}
+		)
+		passed = passed and not seq_scans
+
+	session.rollback()
+	return passed